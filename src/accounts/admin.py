@@ -2,9 +2,37 @@ from typing import Optional, Any
 
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.core.paginator import Paginator
+from django.db.models import QuerySet
+from django.http import HttpRequest
+from django.utils.functional import cached_property
+
 from .models import CustomUser
 
 
+class BoundedCountPaginator(Paginator):
+    """Paginator that stops counting rows after `max_count`.
+
+    The count runs over a LIMIT subquery, so its cost is bounded on large tables. Beyond
+    `max_count` rows, the last pages are not reachable and the search should be refined.
+
+    Attributes:
+        max_count (int): The largest count reported.
+    """
+    max_count: int = 10_000
+
+    @cached_property
+    def count(self) -> int:
+        if not isinstance(self.object_list, QuerySet):
+            return super().count
+        return self.object_list[:self.max_count].count()
+
+
+def _prefix_upper_bound(prefix: str) -> str:
+    """Return the smallest string greater than every string that starts with `prefix`."""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
 class CustomUserAdmin(BaseUserAdmin):
     """
     Custom admin interface for the CustomUser model.
@@ -14,10 +42,19 @@ class CustomUserAdmin(BaseUserAdmin):
     displayed users. Additionally, it customizes the layout of the user
     forms used for adding and editing users in the admin panel.
 
+    The search matches the beginning of the email address, or a whole domain when the term
+    starts with `@`, case-insensitively. Both are served by the indexes on the lowercase
+    columns of `CustomUser`, in the order of the list, instead of a `LIKE '%…%'` scan.
+
     Attributes:
         list_display (tuple[str, ...]): Fields to display in the admin list view.
         search_fields (tuple[str, ...]): Fields to include in the search functionality.
-        ordering (tuple[str, ...]): Default ordering for the list view.
+        search_help_text (str): The help text displayed under the search box.
+        ordering (tuple[str, ...]): Default ordering for the list view, which is the order
+            of the search indexes.
+        paginator (type[BoundedCountPaginator]): The paginator of the list view, whose count is bounded.
+        show_full_result_count (bool): Whether the unfiltered count is shown next to the
+            filtered one, which would cost a COUNT over the whole table.
         fieldsets (list[tuple[Optional[Any], Any]]): Configuration for the fields displayed
             when editing an existing user.
         add_fieldsets (list[tuple[Optional[Any], Any]]): Configuration for the fields
@@ -26,7 +63,10 @@ class CustomUserAdmin(BaseUserAdmin):
 
     list_display: tuple[str, ...] = ('email', 'is_staff', 'is_active', 'is_superuser')
     search_fields: tuple[str, ...] = ('email',)
-    ordering: tuple[str, ...] = ('email',)
+    search_help_text: str = "Début de l'adresse email, ou @domaine.fr pour tous les utilisateurs d'un domaine."
+    ordering: tuple[str, ...] = ('email_lower', 'pk')
+    paginator: type[BoundedCountPaginator] = BoundedCountPaginator
+    show_full_result_count: bool = False
 
     fieldsets: list[tuple[Optional[Any], Any]] = [
         ('Profile', {'fields': ('email', 'password'), }),
@@ -38,5 +78,16 @@ class CustomUserAdmin(BaseUserAdmin):
         (None, {'classes': ('wide',), 'fields': ('email', 'password1', 'password2'), }),
     ]
 
+    def get_search_results(
+        self, request: HttpRequest, queryset: QuerySet[CustomUser], search_term: str,
+    ) -> tuple[QuerySet[CustomUser], bool]:
+        """Filter the users by email prefix, or by domain for a term starting with `@`."""
+        term = search_term.strip().lower()
+        if not term:
+            return queryset, False
+        if term.startswith('@'):
+            return queryset.filter(email_domain=term[1:]), False
+        return queryset.filter(email_lower__gte=term, email_lower__lt=_prefix_upper_bound(term)), False
+
 
 admin.site.register(CustomUser, CustomUserAdmin)
@@ -4,6 +4,8 @@ from typing import Optional, TypeVar
 
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 from django.db import models
+from django.db.models import Value
+from django.db.models.functions import Lower, StrIndex, Substr
 from django.contrib.auth.base_user import BaseUserManager
 
 
@@ -76,6 +78,10 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
         is_staff (models.BooleanField): Indicates whether the user can access the admin site. Defaults to False.
         is_superuser (models.BooleanField): Indicates whether the user has all permissions without explicitly assigning them. Defaults to False.
         zip_code (models.CharField): Optional field to store the user's zip code.
+        email_lower (models.GeneratedField): The lowercase email, computed by the database and
+            indexed for the prefix search of the admin.
+        email_domain (models.GeneratedField): The lowercase domain of the email, indexed for the
+            domain search of the admin.
     """
     email: models.EmailField = models.EmailField(
         max_length=255,
@@ -86,6 +92,13 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
     is_staff = models.BooleanField(default=False)
     is_superuser = models.BooleanField(default=False)
     zip_code: models.CharField = models.CharField(blank=True, max_length=5)
+    email_lower = models.GeneratedField(
+        expression=Lower('email'), output_field=models.CharField(max_length=255), db_persist=True,
+    )
+    email_domain = models.GeneratedField(
+        expression=Lower(Substr('email', StrIndex('email', Value('@')) + 1)),
+        output_field=models.CharField(max_length=255), db_persist=True,
+    )
     objects = CustomUserManager()
 
     USERNAME_FIELD = "email"
@@ -105,5 +118,11 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
         Options:
             verbose_name (str): The singular name to use for this model in the admin
                 interface. Defaults to 'utilisateur'.
+            indexes (list[models.Index]): The indexes of the admin search, which also serve its
+                ordering by `email_lower`.
         """
         verbose_name = "utilisateur"
+        indexes = [
+            models.Index(fields=['email_lower'], name='accounts_user_email_lower_idx'),
+            models.Index(fields=['email_domain', 'email_lower'], name='accounts_user_domain_idx'),
+        ]
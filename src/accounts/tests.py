@@ -1,8 +1,14 @@
+from typing import Any
+
 import pytest
+from django.db import connection
 from django.test import Client
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from accounts.admin import BoundedCountPaginator
 from accounts.forms import UserRegistrationForm
 from accounts.models import CustomUser
+from query_budgets import QUERY_BUDGETS
 
 
 @pytest.mark.django_db
@@ -158,3 +164,62 @@ class TestProfileView:
         url: str = reverse('accounts:profile')
         response = client.get(url)
         assert response.status_code == 302  # Redirect to login
+
+
+@pytest.mark.django_db
+class TestCustomUserAdmin:
+    """Test suite for the indexed email search of `CustomUserAdmin`."""
+
+    @pytest.fixture
+    def admin_client(self, client: Client) -> Client:
+        client.force_login(CustomUser.objects.create_superuser(email='admin@example.com', password='testpass123'))
+        for email in ('Alice@Example.com', 'alice.b@example.org', 'bob@sub.example.com', 'alicia@exemple.fr'):
+            CustomUser.objects.create_user(email=email, password='testpass123')
+        return client
+
+    @staticmethod
+    def _search(client: Client, term: str) -> tuple[list[str], list[str]]:
+        """Return the emails found for `term`, in order, and the SQL reading the user table."""
+        with CaptureQueriesContext(connection) as captured:
+            response = client.get(reverse('admin:accounts_customuser_changelist'), {'q': term})
+        sql = [query['sql'] for query in captured.captured_queries if 'FROM "accounts_customuser"' in query['sql']]
+        return [user.email for user in response.context['cl'].result_list], sql
+
+    @pytest.mark.parametrize('term, expected', [
+        ('ALI', ['alice.b@example.org', 'Alice@example.com', 'alicia@exemple.fr']),
+        ('alice@', ['Alice@example.com']),
+        ('@example.com', ['admin@example.com', 'Alice@example.com']),
+        ('@EXAMPLE.ORG', ['alice.b@example.org']),
+        ('@example', []),
+        ('example', []),
+    ])
+    def test_search(self, admin_client: Client, term: str, expected: list[str]) -> None:
+        """Test that the search matches email prefixes and whole domains, whatever the case."""
+        assert self._search(admin_client, term)[0] == expected
+
+    @pytest.mark.parametrize('term', ['ali', '@example.com', ''])
+    def test_indexed_and_bounded(self, admin_client: Client, term: str) -> None:
+        """Test that the listing and its count use an index without sorting, and that the count is bounded."""
+        _, sql = self._search(admin_client, term)
+        counts = [query for query in sql if query.startswith('SELECT COUNT(')]
+        assert len(counts) == 1 and f'LIMIT {BoundedCountPaginator.max_count}' in counts[0], sql
+        listing = [query for query in sql if query.startswith('SELECT "') and 'ORDER BY' in query]
+        assert listing, sql
+        for query in counts + listing:
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN QUERY PLAN {query}')
+                plan = [row[-1] for row in cursor.fetchall()]
+            assert any('accounts_user_' in step for step in plan), plan
+            assert not [step for step in plan if 'TEMP B-TREE' in step], plan
+
+    def test_bounded_count(self, admin_client: Client, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the count stops at `max_count`."""
+        monkeypatch.setattr(BoundedCountPaginator, 'max_count', 3)
+        response = admin_client.get(reverse('admin:accounts_customuser_changelist'))
+        assert response.context['cl'].result_count == 3
+
+
+@pytest.mark.parametrize('url_name', sorted(name for name in QUERY_BUDGETS if name.startswith('accounts:')))
+def test_query_budget(query_budget: Any, url_name: str) -> None:
+    """Test that each view runs a bounded number of queries, independent of the number of users' data."""
+    query_budget(url_name)
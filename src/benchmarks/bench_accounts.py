@@ -0,0 +1,47 @@
+from io import StringIO
+from itertools import count
+from typing import Any, Callable
+
+import pytest
+from django.contrib import admin
+from django.core.management import call_command
+from django.test import RequestFactory
+from django.urls import reverse
+
+from accounts.models import CustomUser
+
+pytestmark = pytest.mark.django_db
+
+# Number of users added to the seeded ones before the admin search benchmarks.
+SEARCH_USERS: int = 20_000
+
+
+def test_create_user(benchmark: Any) -> None:
+    """`CustomUserManager.create_user`, dominated by the hashing of the password."""
+    numbers = count()
+    benchmark(
+        lambda: CustomUser.objects.create_user(email=f'mesure{next(numbers)}@example.com', password='mesure'),
+        rounds=10, warmup=1,
+    )
+
+
+@pytest.fixture
+def user_changelist() -> Callable[[str], Any]:
+    """Seed `SEARCH_USERS` users, and return a function building the admin changelist of a search."""
+    admin_user = CustomUser.objects.create_superuser(email='mesure-admin@example.com', password='mesure')
+    call_command('seed_blog', posts=0, authors=0, users=SEARCH_USERS, stdout=StringIO())
+    model_admin = admin.site._registry[CustomUser]
+
+    def changelist(term: str) -> Any:
+        request = RequestFactory().get(reverse('admin:accounts_customuser_changelist'), {'q': term})
+        request.user = admin_user
+        change_list = model_admin.get_changelist_instance(request)
+        return list(change_list.result_list)
+
+    return changelist
+
+
+@pytest.mark.parametrize('term', ['alice.1', '@exemple.fr'])
+def test_admin_user_search(benchmark: Any, user_changelist: Callable[[str], Any], term: str) -> None:
+    """`CustomUserAdmin` changelist for an email prefix or a domain, over the seeded users plus `SEARCH_USERS`."""
+    benchmark(lambda: user_changelist(term), rounds=50)
@@ -0,0 +1,64 @@
+from itertools import count
+from typing import Any
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.template import loader
+from django.test import RequestFactory
+from django.urls import reverse
+
+from blog.models import Author, BlogPost
+from blog.seeding import generate_posts
+from blog.views import BlogHome, BlogPostDetail
+
+pytestmark = pytest.mark.django_db
+
+CONTENT: str = generate_posts(0, 1, 0)[0]['content']
+
+
+def test_blogpost_save_new(benchmark: Any) -> None:
+    """`BlogPost.save` of a new post: slug, rendered HTML, search index and cache invalidation."""
+    numbers = count()
+    benchmark(lambda: BlogPost(title=f'Mesure {next(numbers)}', content=CONTENT, published=True).save())
+
+
+def test_blogpost_save_existing(benchmark: Any) -> None:
+    """`BlogPost.save` of a loaded post, with its author."""
+    post = BlogPost.objects.select_related('author').filter(author__isnull=False)[0]
+    benchmark(post.save)
+
+
+def test_author_save_new(benchmark: Any) -> None:
+    """`Author.save` of a new author, whose uniqueness is checked by the database constraint."""
+    numbers = count()
+    benchmark(lambda: Author(firstname='Mesure', lastname=f'Auteur {next(numbers)}').save())
+
+
+def _view_context(view_class: type, path: str, **kwargs: Any) -> tuple[dict[str, Any], Any]:
+    """Return the template context built by `view_class` for an anonymous GET of `path`, and the request."""
+    request = RequestFactory().get(path)
+    request.user = AnonymousUser()
+    view = view_class()
+    view.setup(request, **kwargs)
+    if 'slug' in kwargs:
+        view.object = view.get_object()
+        return view.get_context_data(object=view.object), request
+    view.object_list = view.get_queryset()
+    context = view.get_context_data()
+    context['blog'] = list(context['blog'])
+    return context, request
+
+
+def test_render_blogpost_list(benchmark: Any) -> None:
+    """Rendering of `blogpost_list.html` for a full page of posts, queries excluded."""
+    context, request = _view_context(BlogHome, reverse('blog:home'))
+    template = loader.get_template(BlogHome.template_name)
+    benchmark(lambda: template.render(context, request), rounds=200)
+
+
+def test_render_blogpost_detail(benchmark: Any) -> None:
+    """Rendering of `blogpost_detail.html`, queries excluded."""
+    slug = BlogPost.objects.filter(published=True).values_list('slug', flat=True).first()
+    context, request = _view_context(BlogPostDetail, reverse('blog:detail', kwargs={'slug': slug}), slug=slug)
+    template = loader.get_template('blog/blogpost_detail.html')
+    benchmark(lambda: template.render(context, request), rounds=200)
@@ -0,0 +1,49 @@
+from itertools import count
+from typing import Any, Callable
+
+import pytest
+from django.core.cache import BaseCache
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+
+from website.mmap_cache import MmapCache
+
+pytestmark = pytest.mark.django_db
+
+# The size of a rendered blog page, the largest entries of the page cache.
+PAGE: bytes = b'x' * 20_000
+
+BACKENDS: dict[str, Callable[[Any], BaseCache]] = {
+    'locmem': lambda path: LocMemCache('benchmark', {'OPTIONS': {'MAX_ENTRIES': 16384}}),
+    'filebased': lambda path: FileBasedCache(str(path / 'files'), {'OPTIONS': {'MAX_ENTRIES': 16384}}),
+    'mmap': lambda path: MmapCache(str(path / 'cache.mmap'), {'OPTIONS': {'MAX_ENTRIES': 16384}}),
+}
+
+
+@pytest.fixture(params=list(BACKENDS))
+def backend(request: pytest.FixtureRequest, tmp_path: Any) -> BaseCache:
+    return BACKENDS[request.param](tmp_path)
+
+
+def test_cache_get_hit(benchmark: Any, backend: BaseCache) -> None:
+    """Read of a cached page."""
+    backend.set('page', PAGE)
+    benchmark(lambda: backend.get('page'), rounds=1000)
+
+
+def test_cache_get_many_versions(benchmark: Any, backend: BaseCache) -> None:
+    """Read of the version counters of a page, as done on every cached request."""
+    backend.set_many({f'version:{index}': index for index in range(3)})
+    benchmark(lambda: backend.get_many([f'version:{index}' for index in range(3)]), rounds=1000)
+
+
+def test_cache_set(benchmark: Any, backend: BaseCache) -> None:
+    """Write of a new page."""
+    numbers = count()
+    benchmark(lambda: backend.set(f'page:{next(numbers)}', PAGE), rounds=500)
+
+
+def test_cache_incr(benchmark: Any, backend: BaseCache) -> None:
+    """Increment of a version counter."""
+    backend.set('counter', 0)
+    benchmark(lambda: backend.incr('counter'), rounds=1000)
@@ -0,0 +1,73 @@
+from pathlib import Path
+from typing import Any, cast
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.template import engines, loader
+from django.test import RequestFactory
+from django.urls import reverse
+
+from blog.views import BlogHome
+from website.templating import Jinja2
+
+pytestmark = pytest.mark.django_db
+
+
+def _use_jinja2(settings: Any, tmp_path: Path) -> None:
+    """Render the blog templates with their Jinja2 ports, as `JINJA2_APPS=blog` does."""
+    settings.JINJA2_BYTECODE_CACHE = tmp_path / 'jinja2'
+    settings.TEMPLATES = [{
+        'BACKEND': 'website.templating.Jinja2',
+        'NAME': 'jinja2',
+        'DIRS': [settings.BASE_DIR / 'blog/jinja2'],
+        'APP_DIRS': False,
+        'OPTIONS': {
+            'environment': 'website.templating.environment',
+            'context_processors': settings.TEMPLATES[0]['OPTIONS']['context_processors'],
+        },
+    }, *settings.TEMPLATES]
+
+
+@pytest.fixture(params=['django', 'jinja2'])
+def template_engine(request: pytest.FixtureRequest, settings: Any, tmp_path: Path) -> str:
+    """Render the blog templates with the Django template language, then with Jinja2."""
+    if request.param == 'jinja2':
+        _use_jinja2(settings, tmp_path)
+    return request.param
+
+
+def _list_context() -> tuple[dict[str, Any], Any]:
+    """Return the template context built by `BlogHome` for an anonymous GET of the first page, and the request."""
+    request = RequestFactory().get(reverse('blog:home'))
+    request.user = AnonymousUser()
+    view = BlogHome()
+    view.setup(request)
+    view.object_list = view.get_queryset()
+    context = view.get_context_data()
+    context['blog'] = list(context['blog'])
+    return context, request
+
+
+def test_render_list_page(benchmark: Any, template_engine: str) -> None:
+    """Rendering of `blogpost_list.html` for a full page of posts, with the post cards cached."""
+    context, request = _list_context()
+    template = loader.get_template(BlogHome.template_name)
+    benchmark(lambda: template.render(context, request), rounds=200)
+
+
+def test_render_list_page_uncached(benchmark: Any, template_engine: str) -> None:
+    """Rendering of `blogpost_list.html` for a full page of posts, every post card included."""
+    context, request = _list_context()
+    template = loader.get_template(BlogHome.template_name)
+    benchmark(lambda: template.render(context, request), rounds=100, setup=cache.clear)
+
+
+@pytest.mark.parametrize('precompiled', [False, True])
+def test_load_jinja2_template(benchmark: Any, settings: Any, tmp_path: Path, precompiled: bool) -> None:
+    """First load of the Jinja2 list template by a server process, compiled or read from the bytecode cache."""
+    _use_jinja2(settings, tmp_path)
+    environment = cast(Jinja2, engines['jinja2']).env
+    if not precompiled:
+        environment = environment.overlay(bytecode_cache=None)
+    benchmark(lambda: environment.overlay(cache_size=0).get_template(BlogHome.template_name), rounds=50)
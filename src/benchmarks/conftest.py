@@ -0,0 +1,184 @@
+"""
+Micro-benchmark plugin, loaded when pytest is pointed at this directory:
+
+    python -m pytest benchmarks --benchmark-compare .benchmarks/<previous run>.json
+
+The `bench_*.py` modules are collected here only; the main test run skips the directory
+(`norecursedirs` in `pytest.ini`). The test database is seeded once with `seed_blog`, each
+benchmark reports its timings, peak memory and SQL queries, and the results are written to
+a JSON file. With `--benchmark-compare`, every benchmark whose median grew by more than
+`--benchmark-max-regression` against the given run makes the session fail.
+"""
+
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import datetime
+from io import StringIO
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+import django
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+RESULTS_DIRECTORY: Path = Path('.benchmarks')
+
+_results: dict[str, dict[str, Any]] = {}
+_regressions: list[str] = []
+_path_key = pytest.StashKey[Path]()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup('benchmark')
+    group.addoption(
+        '--benchmark-rows', type=int, default=1000, help='Number of posts seeded before the benchmarks (default: 1000).',
+    )
+    group.addoption(
+        '--benchmark-json', type=Path, help=f'Where to write the results (default: {RESULTS_DIRECTORY}/<date>.json).',
+    )
+    group.addoption('--benchmark-compare', type=Path, help='Results of a previous run to compare against.')
+    group.addoption(
+        '--benchmark-max-regression', type=float, default=0.2,
+        help='Relative growth of a median that fails the comparison (default: 0.2).',
+    )
+
+
+def pytest_collect_file(file_path: Path, parent: pytest.Collector) -> Optional[pytest.Module]:
+    if file_path.suffix == '.py' and file_path.name.startswith('bench_'):
+        return pytest.Module.from_parent(parent, path=file_path)
+    return None
+
+
+@pytest.fixture(scope='session')
+def django_db_setup(django_db_setup: None, django_db_blocker: Any, pytestconfig: pytest.Config) -> None:
+    """Seed the test database once for the whole session; the benchmarks roll back their own writes."""
+    with django_db_blocker.unblock():
+        call_command('seed_blog', posts=pytestconfig.getoption('benchmark_rows'), stdout=StringIO())
+
+
+class Benchmark:
+    """Runs a function repeatedly and records its measures under the name of the current test.
+
+    Attributes:
+        name (str): The name of the benchmark, the test node ID.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __call__(
+        self, function: Callable[[], Any], rounds: int = 100, warmup: int = 3, setup: Optional[Callable[[], None]] = None,
+    ) -> Any:
+        """Run `function` `rounds` times after `warmup` untimed calls, and record the measures.
+
+        Peak memory is measured on one more call, as `tracemalloc` slows the timed ones down.
+
+        Args:
+            function (Callable[[], Any]): The code to measure.
+            rounds (int): The number of timed calls.
+            warmup (int): The number of calls before the timed ones (caches, imports).
+            setup (Optional[Callable[[], None]]): Called before each call, outside the timing.
+
+        Returns:
+            Any: The return value of the last call.
+        """
+        def call() -> Any:
+            if setup is not None:
+                setup()
+            return function()
+
+        for _ in range(warmup):
+            call()
+        timings: list[float] = []
+        with CaptureQueriesContext(connection) as captured:
+            for _ in range(rounds):
+                if setup is not None:
+                    setup()
+                started = time.perf_counter()
+                result = function()
+                timings.append(time.perf_counter() - started)
+        if setup is not None:
+            setup()
+        tracemalloc.start()
+        try:
+            function()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        _results[self.name] = {
+            'rounds': rounds,
+            'min': min(timings),
+            'median': statistics.median(timings),
+            'mean': statistics.fmean(timings),
+            'max': max(timings),
+            'stdev': statistics.stdev(timings) if rounds > 1 else 0.0,
+            'peak_memory': peak,
+            'queries': len(captured) / rounds,
+        }
+        return result
+
+
+@pytest.fixture
+def benchmark(request: pytest.FixtureRequest) -> Iterator[Benchmark]:
+    """Return a `Benchmark` that records its measures under the name of the test."""
+    yield Benchmark(request.node.nodeid)
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    if not _results:
+        return
+    config = session.config
+    path: Path = config.getoption('benchmark_json') or RESULTS_DIRECTORY / f'{datetime.now():%Y%m%d-%H%M%S}.json'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'rows': config.getoption('benchmark_rows'),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'benchmarks': _results,
+    }, indent=2))
+    config.stash[_path_key] = path
+
+    baseline_path: Optional[Path] = config.getoption('benchmark_compare')
+    if baseline_path is None:
+        return
+    baseline: dict[str, dict[str, Any]] = json.loads(baseline_path.read_text())['benchmarks']
+    threshold: float = config.getoption('benchmark_max_regression')
+    for name, result in _results.items():
+        previous = baseline.get(name)
+        if previous is not None and result['median'] > previous['median'] * (1 + threshold):
+            _regressions.append(name)
+    if _regressions:
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_terminal_summary(terminalreporter: Any, exitstatus: int, config: pytest.Config) -> None:
+    if not _results:
+        return
+    baseline_path: Optional[Path] = config.getoption('benchmark_compare')
+    baseline: dict[str, dict[str, Any]] = json.loads(baseline_path.read_text())['benchmarks'] if baseline_path else {}
+
+    terminalreporter.section('benchmarks')
+    terminalreporter.write_line(
+        f"{'benchmark':<48}{'median (ms)':>13}{'min (ms)':>11}{'peak (KiB)':>12}{'queries':>9}{'vs base':>9}"
+    )
+    for name, result in _results.items():
+        previous = baseline.get(name)
+        change = f"{result['median'] / previous['median'] - 1:+.0%}" if previous else ''
+        terminalreporter.write_line(
+            f"{name.rsplit('::', 1)[-1]:<48}{result['median'] * 1000:>13.3f}{result['min'] * 1000:>11.3f}"
+            f"{result['peak_memory'] / 1024:>12.1f}{result['queries']:>9.1f}{change:>9}",
+            red=name in _regressions,
+        )
+    terminalreporter.write_line(f'Results written to {config.stash[_path_key]}')
+    if _regressions:
+        terminalreporter.write_line(
+            f"{len(_regressions)} benchmark(s) slower than {baseline_path} by more than "
+            f"{config.getoption('benchmark_max_regression'):.0%}.", red=True,
+        )
@@ -1,13 +1,67 @@
-from typing import Optional, Any, Union
+import hashlib
+from typing import Optional, Any, Union, cast
 
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db.models import QuerySet
 from django.http import HttpRequest
+from django.utils import timezone
+from django.utils.functional import cached_property
 
+from .cache import invalidate_all_posts
 from .models import BlogPost
 
 typing_fieldset = Union[list[tuple[Optional[Any], Any]], tuple[tuple[Optional[Any], Any], ...]]
 
 
+class CachedCountPaginator(Paginator):
+    """Paginator that caches the row count of each filtered changelist for `count_timeout` seconds.
+
+    The count shown in the changelist may lag behind by that long, but browsing the pages
+    of a large table no longer runs a COUNT over every row on each request.
+
+    Attributes:
+        count_timeout (int): The lifetime of a cached count, in seconds.
+    """
+    count_timeout: int = 60
+
+    @cached_property
+    def count(self) -> int:
+        if not isinstance(self.object_list, QuerySet):
+            return super().count
+        queryset = self.object_list
+        key = f'blog:admin-count:{hashlib.md5(str(queryset.query).encode()).hexdigest()}'
+        return cast(int, cache.get_or_set(key, queryset.count, self.count_timeout))
+
+
+class BlogPostChangeList(ChangeList):
+    """Changelist that only loads the model columns displayed in `list_display`, not the content."""
+
+    def get_queryset(
+        self, request: HttpRequest, exclude_parameters: Optional[list[Optional[str]]] = None,
+    ) -> QuerySet[BlogPost]:
+        columns = {field.name for field in self.model._meta.fields if field.concrete}
+        return super().get_queryset(request, exclude_parameters).only(
+            *(name for name in self.list_display if name in columns),
+        )
+
+
+def _set_published(queryset: QuerySet[BlogPost], published: bool) -> int:
+    """Publish or unpublish the posts of `queryset` with one UPDATE, then invalidate the cached pages once.
+
+    `last_updated` is bumped so that the HTTP validators of the changed pages change too.
+
+    Returns:
+        int: The number of posts whose state changed.
+    """
+    updated = queryset.exclude(published=published).update(published=published, last_updated=timezone.now())
+    if updated:
+        invalidate_all_posts()
+    return updated
+
+
 class BlogPostAdmin(admin.ModelAdmin):
     """Admin interface configuration for the BlogPost model.
 
@@ -17,22 +71,31 @@ class BlogPostAdmin(admin.ModelAdmin):
     Attributes:
         list_display (tuple[str, ...]): Fields to display in the list view.
         list_editable (tuple[str, ...]): Fields that can be edited directly in the list view.
+        date_hierarchy (str): The date field used to drill down the list view, backed by an index.
+        actions (list[str]): The bulk actions of the list view.
+        paginator (type[CachedCountPaginator]): The paginator of the list view, with cached counts.
+        show_full_result_count (bool): Whether the unfiltered count is shown next to the
+            filtered one, which would cost another COUNT.
         fieldsets (tuple[str, dict]): Configuration of fields grouped by sections in the form view.
         add_fieldsets (list[tuple[str, dict]]): Configuration of fields grouped by sections
             when creating a new `BlogPost`.
     """
     list_display: tuple[str, ...] = ('title', 'published', 'created_on', 'last_updated',)
     list_editable: tuple[str, ...] = ('published',)
+    date_hierarchy: str = 'created_on'
+    actions: list[str] = ['publish_posts', 'unpublish_posts']
+    paginator: type[CachedCountPaginator] = CachedCountPaginator
+    show_full_result_count: bool = False
     fieldsets: list[tuple[Optional[Any], Any]] = [
         ('Informations Générales', {'fields': ('title', 'slug', 'author')}),
-        ('SEO', {'fields': ('meta_description', 'keywords')}),
+        ('SEO', {'fields': ('meta_description', 'meta_keywords')}),
         ('Contenu', {'fields': ('content', 'thumbnail')}),
         ('Publication', {'fields': ('published', 'created_on')}),
     ]
 
     add_fieldsets: list[tuple[Optional[Any], Any]] = [
         ('Nouvel objet - Informations Générales', {'fields': ('title', 'slug', 'author')}),
-        ('Nouvel objet - SEO', {'fields': ('meta_description', 'keywords')}),
+        ('Nouvel objet - SEO', {'fields': ('meta_description', 'meta_keywords')}),
         ('Nouvel objet - Contenu', {'fields': ('content', 'thumbnail')}),
         ('Nouvel objet - Publication', {'fields': ('published', 'created_on')}),
     ]
@@ -55,5 +118,18 @@ class BlogPostAdmin(admin.ModelAdmin):
             return self.add_fieldsets
         return super().get_fieldsets(request, obj)
 
+    def get_changelist(self, request: HttpRequest, **kwargs: Any) -> type[BlogPostChangeList]:
+        return BlogPostChangeList
+
+    @admin.action(description='Publier les articles sélectionnés', permissions=['change'])
+    def publish_posts(self, request: HttpRequest, queryset: QuerySet[BlogPost]) -> None:
+        updated = _set_published(queryset, True)
+        self.message_user(request, f'{updated} article(s) publié(s).')
+
+    @admin.action(description='Dépublier les articles sélectionnés', permissions=['change'])
+    def unpublish_posts(self, request: HttpRequest, queryset: QuerySet[BlogPost]) -> None:
+        updated = _set_published(queryset, False)
+        self.message_user(request, f'{updated} article(s) dépublié(s).')
+
 
 admin.site.register(BlogPost, BlogPostAdmin)
@@ -1,4 +1,5 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class BlogConfig(AppConfig):
@@ -13,3 +14,14 @@ class BlogConfig(AppConfig):
     """
     default_auto_field: str = 'django.db.models.BigAutoField'
     name: str = 'blog'
+
+    def ready(self) -> None:
+        """Connect the signal handlers that invalidate the page cache, and warm the process up if enabled.
+
+        The blog is the last installed app, so every other app is ready for the warm-up.
+        """
+        from . import signals  # noqa: F401
+
+        if getattr(settings, 'WARMUP_ON_STARTUP', False):
+            from website.warmup import warm_up
+            warm_up()
@@ -0,0 +1,385 @@
+import asyncio
+import hashlib
+import time
+from typing import TYPE_CHECKING, Any, Awaitable, Iterable, Optional, TypeGuard, cast
+
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from django.http import HttpRequest, HttpResponse, HttpResponseBase
+from django.template import loader
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+from django.utils.safestring import SafeString, mark_safe
+
+if TYPE_CHECKING:
+    from django.views.generic import View
+
+    from .models import BlogPost
+    _ViewBase = View
+else:
+    _ViewBase = object
+
+LIST_VERSION_KEY: str = 'blog:version:list'
+AUTHORS_VERSION_KEY: str = 'blog:version:authors'
+POSTS_VERSION_KEY: str = 'blog:version:posts'
+# Time of the last invalidation, after which the replica may still serve the previous rows.
+INVALIDATED_AT_KEY: str = 'blog:invalidated-at'
+HITS_KEY: str = 'blog:page-cache:hits'
+MISSES_KEY: str = 'blog:page-cache:misses'
+# The misses, by outcome: served stale, served the page rendered by another request, or rendered.
+STALE_KEY: str = 'blog:page-cache:stale'
+COALESCED_KEY: str = 'blog:page-cache:coalesced'
+RECOMPUTED_KEY: str = 'blog:page-cache:recomputed'
+
+POST_CARD_TEMPLATE: str = 'blog/post_card.html'
+
+# Interval between two reads of a page being rendered by another request, in seconds.
+PAGE_CACHE_POLL_INTERVAL: float = 0.02
+
+
+def get_page_cache() -> BaseCache:
+    """Return the cache backend used for blog pages (`BLOG_PAGE_CACHE_ALIAS`, 'default' by default)."""
+    return caches[getattr(settings, 'BLOG_PAGE_CACHE_ALIAS', 'default')]
+
+
+def page_cache_lock_key(key: str) -> str:
+    """Return the key of the lock held by the request that renders the page cached under `key`."""
+    return f'{key}:lock'
+
+
+def post_version_key(slug: str) -> str:
+    """Return the key of the version counter of the post identified by `slug`."""
+    return f'blog:version:post:{hashlib.md5(slug.encode()).hexdigest()}'
+
+
+def _incr(cache: BaseCache, key: str) -> None:
+    """Increment a counter, seeding it with a timestamp when it is missing or was evicted.
+
+    Seeding with the current time instead of 0 guarantees that a counter recreated after
+    an eviction never reuses a value that cached pages may still be keyed on.
+    """
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), timeout=None)
+
+
+def _count(cache: BaseCache, key: str) -> None:
+    """Increment a statistics counter, creating it when it is missing."""
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, timeout=None)
+
+
+async def _acount(cache: BaseCache, key: str) -> None:
+    """Async version of `_count`."""
+    try:
+        await cache.aincr(key)
+    except ValueError:
+        await cache.aadd(key, 1, timeout=None)
+
+
+def _mark_invalidated(cache: BaseCache) -> None:
+    """Record the time of an invalidation, read by `last_invalidation`."""
+    cache.set(INVALIDATED_AT_KEY, time.time(), timeout=None)
+
+
+def last_invalidation() -> float:
+    """Return the time of the last invalidation of the cached pages, or 0 if there was none."""
+    return get_page_cache().get(INVALIDATED_AT_KEY, 0.0)
+
+
+def get_versions(keys: Iterable[str]) -> list[int]:
+    """Return the current value of the given version counters, initializing the missing ones.
+
+    Args:
+        keys (Iterable[str]): The version counter keys.
+
+    Returns:
+        list[int]: The counter values, in the order of `keys`.
+    """
+    cache = get_page_cache()
+    keys = list(keys)
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+async def aget_versions(keys: Iterable[str]) -> list[int]:
+    """Async version of `get_versions`."""
+    cache = get_page_cache()
+    keys = list(keys)
+    versions = await cache.aget_many(keys)
+    for key in keys:
+        if key not in versions:
+            await cache.aadd(key, time.time_ns(), timeout=None)
+            versions[key] = await cache.aget(key)
+    return [versions[key] for key in keys]
+
+
+def invalidate_posts(*slugs: str) -> None:
+    """Invalidate the cached detail pages of the given posts and every cached list page."""
+    cache = get_page_cache()
+    for slug in slugs:
+        _incr(cache, post_version_key(slug))
+    _incr(cache, LIST_VERSION_KEY)
+    _mark_invalidated(cache)
+
+
+def invalidate_all_posts() -> None:
+    """Invalidate every cached page, for bulk changes where bumping each post's counter would not scale."""
+    cache = get_page_cache()
+    _incr(cache, POSTS_VERSION_KEY)
+    _incr(cache, LIST_VERSION_KEY)
+    _mark_invalidated(cache)
+
+
+def invalidate_authors() -> None:
+    """Invalidate every cached page that displays an author name."""
+    cache = get_page_cache()
+    _incr(cache, AUTHORS_VERSION_KEY)
+    _incr(cache, LIST_VERSION_KEY)
+    _mark_invalidated(cache)
+
+
+def page_cache_stats() -> dict[str, int]:
+    """Return the page cache counters.
+
+    Returns:
+        dict[str, int]: A mapping with the 'hits' and 'misses' counts, and the outcome of the
+            misses: 'stale', 'coalesced' and 'recomputed'.
+    """
+    keys = {'hits': HITS_KEY, 'misses': MISSES_KEY, 'stale': STALE_KEY, 'coalesced': COALESCED_KEY,
+            'recomputed': RECOMPUTED_KEY}
+    counters = get_page_cache().get_many(keys.values())
+    return {name: counters.get(key, 0) for name, key in keys.items()}
+
+
+def post_card_key(post: 'BlogPost', authors_version: int) -> str:
+    """Return the cache key of the card of `post`, which changes with the post and with the authors."""
+    return f'blog:card:{post.pk}:{post.last_updated.timestamp():.6f}:{authors_version}'
+
+
+def render_post_cards(posts: Iterable['BlogPost']) -> list[tuple['BlogPost', SafeString]]:
+    """Return the posts with the HTML of their card, the part of a listing entry common to every user.
+
+    The cards are read from the cache with one multi-get, and only the missing ones are
+    rendered, then stored with one multi-set for `BLOG_FRAGMENT_CACHE_TIMEOUT` seconds. The
+    keys include `last_updated`, which every change of a post updates, and the authors version
+    counter, for the posts whose author name is not copied to `author_name`.
+
+    Args:
+        posts (Iterable[BlogPost]): The posts of the listing, in order.
+
+    Returns:
+        list[tuple[BlogPost, SafeString]]: Each post and its card.
+    """
+    cache = get_page_cache()
+    posts = list(posts)
+    authors_version = get_versions([AUTHORS_VERSION_KEY])[0]
+    keys = [post_card_key(post, authors_version) for post in posts]
+    cards: dict[str, str] = cache.get_many(keys)
+    missing: dict[str, str] = {}
+    for post, key in zip(posts, keys):
+        if key not in cards:
+            cards[key] = missing[key] = loader.render_to_string(POST_CARD_TEMPLATE, {'post': post})
+    if missing:
+        cache.set_many(missing, getattr(settings, 'BLOG_FRAGMENT_CACHE_TIMEOUT', 60 * 60 * 24))
+    return [(post, mark_safe(cards[key])) for post, key in zip(posts, keys)]
+
+
+class PageCacheMixin(_ViewBase):
+    """View mixin that caches the rendered response of GET and HEAD requests.
+
+    A page is cached under a key combining the request path and a variant for anonymous
+    and authenticated users, along with the values of the version counters returned by
+    `get_page_cache_versions`. Writes bump these counters (see `blog.signals`), which makes
+    the cached page stale instead of flushing the whole cache. Responses that are not a
+    plain 200 or that set cookies are never cached. Async views use the async cache API.
+
+    A single request renders a missing or stale page at a time, under a lock held in the
+    cache, which is shared by the worker processes. Meanwhile, the other requests for the
+    page get the stale copy if there is one, kept `page_cache_grace` seconds after it
+    expires, or wait up to `page_cache_lock_wait` seconds for the new one. Requests that
+    follow each other therefore always see the latest version of a page.
+
+    Attributes:
+        page_cache_timeout (Optional[int]): The lifetime of a cached page, in seconds;
+            defaults to the `BLOG_PAGE_CACHE_TIMEOUT` setting.
+        page_cache_grace (Optional[int]): How long a page is kept after it expires, to be
+            served while it is rendered again, in seconds; defaults to the
+            `BLOG_PAGE_CACHE_GRACE` setting.
+        page_cache_lock_timeout (int): The lifetime of the rendering lock, in seconds, in
+            case the request holding it fails.
+        page_cache_lock_wait (float): How long a request waits for the page rendered by
+            another one, in seconds, before rendering it too.
+    """
+    page_cache_timeout: Optional[int] = None
+    page_cache_grace: Optional[int] = None
+    page_cache_lock_timeout: int = 10
+    page_cache_lock_wait: float = 2.0
+
+    def get_page_cache_versions(self) -> list[str]:
+        """Return the keys of the version counters the page depends on."""
+        return [LIST_VERSION_KEY]
+
+    def get_page_cache_key(self, request: HttpRequest) -> str:
+        """Return the cache key of the page requested by `request`, shared by its successive versions."""
+        variant = 'auth' if request.user.is_authenticated else 'anon'
+        fingerprint = f'{variant}:{request.get_full_path()}'
+        return f'blog:page:{hashlib.md5(fingerprint.encode()).hexdigest()}'
+
+    def dispatch(self, request: HttpRequest, *args: Any, **kwargs: Any) -> Any:
+        # A coroutine for async views, like `View.dispatch`.
+        if request.method not in ('GET', 'HEAD'):
+            return super().dispatch(request, *args, **kwargs)
+        if self.view_is_async:
+            return self._page_cache_adispatch(request, *args, **kwargs)
+
+        cache = get_page_cache()
+        key = self.get_page_cache_key(request)
+        versions = get_versions(self.get_page_cache_versions())
+        cached = cache.get(key)
+        if self._is_fresh(cached, versions):
+            _count(cache, HITS_KEY)
+            return self._cached_response(request, cached, 'HIT')
+
+        _count(cache, MISSES_KEY)
+        lock: Optional[str] = page_cache_lock_key(key)
+        if not cache.add(lock, 1, self.page_cache_lock_timeout):
+            if cached is not None:
+                _count(cache, STALE_KEY)
+                return self._cached_response(request, cached, 'STALE')
+            cached = self._wait_for_page(cache, key, versions)
+            if cached is not None:
+                _count(cache, COALESCED_KEY)
+                return self._cached_response(request, cached, 'COALESCED')
+            lock = None
+
+        _count(cache, RECOMPUTED_KEY)
+        try:
+            response = super().dispatch(request, *args, **kwargs)
+        except BaseException:
+            if lock is not None:
+                cache.delete(lock)
+            raise
+        response.headers['X-Page-Cache'] = 'MISS'
+        timeout = self.get_page_cache_timeout()
+
+        def store(rendered: HttpResponseBase) -> None:
+            if self._is_cacheable(rendered):
+                cache.set(key, self._cache_entry(rendered, versions, timeout), timeout + self.get_page_cache_grace())
+            if lock is not None:
+                cache.delete(lock)
+
+        if hasattr(response, 'add_post_render_callback'):
+            response.add_post_render_callback(store)
+        else:
+            store(response)
+        return response
+
+    async def _page_cache_adispatch(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponseBase:
+        """Async version of `dispatch`; async views return responses that are already rendered."""
+        cache = get_page_cache()
+        key = self.get_page_cache_key(request)
+        versions = await aget_versions(self.get_page_cache_versions())
+        cached = await cache.aget(key)
+        if self._is_fresh(cached, versions):
+            await _acount(cache, HITS_KEY)
+            return self._cached_response(request, cached, 'HIT')
+
+        await _acount(cache, MISSES_KEY)
+        lock: Optional[str] = page_cache_lock_key(key)
+        if not await cache.aadd(lock, 1, self.page_cache_lock_timeout):
+            if cached is not None:
+                await _acount(cache, STALE_KEY)
+                return self._cached_response(request, cached, 'STALE')
+            cached = await self._await_page(cache, key, versions)
+            if cached is not None:
+                await _acount(cache, COALESCED_KEY)
+                return self._cached_response(request, cached, 'COALESCED')
+            lock = None
+
+        await _acount(cache, RECOMPUTED_KEY)
+        try:
+            # The handlers of an async view are coroutine functions.
+            response = await cast(Awaitable[HttpResponseBase], super().dispatch(request, *args, **kwargs))
+            response.headers['X-Page-Cache'] = 'MISS'
+            if self._is_cacheable(response):
+                timeout = self.get_page_cache_timeout()
+                await cache.aset(
+                    key, self._cache_entry(response, versions, timeout), timeout + self.get_page_cache_grace(),
+                )
+        finally:
+            if lock is not None:
+                await cache.adelete(lock)
+        return response
+
+    def _wait_for_page(self, cache: BaseCache, key: str, versions: list[int]) -> Optional[dict[str, Any]]:
+        """Return the page rendered by the request holding the lock, or None if it did not come in time."""
+        deadline = time.monotonic() + self.page_cache_lock_wait
+        while time.monotonic() < deadline:
+            time.sleep(PAGE_CACHE_POLL_INTERVAL)
+            cached = cache.get(key)
+            if self._is_fresh(cached, versions):
+                return cached
+            if not cache.has_key(page_cache_lock_key(key)):
+                # The page could not be cached, a 404 for instance.
+                return None
+        return None
+
+    async def _await_page(self, cache: BaseCache, key: str, versions: list[int]) -> Optional[dict[str, Any]]:
+        """Async version of `_wait_for_page`."""
+        deadline = time.monotonic() + self.page_cache_lock_wait
+        while time.monotonic() < deadline:
+            await asyncio.sleep(PAGE_CACHE_POLL_INTERVAL)
+            cached = await cache.aget(key)
+            if self._is_fresh(cached, versions):
+                return cached
+            if not await cache.ahas_key(page_cache_lock_key(key)):
+                return None
+        return None
+
+    def get_page_cache_timeout(self) -> int:
+        if self.page_cache_timeout:
+            return self.page_cache_timeout
+        return getattr(settings, 'BLOG_PAGE_CACHE_TIMEOUT', 300)
+
+    def get_page_cache_grace(self) -> int:
+        if self.page_cache_grace is not None:
+            return self.page_cache_grace
+        return getattr(settings, 'BLOG_PAGE_CACHE_GRACE', 60)
+
+    @staticmethod
+    def _is_fresh(cached: Optional[dict[str, Any]], versions: list[int]) -> bool:
+        return cached is not None and cached['versions'] == versions and cached['fresh_until'] > time.time()
+
+    @staticmethod
+    def _is_cacheable(response: HttpResponseBase) -> TypeGuard[HttpResponse]:
+        # Streaming responses are not `HttpResponse` instances.
+        return isinstance(response, HttpResponse) and response.status_code == 200 and not response.cookies
+
+    @staticmethod
+    def _cache_entry(response: HttpResponse, versions: list[int], timeout: int) -> dict[str, Any]:
+        headers = {name: value for name, value in response.headers.items() if name != 'X-Page-Cache'}
+        return {
+            'content': response.content, 'status': 200, 'headers': headers,
+            'versions': versions, 'fresh_until': time.time() + timeout,
+        }
+
+    @staticmethod
+    def _cached_response(request: HttpRequest, cached: dict[str, Any], outcome: str) -> HttpResponse:
+        response = HttpResponse(cached['content'], status=cached['status'], headers=cached['headers'])
+        # Revalidate against the validators stored with the page, without any query.
+        response = get_conditional_response(
+            request,
+            etag=response.headers.get('ETag'),
+            last_modified=parse_http_date_safe(response.headers.get('Last-Modified', '')),
+            response=response,
+        ) or response
+        response.headers['X-Page-Cache'] = outcome
+        return response
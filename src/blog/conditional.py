@@ -0,0 +1,126 @@
+import hashlib
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Awaitable, Optional, cast
+
+from django.db.models import Max, QuerySet
+from django.http import HttpRequest, HttpResponseBase
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from .cache import LIST_VERSION_KEY, aget_versions, get_versions
+
+if TYPE_CHECKING:
+    from django.views.generic import DetailView, ListView, View
+    _ViewBase = View
+    _DetailViewBase = DetailView
+    _ListViewBase = ListView
+else:
+    _ViewBase = _DetailViewBase = _ListViewBase = object
+
+
+def make_etag(*parts: Any) -> str:
+    """Return a quoted ETag derived from `parts`."""
+    return quote_etag(hashlib.md5(':'.join(str(part) for part in parts).encode()).hexdigest())
+
+
+class ConditionalGetMixin(_ViewBase):
+    """View mixin that answers GET and HEAD requests with 304 Not Modified when possible.
+
+    The validators returned by `get_validators` are computed before the view runs, so a
+    matching `If-None-Match` or `If-Modified-Since` request header short-circuits the
+    template rendering. They are also set on full responses. Async views compute them
+    with `aget_validators`.
+    """
+
+    def get_validators(self) -> tuple[Optional[str], Optional[datetime]]:
+        """Return the ETag and the last modification date of the page.
+
+        Returns:
+            tuple[Optional[str], Optional[datetime]]: The quoted ETag and the last
+                modification date; None for a validator that cannot be computed.
+        """
+        return None, None
+
+    async def aget_validators(self) -> tuple[Optional[str], Optional[datetime]]:
+        """Async version of `get_validators`, used by async views."""
+        return None, None
+
+    def dispatch(self, request: HttpRequest, *args: Any, **kwargs: Any) -> Any:
+        # A coroutine for async views, like `View.dispatch`.
+        if request.method not in ('GET', 'HEAD'):
+            return super().dispatch(request, *args, **kwargs)
+        if self.view_is_async:
+            return self._conditional_adispatch(request, *args, **kwargs)
+
+        etag, last_modified = self.get_validators()
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response: Optional[HttpResponseBase] = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = super().dispatch(request, *args, **kwargs)
+        return self._set_validators(response, etag, timestamp)
+
+    async def _conditional_adispatch(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponseBase:
+        etag, last_modified = await self.aget_validators()
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response: Optional[HttpResponseBase] = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            # The handlers of an async view are coroutine functions.
+            response = await cast(Awaitable[HttpResponseBase], super().dispatch(request, *args, **kwargs))
+        return self._set_validators(response, etag, timestamp)
+
+    @staticmethod
+    def _set_validators(
+        response: HttpResponseBase, etag: Optional[str], timestamp: Optional[int],
+    ) -> HttpResponseBase:
+        if 200 <= response.status_code < 300 or response.status_code == 304:
+            if etag and not response.has_header('ETag'):
+                response.headers['ETag'] = etag
+            if timestamp and not response.has_header('Last-Modified'):
+                response.headers['Last-Modified'] = http_date(timestamp)
+        # Anonymous and authenticated users see different pages under the same URL.
+        patch_vary_headers(response, ('Cookie',))
+        return response
+
+
+class PostConditionalGetMixin(ConditionalGetMixin, _DetailViewBase):
+    """Conditional GET for a single `BlogPost`, validated on its `last_updated` column."""
+
+    def get_validators(self) -> tuple[Optional[str], Optional[datetime]]:
+        return self._post_validators(self._validator_queryset().first())
+
+    async def aget_validators(self) -> tuple[Optional[str], Optional[datetime]]:
+        return self._post_validators(await self._validator_queryset().afirst())
+
+    def _validator_queryset(self) -> QuerySet:
+        return self.model.objects.filter(slug=self.kwargs['slug']).values_list('pk', 'last_updated')
+
+    @staticmethod
+    def _post_validators(row: Optional[tuple[int, datetime]]) -> tuple[Optional[str], Optional[datetime]]:
+        if row is None:
+            return None, None
+        pk, last_updated = row
+        return make_etag(pk, last_updated.isoformat()), last_updated
+
+
+class ListConditionalGetMixin(ConditionalGetMixin, _ListViewBase):
+    """Conditional GET for a list view, validated on the visible set of `get_queryset`.
+
+    The ETag covers the most recent `last_updated` of the visible rows, read from an index,
+    the list version counter of `blog.cache`, which changes when a post is deleted or
+    unpublished, the user variant and the query string, which selects the page. No
+    `Last-Modified` is sent: that date would not move forward on a deletion, and its whole
+    seconds would miss a second edit within the same second.
+    """
+
+    def get_validators(self) -> tuple[Optional[str], Optional[datetime]]:
+        summary = self.get_queryset().order_by().aggregate(latest=Max('last_updated'))
+        return self._list_validators(summary['latest'], get_versions([LIST_VERSION_KEY])[0])
+
+    async def aget_validators(self) -> tuple[Optional[str], Optional[datetime]]:
+        summary = await self.get_queryset().order_by().aaggregate(latest=Max('last_updated'))
+        return self._list_validators(summary['latest'], (await aget_versions([LIST_VERSION_KEY]))[0])
+
+    def _list_validators(self, latest: Optional[datetime], version: int) -> tuple[Optional[str], Optional[datetime]]:
+        variant = 'auth' if self.request.user.is_authenticated else 'anon'
+        etag = make_etag(variant, self.request.get_full_path(), latest.isoformat() if latest else '', version)
+        return etag, None
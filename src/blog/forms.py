@@ -0,0 +1,46 @@
+from django import forms
+from django.core.exceptions import ValidationError
+
+from blog.models import Author
+
+
+class AuthorForm(forms.ModelForm):
+    """
+    A form for creating an `Author`, relying on the database constraint for uniqueness.
+
+    Attributes:
+        Meta:
+            model (Author): The model associated with this form.
+            fields (tuple[str, ...]): The fields included in the form.
+
+    Methods:
+        validate_unique(self) -> None:
+            Skips the uniqueness query; duplicates are reported by `save`.
+        save(self, commit: bool = True) -> Author:
+            Saves the author, reporting a duplicate name as a form error.
+    """
+
+    class Meta:
+        model = Author
+        fields: tuple[str, ...] = ('firstname', 'lastname')
+
+    def validate_unique(self) -> None:
+        """
+        Skips the `exists()` query of the default uniqueness validation.
+
+        The (firstname, lastname) constraint rejects duplicates when the author is inserted,
+        which also holds for concurrent submissions.
+        """
+
+    def save(self, commit: bool = True) -> Author:
+        """
+        Saves the author and adds the duplicate name error to the form if the insert is rejected.
+
+        Raises:
+            ValidationError: If an author with the same name already exists.
+        """
+        try:
+            return super().save(commit=commit)
+        except ValidationError as exc:
+            self.add_error(None, exc)
+            raise
@@ -0,0 +1,36 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db.models import Max, Min, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Concat
+
+from blog.models import Author, BlogPost
+
+
+class Command(BaseCommand):
+    """Management command that fills `BlogPost.author_name` from the `Author` table.
+
+    Posts are updated with one `UPDATE ... SET author_name = (SELECT ...)` per range of
+    primary keys, so the command runs in constant memory and never locks the whole table.
+    """
+    help: str = "Recalcule le nom d'auteur dénormalisé de tous les articles."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--batch-size', type=int, default=5000, help="Nombre d'articles mis à jour par requête.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        batch_size: int = options['batch_size']
+        names = Author.objects.filter(pk=OuterRef('author_id')).values_list(
+            Concat('firstname', Value(' '), 'lastname'),
+        )[:1]
+        bounds = BlogPost.objects.aggregate(low=Min('pk'), high=Max('pk'))
+        if bounds['low'] is None:
+            self.stdout.write('Aucun article à mettre à jour.')
+            return
+
+        updated = 0
+        for start in range(bounds['low'], bounds['high'] + 1, batch_size):
+            updated += BlogPost.objects.filter(pk__gte=start, pk__lt=start + batch_size).update(
+                author_name=Coalesce(Subquery(names), Value('')),
+            )
+        self.stdout.write(self.style.SUCCESS(f'{updated} articles mis à jour.'))
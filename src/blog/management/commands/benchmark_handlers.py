@@ -0,0 +1,167 @@
+import asyncio
+import queue
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Any, Callable, Mapping, Optional
+
+from django.conf import settings
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandParser
+from django.core.wsgi import get_wsgi_application
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from blog.models import BlogPost
+from website.loadtest import percentile
+
+
+class Command(BaseCommand):
+    """Management command that measures the throughput of the site under the WSGI and ASGI handlers.
+
+    The requests are sent in-process to `website.wsgi` and `website.asgi` applications, so
+    the figures measure Django and the views, not a web server: the WSGI handler is driven
+    by a pool of threads and the ASGI handler by as many concurrent tasks on one event loop.
+    The views served are the ones selected by the `ASYNC_VIEWS` setting; compare a run with
+    `ASYNC_VIEWS=0` and one with `ASYNC_VIEWS=1`.
+    """
+    help: str = 'Compare le débit (requêtes/s) et la latence p99 des gestionnaires WSGI et ASGI.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--path', action='append', dest='paths',
+            help="Adresse à interroger (répétable) ; par défaut l'accueil, la liste des articles et le dernier article.",
+        )
+        parser.add_argument('--requests', type=int, default=2000, help='Nombre de requêtes par gestionnaire.')
+        parser.add_argument('--concurrency', type=int, default=16, help='Nombre de requêtes simultanées.')
+        parser.add_argument(
+            '--handler', choices=['wsgi', 'asgi', 'both'], default='both', help='Gestionnaire(s) à mesurer.',
+        )
+        parser.add_argument(
+            '--host', default='localhost', help='En-tête Host des requêtes (doit figurer dans ALLOWED_HOSTS).',
+        )
+        parser.add_argument(
+            '--no-page-cache', action='store_true', help='Désactive le cache des pages du blog pendant la mesure.',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        paths: list[str] = options['paths'] or self._default_paths()
+        total: int = options['requests']
+        concurrency: int = options['concurrency']
+        self.host: str = options['host']
+        handlers = ['wsgi', 'asgi'] if options['handler'] == 'both' else [options['handler']]
+        plan = [paths[index % len(paths)] for index in range(total)]
+
+        overrides: dict[str, Any] = {}
+        if options['no_page_cache']:
+            overrides = {
+                'CACHES': {**settings.CACHES, 'benchmark': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}},
+                'BLOG_PAGE_CACHE_ALIAS': 'benchmark',
+            }
+
+        views = 'async' if settings.ASYNC_VIEWS else 'sync'
+        self.stdout.write(f"{'gestionnaire':<13}{'vues':<7}{'requêtes':>9}{'erreurs':>9}{'req/s':>10}{'p50 (ms)':>10}{'p99 (ms)':>10}")
+        with override_settings(**overrides):
+            for handler in handlers:
+                run: Callable[[list[str], int], tuple[list[float], int]] = getattr(self, f'_run_{handler}')
+                run(paths, concurrency)  # Warm-up: imports, template loading, URL resolution.
+                started = time.perf_counter()
+                latencies, errors = run(plan, concurrency)
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f'{handler:<13}{views:<7}{len(latencies):>9}{errors:>9}{len(latencies) / elapsed:>10.1f}'
+                    f'{percentile(latencies, 0.5) * 1000:>10.2f}{percentile(latencies, 0.99) * 1000:>10.2f}'
+                )
+
+    @staticmethod
+    def _default_paths() -> list[str]:
+        paths = ['/', reverse('blog:home')]
+        slug: Optional[str] = BlogPost.objects.filter(published=True).values_list('slug', flat=True).first()
+        if slug is not None:
+            paths.append(reverse('blog:detail', kwargs={'slug': slug}))
+        return paths
+
+    def _run_wsgi(self, plan: list[str], concurrency: int) -> tuple[list[float], int]:
+        """Send the requests of `plan` to the WSGI handler from `concurrency` threads."""
+        application = get_wsgi_application()
+        statuses: list[int] = []
+        pending: queue.SimpleQueue[str] = queue.SimpleQueue()
+        for path in plan:
+            pending.put(path)
+
+        def start_response(status: str, headers: list[tuple[str, str]], exc_info: Any = None) -> Callable[[bytes], None]:
+            statuses.append(int(status.split()[0]))
+            # The `write` callable of the WSGI specification; Django returns the body instead.
+            return lambda data: None
+
+        def worker() -> list[float]:
+            latencies: list[float] = []
+            while True:
+                try:
+                    path = pending.get_nowait()
+                except queue.Empty:
+                    return latencies
+                environ = {
+                    'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': '', 'SCRIPT_NAME': '',
+                    'SERVER_NAME': self.host, 'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1',
+                    'HTTP_HOST': self.host, 'REMOTE_ADDR': '127.0.0.1', 'wsgi.input': BytesIO(),
+                    'wsgi.errors': sys.stderr, 'wsgi.url_scheme': 'http', 'wsgi.version': (1, 0),
+                    'wsgi.multithread': True, 'wsgi.multiprocess': False, 'wsgi.run_once': False,
+                }
+                started = time.perf_counter()
+                response = application(environ, start_response)
+                b''.join(response)
+                response.close()
+                latencies.append(time.perf_counter() - started)
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [executor.submit(worker) for _ in range(concurrency)]
+            latencies = [latency for future in futures for latency in future.result()]
+        return latencies, sum(1 for status in statuses if status >= 400)
+
+    def _run_asgi(self, plan: list[str], concurrency: int) -> tuple[list[float], int]:
+        """Send the requests of `plan` to the ASGI handler from `concurrency` tasks."""
+        application = get_asgi_application()
+        statuses: list[int] = []
+
+        async def request(path: str) -> None:
+            finished = asyncio.Event()
+            messages = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+
+            async def receive() -> dict[str, Any]:
+                if messages:
+                    return messages.pop()
+                await finished.wait()
+                return {'type': 'http.disconnect'}
+
+            async def send(message: Mapping[str, Any]) -> None:
+                if message['type'] == 'http.response.start':
+                    statuses.append(message['status'])
+                elif message['type'] == 'http.response.body' and not message.get('more_body'):
+                    finished.set()
+
+            scope = {
+                'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+                'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': b'', 'root_path': '',
+                'headers': [(b'host', self.host.encode())], 'client': ('127.0.0.1', 0), 'server': (self.host, 80),
+            }
+            await application(scope, receive, send)
+            finished.set()
+
+        async def worker(pending: list[str]) -> list[float]:
+            latencies: list[float] = []
+            while pending:
+                path = pending.pop()
+                started = time.perf_counter()
+                await request(path)
+                latencies.append(time.perf_counter() - started)
+            return latencies
+
+        async def main() -> list[float]:
+            pending = list(reversed(plan))
+            results = await asyncio.gather(*(worker(pending) for _ in range(concurrency)))
+            return [latency for latencies in results for latency in latencies]
+
+        latencies = asyncio.run(main())
+        return latencies, sum(1 for status in statuses if status >= 400)
@@ -0,0 +1,38 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.template import engines
+from django.template.backends.jinja2 import Jinja2
+
+from website.templating import get_bytecode_directory
+
+
+class Command(BaseCommand):
+    """Management command that compiles the Jinja2 templates into the bytecode cache.
+
+    Run at deploy time, after the templates are installed, so that the server processes load
+    every template from `JINJA2_BYTECODE_CACHE` instead of compiling it on its first request.
+    Jinja2 compares the source of a template with the one its bytecode was compiled from, so
+    a stale cache is never used; `--clear` only removes the bytecode of deleted templates.
+    """
+    help: str = 'Précompile les templates Jinja2 dans le cache de bytecode (JINJA2_BYTECODE_CACHE).'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--clear', action='store_true', help='Vide le cache de bytecode avant la compilation.')
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        backends = [engine for engine in engines.all() if isinstance(engine, Jinja2)]
+        if not backends:
+            raise CommandError('Aucun moteur Jinja2 configuré : renseignez JINJA2_APPS.')
+
+        compiled = 0
+        for backend in backends:
+            if options['clear'] and backend.env.bytecode_cache is not None:
+                backend.env.bytecode_cache.clear()
+            if backend.env.cache is not None:
+                # Loaded anew, so that the templates missing from the bytecode cache are written to it.
+                backend.env.cache.clear()
+            for name in backend.env.list_templates(extensions=['html']):
+                backend.env.get_template(name)
+                compiled += 1
+        self.stdout.write(self.style.SUCCESS(f'{compiled} templates compilés dans {get_bytecode_directory()}.'))
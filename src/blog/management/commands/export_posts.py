@@ -0,0 +1,49 @@
+import json
+from contextlib import nullcontext
+from typing import Any, ContextManager, TextIO, cast
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.core.serializers.json import DjangoJSONEncoder
+
+from blog.models import BlogPost
+
+# Columns written for each post; derived columns (`author_name`, pre-rendered HTML,
+# thumbnail variants) are recomputed on import.
+EXPORT_FIELDS: tuple[str, ...] = (
+    'title', 'slug', 'meta_description', 'meta_keywords', 'content', 'created_on', 'published', 'thumbnail',
+)
+
+
+class Command(BaseCommand):
+    """Management command that exports every blog post as one JSON object per line (JSONL).
+
+    Rows are streamed with `iterator(chunk_size)`, so memory use does not depend on the
+    number of posts. The author is exported by name so that the file can be imported in
+    another environment with `import_posts`.
+    """
+    help: str = 'Exporte les articles au format JSONL (un objet JSON par ligne).'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('path', help='Fichier de destination, ou « - » pour la sortie standard.')
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Nombre de lignes lues par requête.')
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        rows = (
+            BlogPost.objects.order_by('pk')
+            .values(*EXPORT_FIELDS, 'author__firstname', 'author__lastname')
+            .iterator(chunk_size=options['chunk_size'])
+        )
+        path: str = options['path']
+        exported = 0
+        destination: ContextManager[TextIO]
+        if path == '-':
+            destination = nullcontext(cast(TextIO, self.stdout))
+        else:
+            destination = open(path, 'w', encoding='utf-8')
+        with destination as output:
+            for row in rows:
+                firstname, lastname = row.pop('author__firstname'), row.pop('author__lastname')
+                row['author'] = None if firstname is None else {'firstname': firstname, 'lastname': lastname}
+                output.write(json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n')
+                exported += 1
+        self.stderr.write(f'{exported} articles exportés.')
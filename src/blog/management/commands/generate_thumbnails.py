@@ -0,0 +1,61 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Optional
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.utils import timezone
+
+from blog.cache import invalidate_posts
+from blog.models import BlogPost
+from blog.thumbnails import generate_derivatives
+
+
+def _generate(name: str) -> tuple[str, Optional[list[int]], Optional[str]]:
+    """Generate the variants of one image, returning the error instead of raising it."""
+    try:
+        return name, generate_derivatives(name), None
+    except OSError as exc:
+        return name, None, str(exc)
+
+
+class Command(BaseCommand):
+    """Management command that generates the resized variants of existing post thumbnails.
+
+    Images are decoded and resized in a pool of worker processes; the parent process
+    records the generated widths on the posts.
+    """
+    help: str = 'Génère les variantes redimensionnées des vignettes des articles existants.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--processes', type=int, default=os.cpu_count() or 1,
+            help='Nombre de processus de redimensionnement (1 pour traiter dans le processus courant).',
+        )
+        parser.add_argument('--force', action='store_true', help='Régénère aussi les vignettes déjà traitées.')
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        posts = BlogPost.objects.exclude(thumbnail='')
+        if not options['force']:
+            posts = posts.filter(thumbnail_widths=[])
+        slugs_by_name: dict[str, list[str]] = {}
+        for slug, name in posts.values_list('slug', 'thumbnail').iterator():
+            slugs_by_name.setdefault(name, []).append(slug)
+
+        processes: int = options['processes']
+        if processes <= 1:
+            self._record(map(_generate, slugs_by_name), slugs_by_name)
+        else:
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                self._record(executor.map(_generate, slugs_by_name, chunksize=4), slugs_by_name)
+
+    def _record(self, results: Any, slugs_by_name: dict[str, list[str]]) -> None:
+        generated = failed = 0
+        for name, widths, error in results:
+            if widths is None:
+                failed += 1
+                self.stderr.write(f'{name} : {error}')
+                continue
+            BlogPost.objects.filter(thumbnail=name).update(thumbnail_widths=widths, last_updated=timezone.now())
+            invalidate_posts(*slugs_by_name[name])
+            generated += 1
+        self.stdout.write(self.style.SUCCESS(f'{generated} vignettes traitées, {failed} en échec.'))
@@ -0,0 +1,159 @@
+import json
+import sys
+from contextlib import nullcontext
+from datetime import date
+from itertools import islice
+from typing import Any, ContextManager, Iterable, Optional, TextIO
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import transaction
+from django.db.models import Q
+from django.template.defaultfilters import slugify
+
+from blog import search
+from blog.cache import invalidate_authors, invalidate_posts
+from blog.models import Author, BlogPost
+from blog.rendering import render_content, render_excerpt
+
+# Columns overwritten when an imported post already exists with the same slug. The
+# thumbnail variants are reset, as the imported image may differ from the current one.
+UPSERT_FIELDS: list[str] = [
+    'title', 'meta_description', 'meta_keywords', 'content', 'content_html', 'excerpt_html',
+    'created_on', 'published', 'thumbnail', 'thumbnail_widths', 'author', 'author_name', 'last_updated',
+]
+
+
+class Command(BaseCommand):
+    """Management command that imports blog posts from a JSONL file produced by `export_posts`.
+
+    The file is read in batches: each batch resolves its authors against a single map
+    prefetched at start-up, creates the missing ones with `bulk_get_or_create_authors`, and upserts
+    its posts on `slug` with one `INSERT ... ON CONFLICT DO UPDATE`. Derived columns and the
+    full-text index are computed per batch as well, so no query is issued per row.
+
+    Thumbnails are imported by name only; run `generate_thumbnails` afterwards to build
+    their resized variants.
+    """
+    help: str = 'Importe des articles depuis un fichier JSONL (mise à jour des articles existants par slug).'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('path', help='Fichier source, ou « - » pour l\'entrée standard.')
+        parser.add_argument('--batch-size', type=int, default=2000, help="Nombre d'articles écrits par lot.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        path: str = options['path']
+        batch_size: int = options['batch_size']
+        self.authors: dict[tuple[str, str], int] = {
+            (firstname, lastname): pk for pk, firstname, lastname in
+            Author.objects.values_list('pk', 'firstname', 'lastname').iterator(chunk_size=batch_size)
+        }
+        self.authors_created = 0
+
+        imported = skipped = 0
+        source_file: ContextManager[TextIO]
+        if path == '-':
+            source_file = nullcontext(sys.stdin)
+        else:
+            source_file = open(path, encoding='utf-8')
+        with source_file as source:
+            records = (self._parse(number, line) for number, line in enumerate(source, start=1) if line.strip())
+            while batch := list(islice(records, batch_size)):
+                written, rejected = self._import_batch(batch)
+                imported += written
+                skipped += rejected
+
+        if self.authors_created:
+            invalidate_authors()
+        self.stdout.write(self.style.SUCCESS(
+            f'{imported} articles importés, {skipped} ignorés, {self.authors_created} auteurs créés.'
+        ))
+
+    @staticmethod
+    def _parse(number: int, line: str) -> dict[str, Any]:
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError('un objet JSON est attendu')
+            if not record.get('title'):
+                raise ValueError('le titre est obligatoire')
+            author = record.get('author')
+            if author and not (isinstance(author, dict) and author.get('firstname') and author.get('lastname')):
+                raise ValueError("l'auteur doit avoir un prénom (firstname) et un nom (lastname)")
+            if record.get('created_on'):
+                try:
+                    record['created_on'] = date.fromisoformat(record['created_on'])
+                except (TypeError, ValueError):
+                    raise ValueError(f"date de création (created_on) invalide : {record['created_on']!r}") from None
+        except ValueError as exc:
+            raise CommandError(f'Ligne {number} invalide : {exc}') from exc
+        record['slug'] = record.get('slug') or slugify(record['title'])
+        return record
+
+    def _resolve_authors(self, records: Iterable[dict[str, Any]]) -> None:
+        """Resolve the authors of `records` missing from the prefetched map, creating them in bulk.
+
+        Authors created since the map was prefetched are read back instead of being duplicated.
+        """
+        missing = {
+            (record['author']['firstname'], record['author']['lastname'])
+            for record in records if record.get('author')
+        } - self.authors.keys()
+        if not missing:
+            return
+        authors, created = Author.objects.bulk_get_or_create_authors(missing)
+        self.authors.update({name: author.pk for name, author in authors.items()})
+        self.authors_created += len(created)
+
+    def _import_batch(self, records: list[dict[str, Any]]) -> tuple[int, int]:
+        """Upsert a batch of records and return the number of written and rejected records."""
+        # The last occurrence of a slug within the batch wins.
+        by_slug = {record['slug']: record for record in records}
+        rejected = len(records) - len(by_slug)
+
+        # A title already used by a post with another slug would violate the title
+        # uniqueness; these records are reported and skipped.
+        titles = {record['title']: slug for slug, record in by_slug.items()}
+        rejected += len(by_slug) - len(titles)
+        by_slug = {slug: by_slug[slug] for slug in titles.values()}
+        updated_slugs: set[str] = set()
+        existing = BlogPost.objects.filter(Q(slug__in=by_slug) | Q(title__in=titles)).values_list('slug', 'title')
+        for slug, title in existing:
+            if slug in by_slug:
+                updated_slugs.add(slug)
+            if title in titles and titles[title] != slug and titles[title] in by_slug:
+                self.stderr.write(f'Titre déjà utilisé par « {slug} » : {title}')
+                del by_slug[titles[title]]
+                rejected += 1
+
+        with transaction.atomic():
+            self._resolve_authors(by_slug.values())
+            posts = [self._build_post(record) for record in by_slug.values()]
+            BlogPost.objects.bulk_create(
+                posts, update_conflicts=True, unique_fields=['slug'], update_fields=UPSERT_FIELDS,
+            )
+            search.index_rows(
+                BlogPost.objects.filter(slug__in=by_slug).values_list('pk', *search.FTS_COLUMNS).iterator()
+            )
+        # Only existing posts can have cached pages.
+        invalidate_posts(*updated_slugs & by_slug.keys())
+        return len(posts), rejected
+
+    def _build_post(self, record: dict[str, Any]) -> BlogPost:
+        author: Optional[dict[str, str]] = record.get('author')
+        content: str = record.get('content') or ''
+        created_on: Optional[date] = record.get('created_on') or None
+        return BlogPost(
+            title=record['title'],
+            slug=record['slug'],
+            meta_description=record.get('meta_description') or '',
+            meta_keywords=record.get('meta_keywords') or '',
+            content=content,
+            content_html=render_content(content),
+            excerpt_html=render_excerpt(content),
+            created_on=created_on,
+            published=bool(record.get('published')),
+            thumbnail=record.get('thumbnail') or '',
+            thumbnail_widths=[],
+            author_id=self.authors[(author['firstname'], author['lastname'])] if author else None,
+            author_name=f"{author['firstname']} {author['lastname']}" if author else '',
+        )
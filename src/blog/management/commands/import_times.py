@@ -0,0 +1,113 @@
+import json
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+# Run in a new interpreter, so that every module is imported anew: the startup of a server
+# process, timed by phase. The warm-up of `BlogConfig.ready()` is disabled, then run apart.
+STARTUP_SCRIPT: str = '''
+import json, sys, time
+started = time.perf_counter()
+import django
+django.setup()
+setup = time.perf_counter()
+from website.{target} import application
+loaded = time.perf_counter()
+if {warm_up}:
+    from website.warmup import warm_up
+    warm_up()
+sys.stdout.write(json.dumps({{
+    'setup': setup - started, 'application': loaded - setup, 'warm_up': time.perf_counter() - loaded,
+}}))
+'''
+
+IMPORT_TIME_PREFIX: str = 'import time:'
+
+
+@dataclass
+class ImportTime:
+    """An import reported by `python -X importtime`.
+
+    Attributes:
+        module (str): The name of the module.
+        own (float): The time spent executing the module itself, in seconds.
+        cumulative (float): The time including the imports of the module, in seconds.
+    """
+    module: str
+    own: float
+    cumulative: float
+
+
+def parse_import_times(output: str) -> list[ImportTime]:
+    """Return the imports listed in the standard error of `python -X importtime`, in order."""
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith(IMPORT_TIME_PREFIX) or 'self [us]' in line:
+            continue
+        own, cumulative, module = line[len(IMPORT_TIME_PREFIX):].split('|')
+        imports.append(ImportTime(module.strip(), int(own) / 1e6, int(cumulative) / 1e6))
+    return imports
+
+
+class Command(BaseCommand):
+    """Management command that reports where the startup of a server process spends its time.
+
+    A new interpreter started with `-X importtime` sets Django up, loads the WSGI or ASGI
+    application and, with `--warm-up`, runs `website.warmup.warm_up()`. The duration of each
+    phase is printed, then the slowest imports: modules by cumulative or own time, or
+    top-level packages by the total own time of their modules.
+    """
+    help: str = "Mesure le démarrage d'un processus serveur et liste les imports les plus coûteux."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--target', choices=('wsgi', 'asgi'), default='wsgi', help='Application chargée.')
+        parser.add_argument('--warm-up', action='store_true', help='Mesure aussi le préchauffage (website.warmup).')
+        parser.add_argument(
+            '--by', choices=('cumulative', 'own', 'package'), default='cumulative',
+            help='Classement : modules par temps cumulé ou propre, ou paquets par temps propre total.',
+        )
+        parser.add_argument('--limit', type=int, default=25, help='Nombre de lignes affichées.')
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        environment = {**os.environ, 'DJANGO_SETTINGS_MODULE': settings.SETTINGS_MODULE, 'WARMUP_ON_STARTUP': 'false'}
+        script = STARTUP_SCRIPT.format(target=options['target'], warm_up=options['warm_up'])
+        process = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', script],
+            cwd=settings.BASE_DIR, env=environment, capture_output=True, text=True,
+        )
+        if process.returncode != 0:
+            errors = [line for line in process.stderr.splitlines() if not line.startswith(IMPORT_TIME_PREFIX)]
+            raise CommandError('Le démarrage a échoué :\n' + '\n'.join(errors[-20:]))
+
+        phases: dict[str, float] = json.loads(process.stdout)
+        imports = parse_import_times(process.stderr)
+        line = (
+            f"Démarrage : django.setup() {phases['setup'] * 1000:.1f} ms, "
+            f"application {options['target'].upper()} {phases['application'] * 1000:.1f} ms"
+        )
+        if options['warm_up']:
+            line += f", préchauffage {phases['warm_up'] * 1000:.1f} ms"
+        self.stdout.write(
+            f'{line} ; {len(imports)} modules importés en {sum(item.own for item in imports) * 1000:.1f} ms.'
+        )
+
+        limit: int = options['limit']
+        if options['by'] == 'package':
+            packages: dict[str, list[ImportTime]] = {}
+            for item in imports:
+                packages.setdefault(item.module.partition('.')[0], []).append(item)
+            totals = sorted(packages.items(), key=lambda package: sum(item.own for item in package[1]), reverse=True)
+            self.stdout.write(f"{'paquet':<50}{'modules':>9}{'propre (ms)':>13}")
+            for name, items in totals[:limit]:
+                self.stdout.write(f'{name:<50}{len(items):>9}{sum(item.own for item in items) * 1000:>13.1f}')
+            return
+
+        key = 'own' if options['by'] == 'own' else 'cumulative'
+        self.stdout.write(f"{'module':<50}{'propre (ms)':>13}{'cumulé (ms)':>13}")
+        for item in sorted(imports, key=lambda item: getattr(item, key), reverse=True)[:limit]:
+            self.stdout.write(f'{item.module:<50}{item.own * 1000:>13.1f}{item.cumulative * 1000:>13.1f}')
@@ -0,0 +1,243 @@
+import asyncio
+import random
+import secrets
+import time
+from dataclasses import dataclass
+from typing import Any, Optional, Union
+from urllib.parse import urlencode
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.urls import reverse
+
+from accounts.models import CustomUser
+from blog.models import BlogPost
+from website.loadtest import ASGIClient, HTTPClient, LoadResponse, WSGIClient, percentile
+
+# Domain of the email of the staff account created for a run.
+LOADTEST_EMAIL_DOMAIN: str = 'loadtest.invalid'
+
+# Number of published slugs the `detail` scenario picks from.
+DETAIL_SLUGS: int = 1000
+
+Client = Union[ASGIClient, WSGIClient, HTTPClient]
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """A kind of request of the load mix.
+
+    Attributes:
+        url_name (str): The URL name of the requested view, under which latencies are reported.
+        method (str): The HTTP method.
+        login (bool): Whether the request needs a logged-in staff session.
+        expected_status (int): The status code of a successful response.
+    """
+    url_name: str
+    method: str = 'GET'
+    login: bool = False
+    expected_status: int = 200
+
+
+SCENARIOS: dict[str, Scenario] = {
+    'home': Scenario('blog:home'),
+    'detail': Scenario('blog:detail'),
+    'login': Scenario('accounts:login', method='POST', expected_status=302),
+    'admin': Scenario('admin:blog_blogpost_changelist', login=True),
+}
+
+DEFAULT_WEIGHTS: dict[str, float] = {'home': 60, 'detail': 30, 'login': 5, 'admin': 5}
+
+
+class VirtualUser:
+    """A client session.
+
+    Attributes:
+        cookies (dict[str, str]): The cookies of the session.
+        logged_in (bool): Whether the session is authenticated with the staff account.
+        credentials (tuple[str, str]): The email and password of the staff account of the run.
+    """
+
+    def __init__(self, logged_in: bool, credentials: tuple[str, str]) -> None:
+        self.cookies: dict[str, str] = {}
+        self.logged_in = logged_in
+        self.credentials = credentials
+
+    def headers(self, cookies: Optional[dict[str, str]] = None) -> dict[str, str]:
+        cookies = self.cookies if cookies is None else cookies
+        return {'Cookie': '; '.join(f'{name}={value}' for name, value in cookies.items())} if cookies else {}
+
+    def login_form(self) -> tuple[dict[str, str], bytes]:
+        """Return the headers and body of a POST to the login view, with the CSRF token of the session."""
+        token = self.cookies.get('csrftoken', '')
+        email, password = self.credentials
+        body = urlencode({'username': email, 'password': password, 'csrfmiddlewaretoken': token})
+        return {'Content-Type': 'application/x-www-form-urlencoded'}, body.encode()
+
+
+class Command(BaseCommand):
+    """Management command that measures the site under a weighted mix of realistic requests.
+
+    Virtual users, as many as `--concurrency`, send the requests of the mix one after the
+    other, from one asyncio event loop. The target is the ASGI application
+    (`website.asgi.application`) or the WSGI one (`website.wsgi.application`, called from a
+    thread pool) in-process, or a running server reached over TCP. In the latter case the
+    server must use the same database, where the staff account is created.
+
+    The staff account is created for the run with `CustomUserManager`, with a random email
+    and password, and deleted at the end of the run. The logged-in virtual users open their
+    session through the `accounts:login` form before the measure starts. The `login`
+    scenario posts the same form from a fresh session, password hashing included.
+    """
+    help: str = 'Génère une charge réaliste (accueil, article, connexion, admin) et mesure débit et latences par vue.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--target', default='asgi',
+            help="« asgi » ou « wsgi » pour l'application en mémoire, ou l'adresse d'un serveur (http://127.0.0.1:8000).",
+        )
+        parser.add_argument('--requests', type=int, default=2000, help='Nombre total de requêtes mesurées.')
+        parser.add_argument('--concurrency', type=int, default=16, help='Nombre d\'utilisateurs virtuels simultanés.')
+        parser.add_argument(
+            '--scenario', action='append', dest='scenarios', metavar='NOM=POIDS',
+            help=f"Poids d'un scénario (répétable) parmi {', '.join(SCENARIOS)} ; par défaut "
+                 f"{' '.join(f'{name}={weight:g}' for name, weight in DEFAULT_WEIGHTS.items())}.",
+        )
+        parser.add_argument(
+            '--logged-in', type=float, default=0.2,
+            help='Part des utilisateurs virtuels connectés avec un compte staff (0 à 1).',
+        )
+        parser.add_argument(
+            '--host', default='localhost', help='En-tête Host des requêtes en mémoire (doit figurer dans ALLOWED_HOSTS).',
+        )
+        parser.add_argument('--seed', type=int, default=0, help='Graine du tirage des scénarios.')
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        weights = self._parse_weights(options['scenarios'])
+        concurrency: int = options['concurrency']
+        if concurrency < 1 or options['requests'] < 1:
+            raise CommandError('--requests et --concurrency doivent être positifs.')
+        if not 0 <= options['logged_in'] <= 1:
+            raise CommandError('--logged-in doit être compris entre 0 et 1.')
+        logged_in = round(options['logged_in'] * concurrency)
+        if logged_in == 0 and not any(weight for name, weight in weights.items() if not SCENARIOS[name].login):
+            raise CommandError("Aucun scénario n'est accessible sans connexion ; augmentez --logged-in.")
+
+        self.slugs: list[str] = list(
+            BlogPost.objects.filter(published=True).values_list('slug', flat=True)[:DETAIL_SLUGS]
+        )
+        if weights.get('detail') and not self.slugs:
+            raise CommandError("Le scénario detail nécessite au moins un article publié.")
+        client = self._client(options['target'], options['host'], concurrency)
+        credentials = (f'loadtest-{secrets.token_hex(8)}@{LOADTEST_EMAIL_DOMAIN}', secrets.token_urlsafe(32))
+        account = CustomUser.objects.create_superuser(email=credentials[0], password=credentials[1])
+        users = [VirtualUser(logged_in=index < logged_in, credentials=credentials) for index in range(concurrency)]
+        try:
+            latencies, errors, elapsed = asyncio.run(
+                self._run(client, users, weights, options['requests'], random.Random(options['seed'])),
+            )
+        finally:
+            if isinstance(client, WSGIClient):
+                client.close()
+            account.delete()
+
+        total = sum(len(values) for values in latencies.values())
+        self.stdout.write(
+            f"{'vue':<34}{'requêtes':>9}{'erreurs':>9}{'req/s':>9}{'p50 (ms)':>10}{'p95 (ms)':>10}{'p99 (ms)':>10}"
+        )
+        rows = sorted(latencies.items()) + [('total', [value for values in latencies.values() for value in values])]
+        for url_name, values in rows:
+            failed = errors.get(url_name, 0) if url_name != 'total' else sum(errors.values())
+            self.stdout.write(
+                f'{url_name:<34}{len(values):>9}{failed:>9}{len(values) / elapsed:>9.1f}'
+                + ''.join(f'{percentile(values, fraction) * 1000:>10.2f}' for fraction in (0.5, 0.95, 0.99))
+            )
+        self.stdout.write(self.style.SUCCESS(f'{total} requêtes en {elapsed:.2f} s.'))
+
+    @staticmethod
+    def _parse_weights(values: Optional[list[str]]) -> dict[str, float]:
+        if not values:
+            return dict(DEFAULT_WEIGHTS)
+        weights: dict[str, float] = {}
+        for value in values:
+            name, _, weight = value.partition('=')
+            if name not in SCENARIOS:
+                raise CommandError(f"Scénario inconnu : {name} (choix : {', '.join(SCENARIOS)}).")
+            try:
+                weights[name] = float(weight)
+            except ValueError:
+                raise CommandError(f'Poids invalide pour {name} : {weight!r}.')
+            if weights[name] < 0:
+                raise CommandError(f'Poids négatif pour {name}.')
+        if not any(weights.values()):
+            raise CommandError('Au moins un scénario doit avoir un poids positif.')
+        return weights
+
+    @staticmethod
+    def _client(target: str, host: str, concurrency: int) -> Client:
+        if target == 'asgi':
+            from website.asgi import application as asgi_application
+            return ASGIClient(asgi_application, host)
+        if target == 'wsgi':
+            from website.wsgi import application as wsgi_application
+            return WSGIClient(wsgi_application, host, concurrency)
+        try:
+            return HTTPClient(target)
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+    async def _run(
+        self, client: Client, users: list[VirtualUser], weights: dict[str, float], total: int, generator: random.Random,
+    ) -> tuple[dict[str, list[float]], dict[str, int], float]:
+        """Open the sessions, then send `total` requests drawn from `weights` and time them."""
+        login_path = reverse('accounts:login')
+        # One after the other, so that the measure does not start with a burst of logins.
+        for user in users:
+            await self._open_session(client, user, login_path)
+
+        latencies: dict[str, list[float]] = {}
+        errors: dict[str, int] = {}
+        remaining = total
+
+        async def worker(user: VirtualUser) -> None:
+            nonlocal remaining
+            names = [name for name, weight in weights.items() if weight and (user.logged_in or not SCENARIOS[name].login)]
+            if not names:
+                return
+            while remaining > 0:
+                remaining -= 1
+                scenario = SCENARIOS[generator.choices(names, [weights[name] for name in names])[0]]
+                started = time.perf_counter()
+                try:
+                    response = await self._send(client, user, scenario, generator)
+                except (OSError, IndexError, ValueError):
+                    response = LoadResponse(status=0)
+                latencies.setdefault(scenario.url_name, []).append(time.perf_counter() - started)
+                if response.status != scenario.expected_status:
+                    errors[scenario.url_name] = errors.get(scenario.url_name, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(user) for user in users))
+        return latencies, errors, time.perf_counter() - started
+
+    @staticmethod
+    async def _open_session(client: Client, user: VirtualUser, login_path: str) -> None:
+        """Get a CSRF token from the login form, and log in if the user is a logged-in one."""
+        user.cookies.update((await client.request('GET', login_path, {})).cookies)
+        if user.logged_in:
+            headers, body = user.login_form()
+            response = await client.request('POST', login_path, {**user.headers(), **headers}, body)
+            if response.status != 302:
+                raise CommandError(f'La connexion de {user.credentials[0]} a échoué (statut {response.status}).')
+            user.cookies.update(response.cookies)
+
+    async def _send(self, client: Client, user: VirtualUser, scenario: Scenario, generator: random.Random) -> LoadResponse:
+        if scenario.url_name == 'blog:detail':
+            path = reverse(scenario.url_name, kwargs={'slug': generator.choice(self.slugs)})
+        else:
+            path = reverse(scenario.url_name)
+        if scenario.method == 'POST':
+            # A fresh session that only shares the CSRF cookie, so the user keeps its own session.
+            headers, body = user.login_form()
+            cookies = {'csrftoken': user.cookies.get('csrftoken', '')}
+            return await client.request('POST', path, {**user.headers(cookies), **headers}, body)
+        return await client.request('GET', path, user.headers())
@@ -0,0 +1,21 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from blog.cache import page_cache_stats
+
+
+class Command(BaseCommand):
+    """Management command that prints the hit and miss counters of the blog page cache.
+
+    The misses are broken down into pages served stale, pages rendered by a concurrent
+    request (coalesced) and pages rendered by the request itself (recomputed).
+    """
+    help: str = 'Affiche les compteurs de succès et d\'échecs du cache des pages du blog.'
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        stats = page_cache_stats()
+        total = stats['hits'] + stats['misses']
+        ratio = stats['hits'] / total if total else 0.0
+        self.stdout.write(f"hits={stats['hits']} misses={stats['misses']} hit_ratio={ratio:.2%}")
+        self.stdout.write(f"stale={stats['stale']} coalesced={stats['coalesced']} recomputed={stats['recomputed']}")
@@ -0,0 +1,56 @@
+import pstats
+from typing import Any, TextIO, cast
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from website.profiling import get_profile_directory, list_profiles, load_profile
+
+SORT_KEYS: tuple[str, ...] = ('cumulative', 'tottime', 'ncalls')
+
+
+class Command(BaseCommand):
+    """Management command that lists the request profiles saved by `website.profiling`.
+
+    Without argument, the profiles are listed most recent first. With a profile
+    identifier, the hottest functions of the profile are printed, followed by the SQL
+    executed by the request, slowest query first.
+    """
+    help: str = 'Liste les profils de requêtes enregistrés, ou affiche les fonctions les plus coûteuses de l\'un d\'eux.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('profile_id', nargs='?', help='Identifiant du profil à afficher (en-tête X-Profile-Id).')
+        parser.add_argument('--limit', type=int, default=25, help='Nombre de fonctions et de requêtes SQL affichées.')
+        parser.add_argument('--sort', choices=SORT_KEYS, default='cumulative', help='Ordre des fonctions.')
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options['profile_id'] is None:
+            self._list()
+            return
+
+        try:
+            record = load_profile(options['profile_id'])
+        except OSError:
+            raise CommandError(f"Aucun profil « {options['profile_id']} » dans {get_profile_directory()}.")
+        limit: int = options['limit']
+        self.stdout.write(
+            f'{record.method} {record.path} ({record.view}) : statut {record.status}, '
+            f'{record.duration * 1000:.1f} ms, {record.query_count} requêtes SQL, le {record.created} ({record.trigger})'
+        )
+        stats = pstats.Stats(str(get_profile_directory() / f'{record.id}.prof'), stream=cast(TextIO, self.stdout))
+        stats.strip_dirs().sort_stats(options['sort']).print_stats(limit)
+
+        self.stdout.write(f'Requêtes SQL les plus lentes ({min(limit, len(record.queries))} sur {record.query_count}) :')
+        for sql, duration in sorted(record.queries, key=lambda query: query[1], reverse=True)[:limit]:
+            self.stdout.write(f'{duration * 1000:>9.2f} ms  {sql}')
+
+    def _list(self) -> None:
+        records = list_profiles()
+        if not records:
+            self.stdout.write(f'Aucun profil dans {get_profile_directory()}.')
+            return
+        self.stdout.write(f"{'identifiant':<25}{'date':<27}{'durée (ms)':>11}{'SQL':>6}{'statut':>7}  requête")
+        for record in records:
+            self.stdout.write(
+                f'{record.id:<25}{record.created:<27}{record.duration * 1000:>11.1f}{record.query_count:>6}'
+                f'{record.status:>7}  {record.method} {record.path} ({record.view}, {record.trigger})'
+            )
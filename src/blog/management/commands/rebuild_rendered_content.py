@@ -0,0 +1,63 @@
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Iterator
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.utils import timezone
+
+from blog.cache import invalidate_posts
+from blog.models import BlogPost
+from blog.rendering import render_chunk
+
+
+class Command(BaseCommand):
+    """Management command that re-renders `BlogPost.content_html` and `excerpt_html`.
+
+    Run it after a change to `blog.rendering`. Posts are streamed from the database in
+    chunks, rendered in a pool of worker processes, and written back with `bulk_update`
+    by the parent process, which remains the only database writer.
+    """
+    help: str = 'Recalcule le HTML pré-rendu (corps et extrait) de tous les articles.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--chunk-size', type=int, default=500, help="Nombre d'articles par lot.")
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help='Nombre de processus de rendu (1 pour rendre dans le processus courant).',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        chunk_size: int = options['chunk_size']
+        workers: int = options['workers']
+        rows = BlogPost.objects.order_by('pk').values_list('pk', 'content').iterator(chunk_size=chunk_size)
+        chunks: Iterator[list[tuple[int, str]]] = iter(lambda: list(islice(rows, chunk_size)), [])
+
+        updated = 0
+        if workers <= 1:
+            for chunk in chunks:
+                updated += self._write(render_chunk(chunk))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                pending: deque[Future] = deque()
+                for chunk in chunks:
+                    pending.append(executor.submit(render_chunk, chunk))
+                    # Bound the number of rendered chunks held in memory.
+                    if len(pending) >= workers * 2:
+                        updated += self._write(pending.popleft().result())
+                for future in pending:
+                    updated += self._write(future.result())
+        self.stdout.write(self.style.SUCCESS(f'{updated} articles recalculés.'))
+
+    @staticmethod
+    def _write(rendered: list[tuple[int, str, str]]) -> int:
+        # `last_updated` is bumped so that HTTP validators of the re-rendered pages change.
+        now = timezone.now()
+        posts = [
+            BlogPost(pk=pk, content_html=body, excerpt_html=excerpt, last_updated=now)
+            for pk, body, excerpt in rendered
+        ]
+        BlogPost.objects.bulk_update(posts, ['content_html', 'excerpt_html', 'last_updated'])
+        invalidate_posts(*BlogPost.objects.filter(pk__in=[post.pk for post in posts]).values_list('slug', flat=True))
+        return len(posts)
@@ -0,0 +1,34 @@
+from itertools import islice
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+
+from blog import search
+from blog.models import BlogPost
+
+
+class Command(BaseCommand):
+    """Management command that rebuilds the FTS5 full-text index of the blog posts.
+
+    The table is streamed with a server-side iterator and inserted in batches, so the
+    command runs in constant memory. The rebuild happens in a single transaction: searches
+    keep seeing the previous index until it commits.
+    """
+    help: str = "Reconstruit l'index de recherche plein texte des articles."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--batch-size', type=int, default=1000, help="Nombre d'articles indexés par lot.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        batch_size: int = options['batch_size']
+        rows = BlogPost.objects.order_by('pk').values_list('pk', *search.FTS_COLUMNS).iterator(chunk_size=batch_size)
+
+        indexed = 0
+        with transaction.atomic():
+            search.clear_index()
+            while batch := list(islice(rows, batch_size)):
+                search.index_rows(batch)
+                indexed += len(batch)
+        search.optimize_index()
+        self.stdout.write(self.style.SUCCESS(f'{indexed} articles indexés.'))
@@ -0,0 +1,105 @@
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Optional
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import transaction
+
+from blog import search
+from blog.cache import invalidate_authors
+from blog.models import Author, BlogPost
+from blog.seeding import SEED_SIZES, generate_posts, seed_author_names, seed_emails
+
+SEED_PASSWORD: str = 'seed-password'
+
+
+class Command(BaseCommand):
+    """Management command that fills the database with a synthetic dataset for benchmarks.
+
+    Authors and users are inserted first. Posts are generated, rendered columns included, in
+    chunks by a pool of worker processes, and written with `bulk_create` by the parent
+    process, which remains the only database writer. Numbering continues after the rows
+    already present, so the command can be run again to grow the dataset.
+
+    Every seeded user has the password `seed-password`, hashed once.
+    """
+    help: str = 'Génère un jeu de données synthétique (articles, auteurs et utilisateurs) pour les mesures de performance.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--size', choices=list(SEED_SIZES), default='10k', help="Nombre d'articles à générer.",
+        )
+        parser.add_argument('--posts', type=int, help="Nombre d'articles, à la place de --size.")
+        parser.add_argument('--authors', type=int, help="Nombre d'auteurs (par défaut, un pour dix articles).")
+        parser.add_argument('--users', type=int, help="Nombre d'utilisateurs (par défaut, un pour dix articles).")
+        parser.add_argument('--batch-size', type=int, default=2000, help='Nombre de lignes écrites par lot.')
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help='Nombre de processus de génération (1 pour générer dans le processus courant).',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        posts: int = options['posts'] if options['posts'] is not None else SEED_SIZES[options['size']]
+        authors: int = options['authors'] if options['authors'] is not None else max(posts // 10, 1)
+        users: int = options['users'] if options['users'] is not None else posts // 10
+        self.batch_size: int = options['batch_size']
+        if min(posts, authors, users) < 0 or self.batch_size < 1:
+            raise CommandError('Les nombres de lignes doivent être positifs.')
+
+        seeded_authors = self._seed_authors(authors)
+        self._seed_users(users)
+        self._seed_posts(posts, seeded_authors, options['workers'])
+        invalidate_authors()
+        self.stdout.write(self.style.SUCCESS(
+            f'{posts} articles, {authors} auteurs et {users} utilisateurs créés.'
+        ))
+
+    def _seed_authors(self, count: int) -> list[Author]:
+        start = Author.objects.count()
+        return Author.objects.bulk_create(
+            (Author(firstname=first, lastname=last) for first, last in seed_author_names(start, start + count)),
+            batch_size=self.batch_size,
+        )
+
+    def _seed_users(self, count: int) -> None:
+        user_model = get_user_model()
+        start = user_model.objects.count()
+        password = make_password(SEED_PASSWORD)
+        user_model.objects.bulk_create(
+            (user_model(email=email, password=password) for email in seed_emails(start, start + count)),
+            batch_size=self.batch_size,
+        )
+
+    def _seed_posts(self, count: int, authors: list[Author], workers: int) -> None:
+        start = BlogPost.objects.count()
+        chunks = [
+            (first, min(first + self.batch_size, start + count), len(authors))
+            for first in range(start, start + count, self.batch_size)
+        ]
+        if workers <= 1:
+            for chunk in chunks:
+                self._write_posts(generate_posts(*chunk), authors)
+            return
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending: deque[Future] = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(generate_posts, *chunk))
+                # Bound the number of generated chunks held in memory.
+                if len(pending) >= workers * 2:
+                    self._write_posts(pending.popleft().result(), authors)
+            for future in pending:
+                self._write_posts(future.result(), authors)
+
+    @staticmethod
+    def _write_posts(rows: list[dict], authors: list[Author]) -> None:
+        posts = []
+        for row in rows:
+            number: Optional[int] = row.pop('author')
+            author = authors[number] if number is not None else None
+            posts.append(BlogPost(**row, author=author, author_name=str(author) if author else ''))
+        with transaction.atomic():
+            BlogPost.objects.bulk_create(posts)
+            search.index_rows((post.pk, *(getattr(post, column) for column in search.FTS_COLUMNS)) for post in posts)
@@ -0,0 +1,105 @@
+import os
+import struct
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.sqlite3.base import DatabaseWrapper as SQLiteDatabaseWrapper
+
+# Pragmas reported with their current value on the connection.
+REPORTED_PRAGMAS: tuple[str, ...] = ('journal_mode', 'synchronous', 'mmap_size', 'cache_size', 'busy_timeout', 'page_size')
+
+# Layout of the wal-index (the `-shm` file, see SQLite's wal.c), in native byte order: two
+# copies of a 48-byte header whose `mxFrame` is at offset 16, then the checkpoint info,
+# whose first field is `nBackfill`.
+WAL_INDEX_HEADER_SIZE: int = 48
+WAL_INDEX_MAX_FRAME_OFFSET: int = 16
+WAL_INDEX_BACKFILL_OFFSET: int = 2 * WAL_INDEX_HEADER_SIZE
+# A header whose two copies differ is being written; it is read again this many times.
+WAL_INDEX_READ_ATTEMPTS: int = 100
+
+
+def read_wal_index(path: str) -> tuple[int, int]:
+    """Return the number of frames in the WAL and the number already copied back to the database.
+
+    The wal-index is read as a plain file, so the probe neither writes to the database nor
+    takes any of its locks.
+
+    Args:
+        path (str): The path of the database file.
+
+    Raises:
+        CommandError: If the header is still being written after `WAL_INDEX_READ_ATTEMPTS` reads.
+
+    Returns:
+        tuple[int, int]: The `mxFrame` and `nBackfill` counters; (0, 0) without a wal-index.
+    """
+    for _ in range(WAL_INDEX_READ_ATTEMPTS):
+        try:
+            with open(f'{path}-shm', 'rb') as wal_index:
+                data = wal_index.read(WAL_INDEX_BACKFILL_OFFSET + 4)
+        except FileNotFoundError:
+            return 0, 0
+        if len(data) < WAL_INDEX_BACKFILL_OFFSET + 4:
+            return 0, 0
+        if data[:WAL_INDEX_HEADER_SIZE] == data[WAL_INDEX_HEADER_SIZE:WAL_INDEX_BACKFILL_OFFSET]:
+            (frames,) = struct.unpack_from('=I', data, WAL_INDEX_MAX_FRAME_OFFSET)
+            (backfilled,) = struct.unpack_from('=I', data, WAL_INDEX_BACKFILL_OFFSET)
+            return frames, backfilled
+    raise CommandError(f"L'index WAL de {path} est en cours d'écriture, réessayez.")
+
+
+class Command(BaseCommand):
+    """Management command that reports the WAL state of a SQLite database.
+
+    The probe is read-only: the number of WAL frames and the checkpoint lag, the frames not
+    yet copied back to the database file, are read from the wal-index. With `--checkpoint`,
+    a PASSIVE checkpoint then copies the frames that no reader still needs, without waiting
+    for any lock, and its result is reported.
+    """
+    help: str = "Affiche l'état de la base SQLite : pragmas, taille du fichier WAL et retard de checkpoint."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help='Alias de la base à inspecter.')
+        parser.add_argument(
+            '--max-wal-mb', type=float,
+            help='Échoue si le fichier WAL dépasse cette taille, en Mio (pour une sonde de supervision).',
+        )
+        parser.add_argument(
+            '--checkpoint', action='store_true',
+            help='Lance ensuite un checkpoint PASSIVE, qui écrit dans la base, et affiche son résultat.',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        connection = connections[options['database']]
+        if not isinstance(connection, SQLiteDatabaseWrapper):
+            raise CommandError(f"La base « {options['database']} » n'est pas une base SQLite.")
+
+        values: dict[str, Any] = {}
+        with connection.cursor() as cursor:
+            for pragma in REPORTED_PRAGMAS:
+                cursor.execute(f'PRAGMA {pragma}')
+                values[pragma] = cursor.fetchone()[0]
+                self.stdout.write(f'{pragma}={values[pragma]}')
+
+        path = connection.settings_dict['NAME']
+        in_wal_mode = values['journal_mode'] == 'wal' and not connection.is_in_memory_db()
+        frames, backfilled = read_wal_index(path) if in_wal_mode else (0, 0)
+        self.stdout.write(f'wal_frames={frames} checkpoint_lag={max(frames - backfilled, 0)}')
+        wal_path = f'{path}-wal'
+        wal_size = os.path.getsize(wal_path) if in_wal_mode and os.path.exists(wal_path) else 0
+        self.stdout.write(f'wal_size={wal_size} ({wal_size / 1024 / 1024:.1f} Mio)')
+
+        if options['checkpoint']:
+            with connection.cursor() as cursor:
+                cursor.execute('PRAGMA wal_checkpoint(PASSIVE)')
+                busy, frames, checkpointed = cursor.fetchone()
+            # Both counts are -1 when the database is not in WAL mode.
+            self.stdout.write(
+                f'checkpoint: wal_frames={max(frames, 0)} checkpointed={max(checkpointed, 0)} busy={busy}'
+            )
+
+        max_wal_mb = options['max_wal_mb']
+        if max_wal_mb is not None and wal_size > max_wal_mb * 1024 * 1024:
+            raise CommandError(f'Le fichier WAL dépasse {max_wal_mb} Mio ({wal_size} octets).')
+        self.stdout.write(self.style.SUCCESS('OK'))
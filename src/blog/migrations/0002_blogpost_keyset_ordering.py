@@ -0,0 +1,17 @@
+# Generated by Django 5.1 on 2026-10-16 22:57
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='blogpost',
+            options={'ordering': ['-created_on', '-id'], 'verbose_name': 'Article'},
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1 on 2026-10-16 22:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0002_blogpost_keyset_ordering'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='author_name',
+            field=models.CharField(blank=True, editable=False, max_length=301),
+        ),
+    ]
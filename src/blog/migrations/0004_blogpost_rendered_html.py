@@ -0,0 +1,55 @@
+# Generated by Django 5.1 on 2026-10-16 23:00
+
+from django.db import migrations, models
+from django.utils.html import linebreaks
+from django.utils.text import Truncator
+
+# A copy of `blog.rendering` as of this migration, so that later changes to the rendering
+# do not change what the migration writes.
+EXCERPT_WORDS = 80
+CHUNK_SIZE = 500
+
+
+def render_content(content):
+    return linebreaks(content, autoescape=False)
+
+
+def render_excerpt(content):
+    return Truncator(content).words(EXCERPT_WORDS, truncate=' …')
+
+
+def render_existing_posts(apps, schema_editor):
+    BlogPost = apps.get_model('blog', 'BlogPost')
+    posts = BlogPost.objects.using(schema_editor.connection.alias)
+    # One chunk of rows in memory at a time, read in primary key order.
+    last_pk = 0
+    while rows := list(posts.filter(pk__gt=last_pk).order_by('pk').values_list('pk', 'content')[:CHUNK_SIZE]):
+        posts.bulk_update(
+            [
+                BlogPost(pk=pk, content_html=render_content(content), excerpt_html=render_excerpt(content))
+                for pk, content in rows
+            ],
+            ['content_html', 'excerpt_html'],
+        )
+        last_pk = rows[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0003_blogpost_author_name'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='content_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='excerpt_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.RunPython(render_existing_posts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+from itertools import islice
+
+from django.db import migrations
+
+from blog import search
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    search.create_index(connection)
+    BlogPost = apps.get_model('blog', 'BlogPost')
+    rows = BlogPost.objects.using(connection.alias).values_list('pk', *search.FTS_COLUMNS).iterator(chunk_size=500)
+    while batch := list(islice(rows, 500)):
+        search.index_rows(batch, using=connection.alias)
+
+
+def drop_search_index(apps, schema_editor):
+    search.drop_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_blogpost_rendered_html'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
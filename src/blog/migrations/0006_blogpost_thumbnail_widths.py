@@ -0,0 +1,18 @@
+# Generated by Django 5.1 on 2026-10-16 23:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_blogpost_fts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='thumbnail_widths',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+    ]
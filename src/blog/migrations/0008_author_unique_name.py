@@ -0,0 +1,39 @@
+# Generated by Django 5.1 on 2026-10-16 23:10
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def merge_duplicate_authors(apps, schema_editor):
+    """Move the posts of duplicate authors to the oldest one, then delete the duplicates."""
+    Author = apps.get_model('blog', 'Author')
+    BlogPost = apps.get_model('blog', 'BlogPost')
+    authors = Author.objects.using(schema_editor.connection.alias)
+    duplicates = authors.values('firstname', 'lastname').annotate(kept=Min('pk'), count=Count('pk')).filter(count__gt=1)
+    for duplicate in duplicates:
+        others = authors.filter(firstname=duplicate['firstname'], lastname=duplicate['lastname']).exclude(
+            pk=duplicate['kept'],
+        )
+        BlogPost.objects.using(schema_editor.connection.alias).filter(author__in=others).update(
+            author_id=duplicate['kept'],
+        )
+        others.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0007_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_authors, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='author',
+            name='blog_author_name_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='author',
+            constraint=models.UniqueConstraint(fields=('firstname', 'lastname'), name='blog_author_unique_name'),
+        ),
+    ]
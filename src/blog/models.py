@@ -1,8 +1,106 @@
-from typing import Any
+from itertools import islice
+from typing import Any, Collection, Iterable, Optional, Sequence
 from django.core.exceptions import ValidationError
 from django.template.defaultfilters import slugify
-from django.db import models
+from django.db import IntegrityError, models, router, transaction
 from django.urls import reverse
+from django.utils import timezone
+
+from .rendering import render_content, render_excerpt
+
+
+AuthorName = tuple[str, str]
+
+
+class AuthorManager(models.Manager['Author']):
+    """Manager of `Author` adding a bulk variant of `get_or_create`.
+
+    Methods:
+        bulk_get_or_create_authors(names: Iterable[AuthorName]) -> tuple[dict[AuthorName, Author], list[Author]]:
+            Resolves many (firstname, lastname) pairs, creating the missing authors.
+        load_for_posts(posts: Iterable[BlogPost]) -> None:
+            Loads with one query the authors that `author_or_default` needs.
+    """
+    read_batch_size: int = 4000
+
+    def bulk_get_or_create_authors(self, names: Iterable[AuthorName]) -> tuple[dict[AuthorName, 'Author'], list['Author']]:
+        """Returns the authors named by `names`, creating the missing ones.
+
+        The existing authors are read with one query per `read_batch_size` names and the
+        missing ones are inserted with a single `bulk_create`. If a concurrent request
+        inserts one of them first, the authors it created are read back and the insert
+        is retried once with the remaining names.
+
+        Args:
+            names (Iterable[AuthorName]): The (firstname, lastname) pairs to resolve.
+
+        Returns:
+            tuple[dict[AuthorName, Author], list[Author]]: The authors by name, and the
+                authors created by this call.
+        """
+        wanted = set(names)
+        authors = self._read_authors(wanted)
+        try:
+            with transaction.atomic(using=self.db):
+                created = self._create_authors(wanted - authors.keys())
+        except IntegrityError:
+            authors.update(self._read_authors(wanted - authors.keys()))
+            with transaction.atomic(using=self.db):
+                created = self._create_authors(wanted - authors.keys())
+        authors.update({(author.firstname, author.lastname): author for author in created})
+        return authors, created
+
+    def load_for_posts(self, posts: Iterable['BlogPost']) -> None:
+        """Loads with one query the authors of the posts whose `author_name` was not backfilled.
+
+        Without it, `author_or_default` loads the author of each such post separately when a
+        listing is rendered.
+
+        Args:
+            posts (Iterable[BlogPost]): The posts about to be displayed.
+        """
+        posts = _posts_without_author_name(posts)
+        if posts:
+            _set_authors(posts, self.in_bulk({post.author_id for post in posts}))
+
+    async def aload_for_posts(self, posts: Iterable['BlogPost']) -> None:
+        """Async variant of `load_for_posts`."""
+        posts = _posts_without_author_name(posts)
+        if posts:
+            _set_authors(posts, await self.ain_bulk({post.author_id for post in posts}))
+
+    def _create_authors(self, names: set[AuthorName]) -> list['Author']:
+        if not names:
+            return []
+        return self.bulk_create(self.model(firstname=first, lastname=last) for first, last in sorted(names))
+
+    def _read_authors(self, names: set[AuthorName]) -> dict[AuthorName, 'Author']:
+        authors: dict[AuthorName, Author] = {}
+        pending = iter(sorted(names))
+        while batch := list(islice(pending, self.read_batch_size)):
+            # Both IN lists are served by the (firstname, lastname) unique index; the
+            # cross-matches they let through are dropped here.
+            candidates = self.filter(
+                firstname__in={first for first, _ in batch}, lastname__in={last for _, last in batch},
+            )
+            authors.update({
+                (author.firstname, author.lastname): author
+                for author in candidates if (author.firstname, author.lastname) in names
+            })
+        return authors
+
+
+def _posts_without_author_name(posts: Iterable['BlogPost']) -> list['BlogPost']:
+    return [
+        post for post in posts
+        if post.author_id is not None and not post.author_name and not BlogPost.author.is_cached(post)
+    ]
+
+
+def _set_authors(posts: list['BlogPost'], authors: dict[Optional[int], 'Author']) -> None:
+    for post in posts:
+        # An author deleted in the meantime leaves the post without author, as `SET_NULL` will.
+        post.author = authors.get(post.author_id)
 
 
 class Author(models.Model):
@@ -11,30 +109,81 @@ class Author(models.Model):
     firstname = models.CharField(max_length=150)
     lastname = models.CharField(max_length=150)
 
-    def clean(self) -> None:
+    objects: AuthorManager = AuthorManager()
+
+    class Meta:
+        constraints = [
+            # Enforces the uniqueness of names without a query before each insert; its index
+            # also serves the ordering of `AuthorListView`.
+            models.UniqueConstraint(fields=['firstname', 'lastname'], name='blog_author_unique_name'),
+        ]
+
+    def unique_error_message(self, model_class: type['Author'], unique_check: Sequence[str]) -> ValidationError:
         """
-        Validates that an Author with the same first and last name does not already exist.
+        Overrides the uniqueness error message of the (firstname, lastname) constraint.
 
-        Raises:
-            ValidationError: If an Author with the same firstname and lastname is found in the database.
+        This message is reported by form validation and by `save` when the insert violates the constraint.
         """
-        if Author.objects.filter(firstname=self.firstname, lastname=self.lastname).exists():
-            raise ValidationError(
-                f'Un auteur avec le prénom "{self.firstname}" et le nom "{self.lastname}" existe déjà.'
+        if tuple(unique_check) == ('firstname', 'lastname'):
+            return ValidationError(
+                f'Un auteur avec le prénom "{self.firstname}" et le nom "{self.lastname}" existe déjà.',
+                code='unique_together',
             )
+        return super().unique_error_message(model_class, unique_check)
 
     def __str__(self) -> str:
         return f'{self.firstname} {self.lastname}'
 
     def save(self, *args: Any, **kwargs: Any) -> None:
         """
-        Overrides the save method to perform validation before saving.
+        Overrides the save method to report duplicate authors as a validation error.
 
-        Calls the `clean` method to ensure that the Author is unique.
-        Then, calls the superclass's save method to store the object.
+        The uniqueness of the name is enforced by the database constraint, so no query is
+        issued before the insert and concurrent requests cannot both create the same author.
+        Then, when an existing author is saved, propagates its display name to its blog posts.
+
+        Raises:
+            ValidationError: If an Author with the same firstname and lastname already exists.
         """
-        self.clean()
-        super().save(*args, **kwargs)
+        is_update = not self._state.adding
+        using = kwargs.get('using') or router.db_for_write(Author, instance=self)
+        try:
+            with transaction.atomic(using=using):
+                super().save(*args, **kwargs)
+        except IntegrityError as exc:
+            raise self.unique_error_message(Author, ('firstname', 'lastname')) from exc
+        if is_update:
+            self.propagate_display_name()
+
+    def delete(self, *args: Any, **kwargs: Any) -> tuple[int, dict[str, int]]:
+        """
+        Overrides the delete method to clear the denormalized name of the author's blog posts.
+
+        The foreign key itself is cleared by `on_delete=models.SET_NULL`.
+        """
+        BlogPost.objects.filter(author=self).update(author_name='')
+        return super().delete(*args, **kwargs)
+
+    def propagate_display_name(self, batch_size: int = 1000) -> int:
+        """
+        Copies the author's display name to the `author_name` of their blog posts.
+
+        Stale posts are updated in batches of `batch_size` rows so that renaming a prolific
+        author never holds the write lock for a single large transaction. Their `last_updated`
+        is bumped since their rendered pages change.
+
+        Args:
+            batch_size (int): The maximum number of posts updated per query.
+
+        Returns:
+            int: The number of blog posts updated.
+        """
+        name = str(self)
+        stale = BlogPost.objects.filter(author=self).exclude(author_name=name)
+        updated = 0
+        while ids := list(stale.values_list('pk', flat=True)[:batch_size]):
+            updated += BlogPost.objects.filter(pk__in=ids).update(author_name=name, last_updated=timezone.now())
+        return updated
 
 
 class BlogPost(models.Model):
@@ -45,34 +194,86 @@ class BlogPost(models.Model):
     title = models.CharField(max_length=255, unique=True, verbose_name='Titre')
     slug = models.SlugField(max_length=255, unique=True, blank=True)
     author = models.ForeignKey(Author, on_delete=models.SET_NULL, blank=True, null=True)
+    author_name = models.CharField(max_length=301, blank=True, editable=False)
     last_updated: models.DateTimeField = models.DateTimeField(auto_now=True)
     created_on: models.DateField = models.DateField(blank=True, null=True)
     published: models.BooleanField = models.BooleanField(default=False, verbose_name='Publié')
     content = models.TextField(blank=True, verbose_name='Contenu')
+    content_html = models.TextField(blank=True, editable=False)
+    excerpt_html = models.TextField(blank=True, editable=False)
     thumbnail = models.ImageField(blank=True, upload_to='mediablog')
+    thumbnail_widths = models.JSONField(default=list, blank=True, editable=False)
 
     class Meta:
-        ordering = ['-created_on']
+        ordering = ['-created_on', '-id']
         verbose_name = 'Article'
+        indexes = [
+            # `BlogHome` for anonymous users: published posts in `ordering` order. The index is
+            # partial because SQLite compiles `published=True` to a bare `WHERE published`,
+            # which can match an index condition but not an equality on an index column.
+            models.Index(
+                fields=['-created_on', '-id'], condition=models.Q(published=True), name='blog_post_published_idx',
+            ),
+            # `BlogHome` for authenticated users: every post in `ordering` order.
+            models.Index(fields=['-created_on', '-id'], name='blog_post_created_idx'),
+            # HTTP validators of `BlogHome`: latest `last_updated` of the visible posts.
+            models.Index(
+                fields=['last_updated'], condition=models.Q(published=True), name='blog_post_pub_updated_idx',
+            ),
+            models.Index(fields=['last_updated'], name='blog_post_updated_idx'),
+        ]
+
+    loaded_slug: Optional[str] = None
+    loaded_thumbnail: Optional[str] = None
 
     def __str__(self) -> str:
         return self.title
 
+    @classmethod
+    def from_db(cls, db: Optional[str], field_names: Collection[str], values: Collection[Any]) -> 'BlogPost':
+        """
+        Overrides the loading of instances to remember the slug read from the database.
+
+        `loaded_slug` lets the page cache invalidate the previous URL of a post whose slug is changed,
+        and `loaded_thumbnail` lets `save` detect a new thumbnail.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance.loaded_slug = instance.__dict__.get('slug')
+        instance.loaded_thumbnail = instance.__dict__.get('thumbnail')
+        return instance
+
     def save(self, *args, **kwargs) -> None:
         """
         Overrides the save method to automatically generate a slug from the title if not provided.
 
         If the `slug` field is empty, it will be generated using the `slugify` function based on the title.
-        Then, calls the superclass's save method to store the object.
+        The author's display name is copied to `author_name` so that listings do not need to join
+        or query the `Author` table, and the body and excerpt HTML are rendered once here instead
+        of on every page view. Then, calls the superclass's save method to store the object.
+        The resized variants of a new thumbnail are generated in the background (see `blog.signals`).
         """
         if not self.slug:
             self.slug = slugify(self.title)
+        self.author_name = str(self.author) if self.author_id is not None else ''
+        self.content_html = render_content(self.content)
+        self.excerpt_html = render_excerpt(self.content)
+        if self.loaded_thumbnail is not None and self.thumbnail.name != self.loaded_thumbnail:
+            # The resized variants of the previous image no longer apply.
+            self.thumbnail_widths = []
 
         super().save(*args, **kwargs)
 
     @property
     def author_or_default(self) -> str:
-        return f'{self.author.firstname} {self.author.lastname}' if self.author else 'auteur inconnu'
+        """
+        Returns the author's display name, or 'auteur inconnu' if the post has no author.
+
+        The denormalized `author_name` is used when available; the author is only loaded
+        for posts that have not been saved or backfilled yet.
+        """
+        if self.author_id is None:
+            return 'auteur inconnu'
+        return self.author_name or str(self.author)
 
     def get_blog_detail_absolute_url_with_slug(self) -> str:
         return reverse('blog:detail', kwargs={'slug': self.slug})
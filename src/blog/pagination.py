@@ -0,0 +1,328 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Optional, Sequence
+
+from django.core.paginator import InvalidPage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Field, Model, Q, QuerySet
+from django.http import Http404, HttpResponse
+from django.utils.http import urlencode
+
+if TYPE_CHECKING:
+    from django.views.generic import ListView
+    _ListViewBase = ListView
+else:
+    _ListViewBase = object
+
+
+class InvalidCursor(InvalidPage):
+    """Raised when a pagination cursor cannot be decoded or does not match the ordering."""
+
+
+@dataclass(frozen=True)
+class OrderKey:
+    """One column of a keyset ordering.
+
+    Attributes:
+        name (str): The model field name.
+        descending (bool): Whether the column is traversed in descending order.
+        nullable (bool): Whether the column may contain NULL values.
+    """
+    name: str
+    descending: bool
+    nullable: bool
+
+    def order_by(self, backward: bool) -> str:
+        """Return the `order_by()` expression for this key in the given traversal direction."""
+        return f'-{self.name}' if self.descending != backward else self.name
+
+
+@dataclass
+class KeysetPage:
+    """A page of results produced by `KeysetPaginator`.
+
+    It exposes the subset of the `django.core.paginator.Page` API used by templates
+    (`has_next`, `has_previous`, `has_other_pages`) plus the opaque cursors that
+    address the neighbouring pages.
+
+    Attributes:
+        object_list (list[Model]): The objects of the page, in display order.
+        next_cursor (Optional[str]): The cursor of the following page, if any.
+        previous_cursor (Optional[str]): The cursor of the preceding page, if any.
+    """
+    object_list: list[Model]
+    next_cursor: Optional[str]
+    previous_cursor: Optional[str]
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    def has_other_pages(self) -> bool:
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """Cursor-based paginator that seeks on an ordering instead of using OFFSET.
+
+    Each page is fetched with a `WHERE (keys) > (cursor) ORDER BY keys LIMIT per_page + 1`
+    query, so serving a deep page costs the same as serving the first one as long as an
+    index covers the ordering. The primary key is appended to the ordering when missing
+    so that every row has a unique position.
+
+    The leading column may be nullable: NULL values are placed after every other value
+    and are served from a separate `IS NULL` segment, which keeps both segments sargable.
+
+    Attributes:
+        queryset (QuerySet): The queryset to paginate.
+        per_page (int): The number of objects per page.
+        keys (list[OrderKey]): The resolved ordering columns.
+    """
+
+    def __init__(self, queryset: QuerySet, per_page: int, ordering: Sequence[str]) -> None:
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        opts = queryset.model._meta
+        names: list[str] = list(ordering)
+        if not any(name.lstrip('-') in ('pk', opts.pk.name) for name in names):
+            names.append(f'-{opts.pk.name}' if names and names[-1].startswith('-') else opts.pk.name)
+        self.keys: list[OrderKey] = []
+        self._fields: list[Field] = []
+        for position, name in enumerate(names):
+            field = opts.pk if name.lstrip('-') == 'pk' else opts.get_field(name.lstrip('-'))
+            self.keys.append(OrderKey(field.attname, name.startswith('-'), position == 0 and field.null))
+            self._fields.append(field)
+
+    def encode_cursor(self, obj: Model, backward: bool) -> str:
+        """Encode the position of `obj` into an opaque, URL-safe cursor.
+
+        Args:
+            obj (Model): The row the next fetch starts after (or before, when `backward`).
+            backward (bool): Whether the cursor addresses the rows preceding `obj`.
+
+        Returns:
+            str: The encoded cursor.
+        """
+        payload = {'v': [getattr(obj, key.name) for key in self.keys], 'b': backward}
+        raw = json.dumps(payload, cls=DjangoJSONEncoder, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def decode_cursor(self, cursor: str) -> tuple[list[Any], bool]:
+        """Decode a cursor produced by `encode_cursor`.
+
+        Args:
+            cursor (str): The encoded cursor.
+
+        Raises:
+            InvalidCursor: If the cursor is malformed or does not match the ordering.
+
+        Returns:
+            tuple[list[Any], bool]: The position values and the traversal direction.
+        """
+        try:
+            raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            payload = json.loads(raw)
+            values = payload['v']
+            backward = bool(payload['b'])
+            if len(values) != len(self.keys):
+                raise ValueError('cursor length does not match the ordering')
+            position = [
+                None if value is None else field.to_python(value)
+                for field, value in zip(self._fields, values)
+            ]
+        except (binascii.Error, ValueError, TypeError, KeyError) as exc:
+            raise InvalidCursor('Curseur de pagination invalide.') from exc
+        if None in position[1:] or (position[0] is None and not self.keys[0].nullable):
+            raise InvalidCursor('Curseur de pagination invalide.')
+        return position, backward
+
+    def page(self, cursor: Optional[str] = None) -> KeysetPage:
+        """Return the page addressed by `cursor`, or the first page when it is empty.
+
+        Args:
+            cursor (Optional[str]): A cursor taken from a previous page.
+
+        Raises:
+            InvalidCursor: If the cursor cannot be decoded.
+
+        Returns:
+            KeysetPage: The requested page.
+        """
+        position, backward = self.decode_cursor(cursor) if cursor else (None, False)
+        rows: list[Model] = []
+        for segment in self._segments(position, backward):
+            rows.extend(segment[:self.per_page + 1 - len(rows)])
+            if len(rows) > self.per_page:
+                break
+        return self._make_page(rows, position, backward)
+
+    async def apage(self, cursor: Optional[str] = None) -> KeysetPage:
+        """Async version of `page`, reading the rows with the async ORM."""
+        position, backward = self.decode_cursor(cursor) if cursor else (None, False)
+        rows: list[Model] = []
+        for segment in self._segments(position, backward):
+            rows.extend([row async for row in segment[:self.per_page + 1 - len(rows)]])
+            if len(rows) > self.per_page:
+                break
+        return self._make_page(rows, position, backward)
+
+    def _make_page(self, rows: list[Model], position: Optional[list[Any]], backward: bool) -> KeysetPage:
+        """Build the page from the `per_page + 1` rows read after `position`."""
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if backward:
+            rows.reverse()
+
+        has_next, has_previous = (position is not None, has_more) if backward else (has_more, position is not None)
+        return KeysetPage(
+            object_list=rows,
+            next_cursor=self.encode_cursor(rows[-1], backward=False) if rows and has_next else None,
+            previous_cursor=self.encode_cursor(rows[0], backward=True) if rows and has_previous else None,
+        )
+
+    def _segments(self, position: Optional[list[Any]], backward: bool) -> list[QuerySet]:
+        """Return the querysets to read, in traversal order, to walk from `position`."""
+        lead, rest = self.keys[0], self.keys[1:]
+        if not lead.nullable:
+            queryset = self.queryset
+            if position is not None:
+                queryset = queryset.filter(_seek(self.keys, position, backward))
+            return [queryset.order_by(*(key.order_by(backward) for key in self.keys))]
+
+        if position is None:
+            # The first page is read in a single query; on SQLite, NULLS LAST is the
+            # natural order of a descending index scan.
+            nulls_last = F(lead.name).desc(nulls_last=True) if lead.descending else F(lead.name).asc(nulls_last=True)
+            return [self.queryset.order_by(nulls_last, *(key.order_by(backward) for key in rest))]
+
+        # NULLs sort after every value of the leading column: walk the non-NULL segment
+        # first when moving forward and the NULL segment first when moving backward.
+        values = self.queryset.filter(**{f'{lead.name}__isnull': False})
+        nulls = self.queryset.filter(**{f'{lead.name}__isnull': True})
+        if position[0] is None:
+            nulls = nulls.filter(_seek(rest, position[1:], backward))
+            values = values if backward else values.none()
+        else:
+            values = values.filter(_seek(self.keys, position, backward))
+            nulls = nulls.none() if backward else nulls
+        values = values.order_by(*(key.order_by(backward) for key in self.keys))
+        nulls = nulls.order_by(*(key.order_by(backward) for key in rest))
+        return [nulls, values] if backward else [values, nulls]
+
+
+def _seek(keys: Sequence[OrderKey], values: Sequence[Any], backward: bool) -> Q:
+    """Build the predicate selecting rows strictly after `values` in the traversal order.
+
+    The predicate is nested as `k1 >= v1 AND (k1 > v1 OR (k2 >= v2 AND ...))` so that the
+    leading comparison can be used as an index range.
+    """
+    key, *rest = keys
+    lookup = 'lt' if key.descending != backward else 'gt'
+    strictly_after = Q(**{f'{key.name}__{lookup}': values[0]})
+    if not rest:
+        return strictly_after
+    return Q(**{f'{key.name}__{lookup}e': values[0]}) & (strictly_after | _seek(rest, values[1:], backward))
+
+
+class KeysetPaginationMixin(_ListViewBase):
+    """Mixin for `ListView` subclasses that replaces OFFSET pagination with `KeysetPaginator`.
+
+    The cursor is read from the `cursor` query parameter. The URLs of the neighbouring
+    pages are exposed in the context as `next_page_url` / `previous_page_url` and in the
+    `Link` response header.
+
+    Attributes:
+        keyset_ordering (tuple[str, ...]): The ordering to seek on; defaults to the model's
+            `Meta.ordering`.
+        cursor_kwarg (str): The name of the query parameter carrying the cursor.
+        paginated (Optional[tuple]): The result of `apaginate_queryset`, reused by
+            `paginate_queryset`.
+    """
+    keyset_ordering: tuple[str, ...] = ()
+    cursor_kwarg: str = 'cursor'
+    paginated: Optional[tuple[KeysetPaginator, KeysetPage, list, bool]] = None
+
+    def get_keyset_ordering(self) -> Sequence[str]:
+        if self.keyset_ordering or self.model is None:
+            return self.keyset_ordering
+        return self.model._meta.ordering
+
+    # `KeysetPaginator` and `KeysetPage` stand in for `Paginator` and `Page` without subclassing
+    # them, as they have no page numbers; these overrides cannot match the `ListView` signatures.
+    def get_paginator(  # type: ignore[override]
+        self, queryset: QuerySet, per_page: int, orphans: int = 0, allow_empty_first_page: bool = True, **kwargs: Any,
+    ) -> KeysetPaginator:
+        return KeysetPaginator(queryset, per_page, self.get_keyset_ordering())
+
+    def paginate_queryset(  # type: ignore[override]
+        self, queryset: QuerySet, page_size: int,
+    ) -> tuple[KeysetPaginator, KeysetPage, list, bool]:
+        """Paginate the queryset with the cursor found in the request.
+
+        The result of a previous `apaginate_queryset` call is returned without querying again.
+
+        Raises:
+            Http404: If the cursor is invalid, like `ListView` does for an invalid page number.
+        """
+        if self.paginated is not None:
+            return self.paginated
+        paginator = self.get_paginator(queryset, page_size)
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidCursor as exc:
+            raise Http404(str(exc)) from exc
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    async def apaginate_queryset(
+        self, queryset: QuerySet, page_size: int,
+    ) -> tuple[KeysetPaginator, KeysetPage, list, bool]:
+        """Async version of `paginate_queryset`, for async views.
+
+        The result is kept so that `get_context_data` can then be called without a query.
+
+        Raises:
+            Http404: If the cursor is invalid.
+        """
+        paginator = self.get_paginator(queryset, page_size)
+        try:
+            page = await paginator.apage(self.request.GET.get(self.cursor_kwarg))
+        except InvalidCursor as exc:
+            raise Http404(str(exc)) from exc
+        self.paginated = (paginator, page, page.object_list, page.has_other_pages())
+        return self.paginated
+
+    def get_page_url(self, cursor: Optional[str]) -> Optional[str]:
+        """Return the absolute URL of the current view with `cursor` as the page cursor."""
+        if cursor is None:
+            return None
+        params = self.request.GET.copy()
+        params[self.cursor_kwarg] = cursor
+        return self.request.build_absolute_uri(f'{self.request.path}?{urlencode(params, doseq=True)}')
+
+    def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
+        context = super().get_context_data(**kwargs)
+        page = context.get('page_obj')
+        context['next_page_url'] = self.get_page_url(page.next_cursor) if page else None
+        context['previous_page_url'] = self.get_page_url(page.previous_cursor) if page else None
+        return context
+
+    def render_to_response(self, context: dict[str, Any], **response_kwargs: Any) -> HttpResponse:
+        response = super().render_to_response(context, **response_kwargs)
+        links = [
+            f'<{url}>; rel="{rel}"'
+            for rel, url in (('prev', context.get('previous_page_url')), ('next', context.get('next_page_url')))
+            if url
+        ]
+        if links:
+            response.headers['Link'] = ', '.join(links)
+        return response
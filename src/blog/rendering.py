@@ -0,0 +1,44 @@
+from typing import Iterable
+
+from django.utils.html import linebreaks
+from django.utils.text import Truncator
+
+EXCERPT_WORDS: int = 80
+
+
+def render_content(content: str) -> str:
+    """Render the body of a post as HTML, like the `linebreaks` filter does on trusted content.
+
+    Args:
+        content (str): The raw content of the post.
+
+    Returns:
+        str: The content with line breaks converted to `<p>` and `<br>` tags.
+    """
+    return linebreaks(content, autoescape=False)
+
+
+def render_excerpt(content: str) -> str:
+    """Render the excerpt shown in post listings, like the `truncatewords:80` filter does.
+
+    Args:
+        content (str): The raw content of the post.
+
+    Returns:
+        str: The first `EXCERPT_WORDS` words of the content.
+    """
+    return Truncator(content).words(EXCERPT_WORDS, truncate=' …')
+
+
+def render_chunk(rows: Iterable[tuple[int, str]]) -> list[tuple[int, str, str]]:
+    """Render the body and excerpt of a chunk of posts.
+
+    This function only depends on its arguments so that it can run in a worker process.
+
+    Args:
+        rows (Iterable[tuple[int, str]]): The primary key and raw content of each post.
+
+    Returns:
+        list[tuple[int, str, str]]: The primary key, body HTML and excerpt HTML of each post.
+    """
+    return [(pk, render_content(content), render_excerpt(content)) for pk, content in rows]
@@ -0,0 +1,130 @@
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Model
+from django.http import HttpRequest, HttpResponse
+
+from .cache import last_invalidation
+
+PIN_COOKIE: str = 'pin_primary'
+
+
+@dataclass
+class RoutingState:
+    """How the queries of the current request are routed.
+
+    Attributes:
+        replica (bool): Whether the view reads from the replica (see `replica_reads`).
+        pinned (bool): Whether the user wrote recently and must read from the primary.
+        wrote (bool): Whether the request has written to the database.
+        invalidated (Optional[bool]): Whether the blog was changed less than `REPLICA_PIN_SECONDS`
+            ago, checked on the first read routed to the replica.
+    """
+    replica: bool = False
+    pinned: bool = False
+    wrote: bool = False
+    invalidated: Optional[bool] = None
+
+
+_state: ContextVar[Optional[RoutingState]] = ContextVar('blog_routing_state', default=None)
+
+
+def get_replica_alias() -> Optional[str]:
+    """Return the alias of the replica (`REPLICA_DATABASE_ALIAS`), or None if it is not configured."""
+    alias: str = getattr(settings, 'REPLICA_DATABASE_ALIAS', 'replica')
+    return alias if alias in connections.settings else None
+
+
+class PrimaryReplicaRouter:
+    """Database router that sends the reads of the opted-in views to the replica.
+
+    Only the views whose class sets `replica_reads = True` read from the replica, and only
+    for the models of `route_app_labels`: sessions and users always come from the primary.
+    Every write goes to the primary. After a write to these models, the request and the
+    requests of the same user during `REPLICA_PIN_SECONDS` read from the primary too (see
+    `ReplicaRoutingMiddleware`), and so do the requests of every user during the same time
+    after the cached pages were invalidated: a page rendered from a lagging replica would
+    otherwise be cached under the new versions and served until it expires.
+
+    Attributes:
+        route_app_labels (set[str]): The applications whose models can be read from the replica.
+    """
+    route_app_labels: set[str] = {'blog'}
+
+    def db_for_read(self, model: type[Model], **hints: Any) -> Optional[str]:
+        state = _state.get()
+        if state is None or not state.replica or state.pinned or state.wrote:
+            return None
+        if model._meta.app_label not in self.route_app_labels:
+            return None
+        if state.invalidated is None:
+            state.invalidated = time.time() - last_invalidation() < getattr(settings, 'REPLICA_PIN_SECONDS', 5)
+        return None if state.invalidated else get_replica_alias()
+
+    def db_for_write(self, model: type[Model], **hints: Any) -> str:
+        state = _state.get()
+        if state is not None and model._meta.app_label in self.route_app_labels:
+            state.wrote = True
+        # Never fall back to the database an instance was read from, which may be the replica.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1: Model, obj2: Model, **hints: Any) -> Optional[bool]:
+        # The replica holds the same rows as the primary.
+        aliases = {DEFAULT_DB_ALIAS, get_replica_alias()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """Middleware that scopes the routing state of `PrimaryReplicaRouter` to each request.
+
+    The resolved view decides whether the request reads from the replica. When a request
+    writes, the response sets the `pin_primary` cookie for `REPLICA_PIN_SECONDS` seconds, so
+    that the user reads their own changes from the primary while the replica catches up.
+    """
+    sync_capable: bool = True
+    async_capable: bool = True
+
+    def __init__(self, get_response: Callable) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = RoutingState(pinned=PIN_COOKIE in request.COOKIES)
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        return self.process_response(state, response)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        state = RoutingState(pinned=PIN_COOKIE in request.COOKIES)
+        token = _state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _state.reset(token)
+        return self.process_response(state, response)
+
+    def process_view(self, request: HttpRequest, view_func: Callable, view_args: Any, view_kwargs: Any) -> None:
+        state = _state.get()
+        if state is not None and request.method in ('GET', 'HEAD'):
+            state.replica = getattr(getattr(view_func, 'view_class', None), 'replica_reads', False)
+
+    @staticmethod
+    def process_response(state: RoutingState, response: HttpResponse) -> HttpResponse:
+        if state.wrote:
+            response.set_cookie(
+                PIN_COOKIE, '1', max_age=getattr(settings, 'REPLICA_PIN_SECONDS', 5), httponly=True, samesite='Lax',
+            )
+        return response
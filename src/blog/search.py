@@ -0,0 +1,146 @@
+import re
+from typing import Any, Iterable, Optional, Sequence
+
+from django.db import connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+
+from .models import BlogPost
+
+FTS_TABLE: str = 'blog_blogpost_fts'
+FTS_COLUMNS: tuple[str, ...] = ('title', 'content', 'meta_description', 'meta_keywords')
+
+# BM25 weight of each column of `FTS_COLUMNS`: a match in the title ranks highest.
+FTS_WEIGHTS: tuple[float, ...] = (10.0, 1.0, 2.0, 5.0)
+
+_TOKEN_RE = re.compile(r'\w+')
+
+
+def is_supported(connection: BaseDatabaseWrapper) -> bool:
+    """Return whether the database of `connection` provides the FTS5 full-text index."""
+    return connection.vendor == 'sqlite'
+
+
+def create_index(connection: BaseDatabaseWrapper) -> None:
+    """Create the FTS5 virtual table that indexes the searchable columns of `BlogPost`.
+
+    The table keeps its own copy of the text and uses the post primary key as rowid.
+    Diacritics are folded so that 'eleve' matches 'élève'.
+    """
+    if not is_supported(connection):
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            f"{', '.join(FTS_COLUMNS)}, tokenize = 'unicode61 remove_diacritics 2')"
+        )
+
+
+def drop_index(connection: BaseDatabaseWrapper) -> None:
+    """Drop the FTS5 virtual table."""
+    if not is_supported(connection):
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+def index_rows(rows: Iterable[Sequence[Any]], using: str = 'default') -> None:
+    """Insert or replace the index entries of several posts.
+
+    Args:
+        rows (Iterable[Sequence[Any]]): The primary key followed by the values of `FTS_COLUMNS`
+            for each post.
+        using (str): The database alias.
+    """
+    connection = connections[using]
+    if not is_supported(connection):
+        return
+    rows = [tuple(row) for row in rows]
+    placeholders = ', '.join(['%s'] * (len(FTS_COLUMNS) + 1))
+    with connection.cursor() as cursor:
+        cursor.executemany(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [(row[0],) for row in rows])
+        cursor.executemany(
+            f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(FTS_COLUMNS)}) VALUES ({placeholders})",
+            rows,
+        )
+
+
+def index_post(post: Any, using: str = 'default') -> None:
+    """Insert or replace the index entry of a single post."""
+    index_rows([(post.pk, *(getattr(post, column) for column in FTS_COLUMNS))], using=using)
+
+
+def unindex_post(pk: int, using: str = 'default') -> None:
+    """Remove the index entry of the post with primary key `pk`."""
+    connection = connections[using]
+    if not is_supported(connection):
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [pk])
+
+
+def clear_index(using: str = 'default') -> None:
+    """Remove every entry of the index."""
+    connection = connections[using]
+    if not is_supported(connection):
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+
+
+def optimize_index(using: str = 'default') -> None:
+    """Merge the index b-trees, which speeds up queries after a bulk rebuild."""
+    connection = connections[using]
+    if not is_supported(connection):
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+
+
+def build_match_expression(text: str) -> Optional[str]:
+    """Turn user input into a safe FTS5 query.
+
+    Every word is quoted so that FTS5 operators typed by the user are matched literally,
+    and the last word is matched as a prefix.
+
+    Args:
+        text (str): The search terms typed by the user.
+
+    Returns:
+        Optional[str]: The MATCH expression, or None when the input contains no word.
+    """
+    tokens = _TOKEN_RE.findall(text)
+    if not tokens:
+        return None
+    return ' '.join(f'"{token}"' for token in tokens) + '*'
+
+
+def search_post_ids(
+    text: str, published_only: bool, limit: int, offset: int = 0, using: str = 'default',
+) -> list[int]:
+    """Return the primary keys of the posts matching `text`, best BM25 rank first.
+
+    Args:
+        text (str): The search terms typed by the user.
+        published_only (bool): Whether unpublished posts are excluded.
+        limit (int): The maximum number of results.
+        offset (int): The number of results to skip.
+        using (str): The database alias.
+
+    Returns:
+        list[int]: The matching primary keys.
+    """
+    expression = build_match_expression(text)
+    connection = connections[using]
+    if expression is None or not is_supported(connection):
+        return []
+    weights = ', '.join(str(weight) for weight in FTS_WEIGHTS)
+    published = 'AND post.published' if published_only else ''
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT post.id FROM {FTS_TABLE} '
+            f'JOIN {BlogPost._meta.db_table} AS post ON post.id = {FTS_TABLE}.rowid '
+            f'WHERE {FTS_TABLE} MATCH %s {published} '
+            f'ORDER BY bm25({FTS_TABLE}, {weights}) LIMIT %s OFFSET %s',
+            [expression, limit, offset],
+        )
+        return [pk for pk, in cursor.fetchall()]
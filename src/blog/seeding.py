@@ -0,0 +1,73 @@
+import random
+from datetime import date, timedelta
+
+from django.template.defaultfilters import slugify
+
+from .rendering import render_content, render_excerpt
+
+# Preset dataset sizes of the `seed_blog` command, in posts.
+SEED_SIZES: dict[str, int] = {'10k': 10_000, '100k': 100_000, '1M': 1_000_000}
+
+SEED_WORDS: tuple[str, ...] = (
+    'article', 'auteur', 'blog', 'cache', 'code', 'données', 'django', 'écriture', 'index', 'journal',
+    'lecture', 'mesure', 'modèle', 'page', 'performance', 'python', 'requête', 'serveur', 'test', 'vue',
+)
+SEED_FIRSTNAMES: tuple[str, ...] = ('Alice', 'Bruno', 'Chloé', 'David', 'Emma', 'Félix', 'Hugo', 'Inès', 'Léa', 'Marc')
+SEED_LASTNAMES: tuple[str, ...] = ('Bernard', 'Dubois', 'Durand', 'Garcia', 'Leroy', 'Martin', 'Moreau', 'Petit')
+
+SEED_EMAIL_DOMAINS: tuple[str, ...] = ('example.com', 'example.org', 'exemple.fr', 'courriel.test')
+
+SEED_FIRST_DATE: date = date(2015, 1, 1)
+
+
+def seed_author_names(start: int, stop: int) -> list[tuple[str, str]]:
+    """Return the distinct (firstname, lastname) pairs of the authors numbered from `start` to `stop`."""
+    return [
+        (SEED_FIRSTNAMES[index % len(SEED_FIRSTNAMES)], f'{SEED_LASTNAMES[index % len(SEED_LASTNAMES)]} {index}')
+        for index in range(start, stop)
+    ]
+
+
+def seed_emails(start: int, stop: int) -> list[str]:
+    """Return the distinct email addresses of the users numbered from `start` to `stop`, over several domains."""
+    return [
+        f'{SEED_FIRSTNAMES[index % len(SEED_FIRSTNAMES)].lower()}.{index}@{SEED_EMAIL_DOMAINS[index % len(SEED_EMAIL_DOMAINS)]}'
+        for index in range(start, stop)
+    ]
+
+
+def generate_posts(start: int, stop: int, authors: int) -> list[dict]:
+    """Generate the field values of the posts numbered from `start` to `stop`.
+
+    The posts are deterministic for a given number, and the rendered columns are computed here,
+    which is the costly part of the generation. This function only depends on its arguments
+    so that it can run in a worker process.
+
+    Args:
+        start (int): The number of the first post.
+        stop (int): The number after the last post.
+        authors (int): The number of seeded authors; post `n` gets the author number `n % authors`.
+
+    Returns:
+        list[dict]: The keyword arguments of each `BlogPost`, with `author` holding the author number.
+    """
+    posts = []
+    for index in range(start, stop):
+        generator = random.Random(index)
+        title = f"{' '.join(generator.choices(SEED_WORDS, k=4)).capitalize()} n° {index}"
+        content = '\n\n'.join(
+            ' '.join(generator.choices(SEED_WORDS, k=generator.randint(40, 120))).capitalize() + '.'
+            for _ in range(generator.randint(2, 6))
+        )
+        posts.append({
+            'title': title,
+            'slug': slugify(title),
+            'meta_description': title,
+            'content': content,
+            'content_html': render_content(content),
+            'excerpt_html': render_excerpt(content),
+            'created_on': SEED_FIRST_DATE + timedelta(days=generator.randrange(3650)),
+            'published': generator.random() < 0.9,
+            'author': index % authors if authors else None,
+        })
+    return posts
@@ -0,0 +1,51 @@
+from functools import partial
+from typing import Any
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate_authors, invalidate_posts
+from .models import Author, BlogPost
+from .search import index_post, unindex_post
+from .thumbnails import schedule_post_thumbnail
+
+
+# Page cache invalidation and search indexing are wired on signals rather than in
+# `save()`/`delete()` so that queryset deletions, such as the admin "delete selected"
+# action, are covered as well.
+
+@receiver(post_save, sender=BlogPost, dispatch_uid='blog_post_saved')
+@receiver(post_delete, sender=BlogPost, dispatch_uid='blog_post_deleted')
+def invalidate_post_pages(sender: type[BlogPost], instance: BlogPost, **kwargs: Any) -> None:
+    """Invalidate the cached pages of a saved or deleted post, including its previous slug."""
+    invalidate_posts(*{slug for slug in (instance.slug, instance.loaded_slug) if slug})
+    instance.loaded_slug = instance.slug
+
+
+@receiver(post_save, sender=BlogPost, dispatch_uid='blog_post_indexed')
+def index_saved_post(sender: type[BlogPost], instance: BlogPost, using: str, **kwargs: Any) -> None:
+    """Update the full-text index entry of a saved post."""
+    index_post(instance, using=using)
+
+
+@receiver(post_delete, sender=BlogPost, dispatch_uid='blog_post_unindexed')
+def unindex_deleted_post(sender: type[BlogPost], instance: BlogPost, using: str, **kwargs: Any) -> None:
+    """Remove the full-text index entry of a deleted post."""
+    unindex_post(instance.pk, using=using)
+
+
+@receiver(post_save, sender=BlogPost, dispatch_uid='blog_post_thumbnail')
+def generate_thumbnail_variants(sender: type[BlogPost], instance: BlogPost, using: str, **kwargs: Any) -> None:
+    """Schedule the resized variants of a new thumbnail once the post is committed."""
+    name = instance.thumbnail.name
+    if name and not instance.thumbnail_widths:
+        transaction.on_commit(partial(schedule_post_thumbnail, instance.pk, name), using=using)
+    instance.loaded_thumbnail = name
+
+
+@receiver(post_save, sender=Author, dispatch_uid='blog_author_saved')
+@receiver(post_delete, sender=Author, dispatch_uid='blog_author_deleted')
+def invalidate_author_pages(sender: type[Author], instance: Author, **kwargs: Any) -> None:
+    """Invalidate the cached pages that display author names."""
+    invalidate_authors()
@@ -0,0 +1,19 @@
+from typing import Iterable
+
+from django import template
+from django.utils.safestring import SafeString
+
+from blog.cache import render_post_cards
+from blog.models import BlogPost
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_cards(posts: Iterable[BlogPost]) -> list[tuple[BlogPost, SafeString]]:
+    """Return the posts with their cached card, for `{% post_cards blog as cards %}`.
+
+    See `blog.cache.render_post_cards`: the cards of the whole page are fetched with one
+    multi-get, and the template only renders the parts that depend on the user.
+    """
+    return render_post_cards(posts)
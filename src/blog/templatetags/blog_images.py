@@ -0,0 +1,29 @@
+from django import template
+from django.core.files.storage import default_storage
+
+from blog.models import BlogPost
+from blog.thumbnails import derivative_name
+
+register = template.Library()
+
+
+@register.filter
+def thumbnail_srcset(post: BlogPost, image_format: str = 'JPEG') -> str:
+    """Return the `srcset` attribute value listing the resized variants of a post thumbnail.
+
+    Only the widths recorded in `BlogPost.thumbnail_widths` are listed, so the filter never
+    touches the storage and returns an empty string until the variants are generated.
+
+    Args:
+        post (BlogPost): The blog post.
+        image_format (str): The variant format, 'JPEG' or 'WEBP'.
+
+    Returns:
+        str: A value such as '/media/mediablog/derivatives/photo.jpg-300w.jpg 300w, ...'.
+    """
+    if not post.thumbnail:
+        return ''
+    return ', '.join(
+        f'{default_storage.url(derivative_name(post.thumbnail.name, width, image_format.upper()))} {width}w'
+        for width in post.thumbnail_widths
+    )
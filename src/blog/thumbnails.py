@@ -0,0 +1,134 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import PurePosixPath
+from typing import Optional, cast
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import Storage, default_storage
+from django.db import connections
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_WIDTHS: tuple[int, ...] = (300, 600, 1200)
+
+# Pillow format name -> (file extension, save options).
+THUMBNAIL_FORMATS: dict[str, tuple[str, dict]] = {
+    'JPEG': ('jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+    'WEBP': ('webp', {'quality': 80, 'method': 4}),
+}
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def derivative_name(name: str, width: int, image_format: str) -> str:
+    """Return the storage name of a resized variant of the image stored as `name`.
+
+    Args:
+        name (str): The storage name of the original image, e.g. 'mediablog/photo.jpg'.
+        width (int): The width of the variant, in pixels.
+        image_format (str): A key of `THUMBNAIL_FORMATS`.
+
+    Returns:
+        str: The variant name, e.g. 'mediablog/derivatives/photo.jpg-600w.webp'. The extension
+            of the original is kept, so that 'photo.jpg' and 'photo.png' have their own variants.
+    """
+    path = PurePosixPath(name)
+    extension = THUMBNAIL_FORMATS[image_format][0]
+    return str(path.parent / 'derivatives' / f'{path.name}-{width}w.{extension}')
+
+
+def generate_derivatives(name: str, storage: Storage = default_storage) -> list[int]:
+    """Write the resized JPEG and WebP variants of an image to `storage`.
+
+    Variants are never upscaled: an image narrower than the smallest width only gets a
+    variant at its own width. Each variant is resized from the previous, larger one,
+    and JPEG originals are decoded at a reduced scale when possible.
+
+    Args:
+        name (str): The storage name of the original image.
+        storage (Storage): The storage holding the original and receiving the variants.
+
+    Raises:
+        OSError: If the original cannot be read or decoded.
+
+    Returns:
+        list[int]: The widths of the generated variants, in increasing order.
+    """
+    with storage.open(name, 'rb') as original, Image.open(original) as image:
+        widths = [width for width in THUMBNAIL_WIDTHS if width < image.width] or [image.width]
+        image.draft('RGB', (max(widths), max(widths) * image.height // image.width))
+        # A copy is returned, never None, when `in_place` is false.
+        image = cast(Image.Image, ImageOps.exif_transpose(image)).convert('RGB')
+
+        for width in sorted(widths, reverse=True):
+            image = image.resize((width, max(1, round(image.height * width / image.width))), Image.Resampling.LANCZOS)
+            for image_format, (_, options) in THUMBNAIL_FORMATS.items():
+                buffer = BytesIO()
+                image.save(buffer, format=image_format, **options)
+                target = derivative_name(name, width, image_format)
+                storage.delete(target)
+                storage.save(target, ContentFile(buffer.getvalue()))
+    return sorted(widths)
+
+
+def process_post_thumbnail(pk: int, name: str) -> list[int]:
+    """Generate the variants of a post thumbnail and record their widths on the post.
+
+    The update is skipped if the thumbnail was replaced in the meantime. Since the `srcset`
+    of the post pages changes, `last_updated` is bumped and the cached pages are invalidated.
+
+    Args:
+        pk (int): The primary key of the post.
+        name (str): The storage name of the thumbnail.
+
+    Returns:
+        list[int]: The widths of the generated variants.
+    """
+    from .cache import invalidate_posts
+    from .models import BlogPost
+
+    widths = generate_derivatives(name)
+    post = BlogPost.objects.filter(pk=pk, thumbnail=name)
+    slugs = list(post.values_list('slug', flat=True))
+    if slugs:
+        post.update(thumbnail_widths=widths, last_updated=timezone.now())
+        invalidate_posts(*slugs)
+    return widths
+
+
+def _run_in_background(pk: int, name: str) -> None:
+    try:
+        process_post_thumbnail(pk, name)
+    except Exception:
+        logger.exception('Thumbnail generation failed for %s', name)
+    finally:
+        connections.close_all()
+
+
+def schedule_post_thumbnail(pk: int, name: str) -> None:
+    """Generate the variants of a post thumbnail on the background worker pool.
+
+    Resizing releases the GIL, so a small thread pool (`BLOG_THUMBNAIL_WORKERS`) keeps
+    uploads from blocking the request. When `BLOG_THUMBNAILS_ASYNC` is False the variants
+    are generated synchronously.
+
+    Args:
+        pk (int): The primary key of the post.
+        name (str): The storage name of the thumbnail.
+    """
+    global _executor
+    if not getattr(settings, 'BLOG_THUMBNAILS_ASYNC', True):
+        process_post_thumbnail(pk, name)
+        return
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'BLOG_THUMBNAIL_WORKERS', 2), thread_name_prefix='thumbnails',
+            )
+    _executor.submit(_run_in_background, pk, name)
@@ -1,18 +1,27 @@
+from django.conf import settings
 from django.urls import path, URLPattern
 from .views import (
     BlogHome, BlogPostCreate, BlogPostUpdate, BlogPostDetail,
-    BlogPostDelete, AuthorCreateView, AuthorListView
+    BlogPostDelete, AuthorCreateView, AuthorListView, BlogSearch,
+    AsyncAuthorListView, AsyncBlogHome, AsyncBlogPostDetail,
 )
 from django.contrib.auth.decorators import login_required
 
 app_name: str = "blog"
 
+# The `ASYNC_VIEWS` setting selects the async variants of the read views.
+home, detail, list_author = (
+    (AsyncBlogHome, AsyncBlogPostDetail, AsyncAuthorListView) if settings.ASYNC_VIEWS
+    else (BlogHome, BlogPostDetail, AuthorListView)
+)
+
 urlpatterns: list[URLPattern] = [
-    path('', BlogHome.as_view(), name='home'),
+    path('', home.as_view(), name='home'),
     path('create-author/', login_required(AuthorCreateView.as_view()), name='create-author'),
-    path('list-author/', login_required(AuthorListView.as_view()), name='list-author'),
+    path('list-author/', login_required(list_author.as_view()), name='list-author'),
     path('create/', login_required(BlogPostCreate.as_view()), name='create'),
-    path('<str:slug>/', BlogPostDetail.as_view(), name='detail'),
+    path('search/', BlogSearch.as_view(), name='search'),
+    path('<str:slug>/', detail.as_view(), name='detail'),
     path('edit/<str:slug>', login_required(BlogPostUpdate.as_view()), name='edit'),
     path('delete/<str:slug>', login_required(BlogPostDelete.as_view()), name='delete'),
 ]
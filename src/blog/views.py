@@ -1,47 +1,86 @@
-from typing import Any, Optional, Union
-from django.http import HttpRequest, HttpResponse
-from django.views.generic import ListView, CreateView, UpdateView, DetailView, DeleteView
+from typing import TYPE_CHECKING, Any, Awaitable, Optional, Union, cast
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import ValidationError
+from django.http import Http404, HttpRequest, HttpResponse, HttpResponseBase
+from django.template import loader
+from django.views.generic import ListView, CreateView, UpdateView, DetailView, DeleteView, TemplateView
 from django.urls import reverse_lazy
 from django.db.models import QuerySet
+from django.utils.http import urlencode
 
+from .cache import AUTHORS_VERSION_KEY, POSTS_VERSION_KEY, PageCacheMixin, post_version_key
+from .conditional import ListConditionalGetMixin, PostConditionalGetMixin
+from .forms import AuthorForm
 from .models import BlogPost, Author
+from .pagination import KeysetPaginationMixin
+from .search import search_post_ids
+from accounts.models import CustomUser
+
+if TYPE_CHECKING:
+    from django.views.generic import View
+    _ViewBase = View
+    _KeysetListViewBase = KeysetPaginationMixin
+else:
+    _ViewBase = _KeysetListViewBase = object
 
 
 class AuthorCreateView(CreateView):
     """View to create a new Author instance.
 
+    The uniqueness of the name is checked by the database when the author is inserted:
+    a duplicate is shown as a form error without a prior lookup query.
+
     Attributes:
         model (type[Author]): The model associated with the view.
-        fields (Union[list[str], str]): The fields to be displayed in the form, or '__all__' to display all fields.
+        form_class (type[AuthorForm]): The form used to create the author.
         template_name (str): The path to the template used for rendering.
         success_url (str): The URL to redirect to upon successful form submission.
     """
     model: type[Author] = Author
-    fields = '__all__'
+    form_class: type[AuthorForm] = AuthorForm
     template_name: str = 'blog/create_author.html'
     success_url: str = reverse_lazy('blog:list-author')
 
+    def form_valid(self, form: AuthorForm) -> HttpResponse:
+        """Save the author, or render the form again if the name is already used."""
+        try:
+            return super().form_valid(form)
+        except ValidationError:
+            return self.form_invalid(form)
+
 
-class AuthorListView(ListView):
-    """View to list all Author instances.
+class AuthorListView(KeysetPaginationMixin, ListView):
+    """View to list all Author instances, paginated with a keyset cursor.
 
     Attributes:
         model (type[Author]): The model associated with the view.
         template_name (str): The path to the template used for rendering.
         context_object_name (str): The name of the context variable representing the list of authors.
+        paginate_by (int): The number of authors per page.
+        keyset_ordering (tuple[str, ...]): The ordering the paginator seeks on.
+        replica_reads (bool): Whether the view reads from the replica database (see `blog.routing`).
     """
     model: type[Author] = Author
     template_name: str = 'blog/list_author.html'
     context_object_name: str = 'authors'
+    paginate_by: int = 50
+    keyset_ordering: tuple[str, ...] = ('firstname', 'lastname', 'id')
+    replica_reads: bool = True
 
 
-class BlogHome(ListView):
-    """View to list all blog posts.
+class BlogHome(PageCacheMixin, ListConditionalGetMixin, KeysetPaginationMixin, ListView):
+    """View to list all blog posts, paginated with a keyset cursor on `BlogPost.Meta.ordering`.
+
+    Rendered pages are cached per user variant until a post or an author changes, and
+    revalidation requests are answered with 304 Not Modified when the visible posts did not change.
 
     Attributes:
         model (type[BlogPost]): The model associated with the view.
         template_name (str): The path to the template used for rendering.
         context_object_name (str): The name of the context variable representing the blog posts.
+        paginate_by (int): The number of posts per page.
+        deferred_fields (tuple[str, ...]): The columns that are not loaded for the listing.
+        replica_reads (bool): Whether the view reads from the replica database (see `blog.routing`).
 
     Methods:
         get_queryset: Filters blog posts based on whether the user is authenticated.
@@ -49,20 +88,30 @@ class BlogHome(ListView):
     model: type[BlogPost] = BlogPost
     template_name: str = 'blog/blogpost_list.html'
     context_object_name: str = 'blog'
+    paginate_by: int = 20
+    deferred_fields: tuple[str, ...] = ('content', 'content_html', 'meta_description', 'meta_keywords')
+    replica_reads: bool = True
 
     def get_queryset(self) -> QuerySet[BlogPost]:
         """Return a filtered queryset of blog posts.
 
         If the user is authenticated, returns all blog posts. Otherwise, returns only the posts that are published.
+        The columns the listing does not display, such as the full content, are not loaded.
 
         Returns:
             QuerySet[BlogPost]: A queryset of BlogPost instances.
         """
-        queryset: QuerySet[BlogPost] = super().get_queryset()
+        queryset: QuerySet[BlogPost] = super().get_queryset().defer(*self.deferred_fields)
         if self.request.user.is_authenticated:
             return queryset
         return queryset.filter(published=True)
 
+    def paginate_queryset(self, queryset: QuerySet[BlogPost], page_size: int) -> tuple:  # type: ignore[override]
+        """Paginate, then load the authors of the posts whose name was not backfilled with one query."""
+        paginated = super().paginate_queryset(queryset, page_size)
+        Author.objects.load_for_posts(paginated[2])
+        return paginated
+
 
 class BlogPostCreate(CreateView):
     """View to create a new BlogPost instance.
@@ -94,17 +143,26 @@ class BlogPostUpdate(UpdateView):
     success_url: str = reverse_lazy('blog:home')
 
 
-class BlogPostDetail(DetailView):
+class BlogPostDetail(PageCacheMixin, PostConditionalGetMixin, DetailView):
     """View to display details of a single BlogPost instance.
 
+    Rendered pages are cached per user variant until the post or an author changes, and
+    revalidation requests are answered with 304 Not Modified until `last_updated` changes.
+
     Attributes:
         model (type[BlogPost]): The model associated with the view.
         template_name (str): The path to the template used for rendering.
         context_object_name (str): The name of the context variable representing the blog post.
+        replica_reads (bool): Whether the view reads from the replica database (see `blog.routing`).
     """
     model: type[BlogPost] = BlogPost
     template_name: str = 'blog/blogpost_detail.html'
     context_object_name: str = 'post'
+    replica_reads: bool = True
+
+    def get_page_cache_versions(self) -> list[str]:
+        """Return the version counters of the displayed post, of all posts (bulk changes) and of the authors."""
+        return [post_version_key(self.kwargs['slug']), POSTS_VERSION_KEY, AUTHORS_VERSION_KEY]
 
 
 class BlogPostDelete(DeleteView):
@@ -120,3 +178,140 @@ class BlogPostDelete(DeleteView):
     template_name: str = 'blog/blogpost_confirm_delete.html'
     context_object_name: str = 'post'
     success_url: str = reverse_lazy('blog:home')
+
+
+class BlogSearch(TemplateView):
+    """View to search blog posts with the FTS5 full-text index, best BM25 rank first.
+
+    Like `BlogHome`, only published posts are searched for anonymous users.
+
+    Attributes:
+        template_name (str): The path to the template used for rendering.
+        paginate_by (int): The number of results per page.
+    """
+    template_name: str = 'blog/search.html'
+    paginate_by: int = 20
+
+    def get_page_url(self, page: int) -> str:
+        params = self.request.GET.copy()
+        params['page'] = str(page)
+        return f'{self.request.path}?{urlencode(params, doseq=True)}'
+
+    def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
+        """Return the context with the results of the requested page.
+
+        One result more than the page size is fetched to know whether a next page exists,
+        so no COUNT query is needed.
+
+        Raises:
+            Http404: If the page number is invalid.
+        """
+        context = super().get_context_data(**kwargs)
+        query: str = self.request.GET.get('q', '').strip()
+        try:
+            page = int(self.request.GET.get('page', 1))
+        except ValueError:
+            raise Http404('Numéro de page invalide.')
+        if page < 1:
+            raise Http404('Numéro de page invalide.')
+
+        ids = search_post_ids(
+            query,
+            published_only=not self.request.user.is_authenticated,
+            limit=self.paginate_by + 1,
+            offset=(page - 1) * self.paginate_by,
+        )
+        has_next = len(ids) > self.paginate_by
+        ids = ids[:self.paginate_by]
+        posts = BlogPost.objects.defer(*BlogHome.deferred_fields).in_bulk(ids)
+        Author.objects.load_for_posts(posts.values())
+        context.update(
+            query=query,
+            results=[posts[pk] for pk in ids if pk in posts],
+            is_paginated=has_next or page > 1,
+            next_page_url=self.get_page_url(page + 1) if has_next else None,
+            previous_page_url=self.get_page_url(page - 1) if page > 1 else None,
+        )
+        return context
+
+
+class RenderedTemplateResponse(HttpResponse):
+    """Response rendering its template immediately, used as `response_class` by async views.
+
+    The async request handler renders a `TemplateResponse` in a worker thread; rendering in
+    the view instead keeps the whole request on the event loop.
+    """
+
+    def __init__(
+        self, request: HttpRequest, template: Union[str, list[str]], context: Optional[dict[str, Any]] = None,
+        content_type: Optional[str] = None, status: Optional[int] = None, charset: Optional[str] = None,
+        using: Optional[str] = None, headers: Optional[dict[str, str]] = None,
+    ) -> None:
+        content = loader.render_to_string(template, context, request, using=using)
+        super().__init__(content, content_type, status, charset=charset, headers=headers)
+
+
+class AsyncViewMixin(_ViewBase):
+    """Mixin for the async variants of the read views.
+
+    The user is loaded with the async API before the view runs, so that the templates and the
+    cache variants read `request.user` without a synchronous query, and the response is rendered
+    in the view (see `RenderedTemplateResponse`).
+
+    The `get` handlers of these views are coroutine functions, which the `HttpResponse` return
+    type of the synchronous ones they override cannot describe.
+
+    Attributes:
+        response_class (type[HttpResponse]): The class of the rendered responses, `RenderedTemplateResponse`.
+    """
+    response_class: type[HttpResponse] = RenderedTemplateResponse
+
+    def dispatch(self, request: HttpRequest, *args: Any, **kwargs: Any) -> Any:
+        # A coroutine, like `View.dispatch` for async views.
+        return self._user_adispatch(request, *args, **kwargs)
+
+    async def _user_adispatch(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponseBase:
+        # `AUTH_USER_MODEL` is `CustomUser`.
+        request.user = cast(Union[CustomUser, AnonymousUser], await request.auser())
+        return await cast(Awaitable[HttpResponseBase], super().dispatch(request, *args, **kwargs))
+
+
+class AsyncListMixin(AsyncViewMixin, _KeysetListViewBase):
+    """Async `get` for the keyset-paginated list views."""
+
+    async def get(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:  # type: ignore[override]
+        self.object_list = self.get_queryset()
+        page_size = self.get_paginate_by(self.object_list)
+        if page_size:
+            await self.apaginate_queryset(self.object_list, page_size)
+        return self.render_to_response(self.get_context_data())
+
+
+class AsyncAuthorListView(AsyncListMixin, AuthorListView):
+    """Async variant of `AuthorListView`, reading the page with the async ORM."""
+
+
+class AsyncBlogHome(AsyncListMixin, BlogHome):
+    """Async variant of `BlogHome`, reading the page, the validators and the cache asynchronously."""
+
+    async def apaginate_queryset(self, queryset: QuerySet[BlogPost], page_size: int) -> tuple:
+        """Paginate asynchronously, then load the authors of the posts whose name was not backfilled.
+
+        Templates cannot run queries in an async view, so `author_or_default` must not fall back
+        to loading the author.
+        """
+        paginated = await super().apaginate_queryset(queryset, page_size)
+        await Author.objects.aload_for_posts(paginated[2])
+        return paginated
+
+
+class AsyncBlogPostDetail(AsyncViewMixin, BlogPostDetail):
+    """Async variant of `BlogPostDetail`, reading the post, the validators and the cache asynchronously."""
+
+    async def get(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:  # type: ignore[override]
+        """Render the post, or raise Http404 if no post has the requested slug."""
+        try:
+            self.object = await self.get_queryset().select_related('author').aget(slug=self.kwargs['slug'])
+        except BlogPost.DoesNotExist:
+            raise Http404('Aucun article ne correspond à cette adresse.')
+        return self.render_to_response(self.get_context_data(object=self.object))
@@ -0,0 +1,124 @@
+import importlib
+import shutil
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+import pytest
+from django.core.cache import caches
+from django.db import connection, connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import clear_url_caches, reverse
+
+import blog.urls
+import website.urls
+from accounts.models import CustomUser
+from blog.models import Author, BlogPost
+from blog.search import FTS_COLUMNS, index_rows
+from query_budgets import QUERY_BUDGETS
+
+# The size N of the smallest dataset rendered by `query_budget`; the largest has 10×N rows.
+QUERY_BUDGET_ROWS: int = 5
+
+# A replica alias mirroring the test database, for the routing tests. It is not the alias named
+# by `REPLICA_DATABASE_ALIAS`, so the other tests keep reading from the primary.
+connections.settings['test_replica'] = {
+    **connections.settings['default'], 'TEST': {**connections.settings['default']['TEST'], 'MIRROR': 'default'},
+}
+
+# The tests run with the cache shared by processes (`CACHE_BACKEND=mmap`), in a file apart
+# from the one of the running site.
+TEST_CACHE_DIRECTORY: Path = Path(tempfile.mkdtemp(prefix='website-tests-'))
+caches.settings['default'] = {
+    'BACKEND': 'website.mmap_cache.MmapCache',
+    'LOCATION': str(TEST_CACHE_DIRECTORY / 'cache.mmap'),
+    'OPTIONS': {'MAX_ENTRIES': 16384, 'SIZE': 64 * 1024 * 1024},
+}
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    shutil.rmtree(TEST_CACHE_DIRECTORY, ignore_errors=True)
+
+
+@pytest.fixture(autouse=True)
+def clear_caches() -> Iterator[None]:
+    """Empty every configured cache around each test, as the database is rolled back between tests."""
+    for cache in caches.all():
+        cache.clear()
+    yield
+    for cache in caches.all():
+        cache.clear()
+
+
+@pytest.fixture
+def async_views(settings: Any) -> Iterator[None]:
+    """Route the read views to their async variants for the duration of a test."""
+    def reload_urls() -> None:
+        importlib.reload(blog.urls)
+        importlib.reload(website.urls)
+        clear_url_caches()
+
+    settings.ASYNC_VIEWS = True
+    reload_urls()
+    yield
+    settings.ASYNC_VIEWS = False
+    reload_urls()
+
+
+def seed_query_budget_dataset(start: int, stop: int) -> None:
+    """Create the authors and published posts numbered from `start` to `stop` (excluded).
+
+    Every other post keeps an empty `author_name`, like the posts saved before the name was
+    denormalized, so that the views which fall back to loading the author are exercised too.
+    """
+    authors = Author.objects.bulk_create(
+        Author(firstname=f'Prénom{index}', lastname=f'Nom{index}') for index in range(start, stop)
+    )
+    posts = BlogPost.objects.bulk_create(
+        BlogPost(
+            title=f'Article {index}', slug=f'article-{index}', author=author,
+            author_name=str(author) if index % 2 else '', created_on=date(2024, 1, 1) + timedelta(days=index),
+            published=True, content=f'Contenu de l\'article {index}.',
+        )
+        for index, author in zip(range(start, stop), authors)
+    )
+    # `bulk_create` sends no `post_save`, which indexes the posts one by one.
+    index_rows((post.pk, *(getattr(post, column) for column in FTS_COLUMNS)) for post in posts)
+
+
+@pytest.fixture
+def query_budget(db: None, client: Client) -> Callable[[str], None]:
+    """Return a function that checks the view named `url_name` against its entry in `QUERY_BUDGETS`.
+
+    The view is rendered over N and then 10×N seeded rows, with the caches emptied before each
+    request. The check fails, listing the SQL of the last request, if the number of queries
+    grows with the dataset or exceeds the budget.
+    """
+    def check(url_name: str) -> None:
+        budget = QUERY_BUDGETS[url_name]
+        if budget.login:
+            client.force_login(CustomUser.objects.create_superuser(email='budget@example.com', password='budget'))
+
+        counts: list[int] = []
+        for start, stop in ((0, QUERY_BUDGET_ROWS), (QUERY_BUDGET_ROWS, 10 * QUERY_BUDGET_ROWS)):
+            seed_query_budget_dataset(start, stop)
+            for cache in caches.all():
+                cache.clear()
+            url = reverse(url_name, kwargs=budget.url_kwargs())
+            with CaptureQueriesContext(connection) as captured:
+                response = client.get(f'{url}?{budget.query_string}' if budget.query_string else url)
+            assert response.status_code == 200, f'{url_name}: GET {url} returned {response.status_code}'
+            counts.append(len(captured))
+
+        statements = '\n'.join(f'{number}. {query["sql"]}' for number, query in enumerate(captured.captured_queries, 1))
+        if counts[1] > counts[0]:
+            pytest.fail(
+                f'{url_name}: {counts[0]} queries for {QUERY_BUDGET_ROWS} rows but {counts[1]} for '
+                f'{10 * QUERY_BUDGET_ROWS}; the query count must not grow with the data.\n{statements}',
+            )
+        if counts[1] > budget.max_queries:
+            pytest.fail(f'{url_name}: {counts[1]} queries, over the budget of {budget.max_queries}.\n{statements}')
+
+    return check
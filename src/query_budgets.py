@@ -0,0 +1,50 @@
+"""
+Declarative SQL query budgets of the site's views, keyed by URL name, for the test suite.
+
+The `query_budget` fixture of `conftest.py` renders each view over a seeded dataset of N
+and then 10×N posts and authors, and fails if the number of queries grows with the
+dataset (an N+1) or exceeds `max_queries`. A new view gets its entry here and its test
+next to the other tests of its application.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from blog.models import BlogPost
+
+
+def _latest_post() -> dict[str, Any]:
+    return {'slug': BlogPost.objects.values_list('slug', flat=True).first()}
+
+
+@dataclass(frozen=True)
+class QueryBudget:
+    """The number of queries a view may run for one request, whatever the size of the dataset.
+
+    Attributes:
+        max_queries (int): The maximum number of queries, sessions and authentication included.
+        login (bool): Whether the view is requested by a logged-in staff user.
+        url_kwargs (Callable[[], dict[str, Any]]): Returns the URL arguments, read from the seeded dataset.
+        query_string (str): The query string of the request.
+    """
+    max_queries: int
+    login: bool = False
+    url_kwargs: Callable[[], dict[str, Any]] = field(default=dict)
+    query_string: str = ''
+
+
+QUERY_BUDGETS: dict[str, QueryBudget] = {
+    'index': QueryBudget(max_queries=0),
+    'metrics': QueryBudget(max_queries=2, login=True),
+    'blog:home': QueryBudget(max_queries=3),
+    'blog:detail': QueryBudget(max_queries=2, url_kwargs=_latest_post),
+    'blog:search': QueryBudget(max_queries=3, query_string='q=article'),
+    'blog:list-author': QueryBudget(max_queries=3, login=True),
+    'blog:create-author': QueryBudget(max_queries=2, login=True),
+    'blog:create': QueryBudget(max_queries=2, login=True),
+    'blog:edit': QueryBudget(max_queries=3, login=True, url_kwargs=_latest_post),
+    'blog:delete': QueryBudget(max_queries=3, login=True, url_kwargs=_latest_post),
+    'accounts:login': QueryBudget(max_queries=0),
+    'accounts:signup': QueryBudget(max_queries=0),
+    'accounts:profile': QueryBudget(max_queries=2, login=True),
+}
@@ -0,0 +1,159 @@
+"""
+HTTP clients of the `loadtest` command, all driven from an asyncio event loop.
+
+`ASGIClient` and `WSGIClient` call the site's applications in-process; `HTTPClient` sends
+the requests to a running server over TCP. They share one interface, `request()`, which
+returns the status code and the cookies set by the response.
+"""
+
+import asyncio
+import math
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from http.cookies import SimpleCookie
+from io import BytesIO
+from typing import Any, Callable, Iterable
+from urllib.parse import urlsplit
+
+
+def percentile(latencies: list[float], fraction: float) -> float:
+    """Return the `fraction` percentile of `latencies` with the nearest-rank method."""
+    ordered = sorted(latencies)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+@dataclass
+class LoadResponse:
+    """The parts of a response that the load generator uses.
+
+    Attributes:
+        status (int): The HTTP status code.
+        cookies (dict[str, str]): The cookies set by the response, by name.
+    """
+    status: int
+    cookies: dict[str, str] = field(default_factory=dict)
+
+
+def _parse_cookies(headers: Iterable[tuple[str, str]]) -> dict[str, str]:
+    cookies: SimpleCookie = SimpleCookie()
+    for name, value in headers:
+        if name.lower() == 'set-cookie':
+            cookies.load(value)
+    return {name: morsel.value for name, morsel in cookies.items()}
+
+
+class ASGIClient:
+    """Sends requests to an ASGI application in-process, as concurrent tasks of the event loop."""
+
+    def __init__(self, application: Callable, host: str) -> None:
+        self.application = application
+        self.host = host
+
+    async def request(self, method: str, path: str, headers: dict[str, str], body: bytes = b'') -> LoadResponse:
+        response = LoadResponse(status=0)
+        finished = asyncio.Event()
+        messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+
+        async def receive() -> dict[str, Any]:
+            if messages:
+                return messages.pop()
+            await finished.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message: dict[str, Any]) -> None:
+            if message['type'] == 'http.response.start':
+                response.status = message['status']
+                response.cookies = _parse_cookies(
+                    (name.decode('latin-1'), value.decode('latin-1')) for name, value in message['headers']
+                )
+            elif message['type'] == 'http.response.body' and not message.get('more_body'):
+                finished.set()
+
+        path, _, query = path.partition('?')
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': method,
+            'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': query.encode(),
+            'root_path': '', 'client': ('127.0.0.1', 0), 'server': (self.host, 80),
+            'headers': [(b'host', self.host.encode())] + [
+                (name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers.items()
+            ],
+        }
+        await self.application(scope, receive, send)
+        finished.set()
+        return response
+
+
+class WSGIClient:
+    """Sends requests to a WSGI application in-process, from a pool of `concurrency` threads."""
+
+    def __init__(self, application: Callable, host: str, concurrency: int) -> None:
+        self.application = application
+        self.host = host
+        self.executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='loadtest')
+
+    async def request(self, method: str, path: str, headers: dict[str, str], body: bytes = b'') -> LoadResponse:
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor, self._request, method, path, headers, body,
+        )
+
+    def _request(self, method: str, path: str, headers: dict[str, str], body: bytes) -> LoadResponse:
+        response = LoadResponse(status=0)
+
+        def start_response(status: str, response_headers: list[tuple[str, str]], exc_info: Any = None) -> None:
+            response.status = int(status.split()[0])
+            response.cookies = _parse_cookies(response_headers)
+
+        path, _, query = path.partition('?')
+        environ = {
+            'REQUEST_METHOD': method, 'PATH_INFO': path, 'QUERY_STRING': query, 'SCRIPT_NAME': '',
+            'SERVER_NAME': self.host, 'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1',
+            'HTTP_HOST': self.host, 'REMOTE_ADDR': '127.0.0.1', 'CONTENT_LENGTH': str(len(body)),
+            'wsgi.input': BytesIO(body), 'wsgi.errors': sys.stderr, 'wsgi.url_scheme': 'http',
+            'wsgi.version': (1, 0), 'wsgi.multithread': True, 'wsgi.multiprocess': False, 'wsgi.run_once': False,
+        }
+        for name, value in headers.items():
+            key = name.upper().replace('-', '_')
+            environ[key if key in ('CONTENT_TYPE', 'CONTENT_LENGTH') else f'HTTP_{key}'] = value
+        result = self.application(environ, start_response)
+        try:
+            for _ in result:
+                pass
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+        return response
+
+    def close(self) -> None:
+        self.executor.shutdown()
+
+
+class HTTPClient:
+    """Sends requests to a running server, one `Connection: close` HTTP/1.1 connection per request."""
+
+    def __init__(self, url: str) -> None:
+        parts = urlsplit(url)
+        if parts.scheme != 'http' or not parts.hostname:
+            raise ValueError(f'Adresse de serveur invalide : {url}')
+        self.host: str = parts.hostname
+        self.port: int = parts.port or 80
+        self.authority: str = parts.netloc
+
+    async def request(self, method: str, path: str, headers: dict[str, str], body: bytes = b'') -> LoadResponse:
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            head = [
+                f'{method} {path} HTTP/1.1', f'Host: {self.authority}', 'Connection: close',
+                f'Content-Length: {len(body)}', *(f'{name}: {value}' for name, value in headers.items()),
+            ]
+            writer.write('\r\n'.join(head).encode('latin-1') + b'\r\n\r\n' + body)
+            await writer.drain()
+            raw = await reader.read()
+        finally:
+            writer.close()
+            await writer.wait_closed()
+        status_line, *header_lines = raw.partition(b'\r\n\r\n')[0].decode('latin-1').split('\r\n')
+        return LoadResponse(
+            status=int(status_line.split()[1]),
+            cookies=_parse_cookies(line.partition(': ')[::2] for line in header_lines if ': ' in line),
+        )
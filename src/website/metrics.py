@@ -0,0 +1,282 @@
+"""
+Request instrumentation exposed in the Prometheus text format.
+
+`MetricsMiddleware` measures each request and adds it to the in-process `registry`, keyed
+by the URL name of the view (`blog:home`, `accounts:signup`, ...). SQL queries are timed by
+an execute wrapper installed on every database connection, and templates by the
+`DjangoTemplates` backend of this module and the `Jinja2` one of `website.templating`. The
+`/metrics` view serves the registry.
+
+Each server process has its own registry: with several worker processes, Prometheus
+scrapes one of them per request.
+"""
+
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Any, Callable, Optional, Union, cast
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+from django.http import HttpRequest, HttpResponse
+from django.template import Context
+from django.template.backends import django as django_backend
+from django.utils.safestring import SafeString
+
+if TYPE_CHECKING:
+    from django.template.backends.base import _EngineTemplate
+    _TemplateBase = _EngineTemplate
+else:
+    _TemplateBase = object
+
+# Upper bounds of the latency histogram buckets, in seconds.
+LATENCY_BUCKETS: tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+UNRESOLVED: str = '<unresolved>'
+
+# The `method` label values; any other method sent by a client is recorded as `OTHER_METHOD`,
+# so that clients cannot add series to the registry.
+HTTP_METHODS: frozenset[str] = frozenset({'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS', 'TRACE', 'CONNECT'})
+OTHER_METHOD: str = 'other'
+
+
+@dataclass
+class RequestStats:
+    """The measures of the request being served.
+
+    Attributes:
+        started (float): The `perf_counter` value when the request entered the middleware.
+        view_started (Optional[float]): The `perf_counter` value when the view was about to run.
+        queries (int): The number of SQL queries.
+        query_time (float): The time spent in SQL queries, in seconds.
+        template_time (float): The time spent rendering templates, in seconds.
+    """
+    started: float = field(default_factory=time.perf_counter)
+    view_started: Optional[float] = None
+    queries: int = 0
+    query_time: float = 0.0
+    template_time: float = 0.0
+
+
+@dataclass
+class ViewMetrics:
+    """The aggregated measures of one view and HTTP method.
+
+    Attributes:
+        buckets (list[int]): The number of requests per latency bucket (not cumulative), the
+            last one counting the requests slower than every bound.
+        duration (float): The total latency, in seconds.
+        pre_view (float): The time spent before the view (middleware and URL resolution), in seconds.
+        queries (int): The number of SQL queries.
+        query_time (float): The time spent in SQL queries, in seconds.
+        template_time (float): The time spent rendering templates, in seconds.
+        statuses (dict[int, int]): The number of responses per status code.
+    """
+    buckets: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+    duration: float = 0.0
+    pre_view: float = 0.0
+    queries: int = 0
+    query_time: float = 0.0
+    template_time: float = 0.0
+    statuses: dict[int, int] = field(default_factory=dict)
+
+
+class MetricsRegistry:
+    """Thread-safe in-process aggregator of request measures.
+
+    A request is recorded with a single lock acquisition and a few additions; the text
+    exposition is only built when `/metrics` is scraped.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._views: dict[tuple[str, str], ViewMetrics] = {}
+
+    def record(self, view: str, method: str, status: int, stats: RequestStats, finished: float) -> None:
+        """Add the measures of a finished request."""
+        duration = finished - stats.started
+        pre_view = (stats.view_started or finished) - stats.started
+        bucket = bisect.bisect_left(LATENCY_BUCKETS, duration)
+        with self._lock:
+            metrics = self._views.get((view, method))
+            if metrics is None:
+                metrics = self._views[(view, method)] = ViewMetrics()
+            metrics.buckets[bucket] += 1
+            metrics.duration += duration
+            metrics.pre_view += pre_view
+            metrics.queries += stats.queries
+            metrics.query_time += stats.query_time
+            metrics.template_time += stats.template_time
+            metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+
+    def reset(self) -> None:
+        """Forget every recorded measure."""
+        with self._lock:
+            self._views.clear()
+
+    def render(self) -> str:
+        """Return the measures in the Prometheus text exposition format."""
+        with self._lock:
+            views = sorted(
+                (key, replace(metrics, buckets=list(metrics.buckets), statuses=dict(metrics.statuses)))
+                for key, metrics in self._views.items()
+            )
+
+        lines = [
+            '# HELP http_requests_total Requests served, by view, method and status.',
+            '# TYPE http_requests_total counter',
+        ]
+        for (view, method), metrics in views:
+            for status, count in sorted(metrics.statuses.items()):
+                lines.append(f'http_requests_total{{{_labels(view, method)},status="{status}"}} {count}')
+
+        lines += [
+            '# HELP http_request_duration_seconds Request latency, from the first middleware to the response.',
+            '# TYPE http_request_duration_seconds histogram',
+        ]
+        for (view, method), metrics in views:
+            labels = _labels(view, method)
+            cumulative = 0
+            for bound, count in zip((*LATENCY_BUCKETS, '+Inf'), metrics.buckets):
+                cumulative += count
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'http_request_duration_seconds_sum{{{labels}}} {metrics.duration:.6f}')
+            lines.append(f'http_request_duration_seconds_count{{{labels}}} {cumulative}')
+
+        counters = (
+            ('http_request_pre_view_seconds_total', 'Time spent in middleware and URL resolution before the view.',
+             'pre_view', '{:.6f}'),
+            ('db_queries_total', 'SQL queries executed.', 'queries', '{}'),
+            ('db_query_seconds_total', 'Time spent executing SQL queries.', 'query_time', '{:.6f}'),
+            ('template_render_seconds_total', 'Time spent rendering templates.', 'template_time', '{:.6f}'),
+        )
+        for name, description, attribute, value_format in counters:
+            lines += [f'# HELP {name} {description}', f'# TYPE {name} counter']
+            for (view, method), metrics in views:
+                value = value_format.format(getattr(metrics, attribute))
+                lines.append(f'{name}{{{_labels(view, method)}}} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the Prometheus text format."""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(view: str, method: str) -> str:
+    return f'view="{_escape(view)}",method="{_escape(method)}"'
+
+
+registry = MetricsRegistry()
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar('website_request_stats', default=None)
+_rendering_template: ContextVar[bool] = ContextVar('website_rendering_template', default=False)
+
+
+def _time_query(execute: Callable, sql: str, params: Any, many: bool, context: dict[str, Any]) -> Any:
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.query_time += time.perf_counter() - started
+
+
+def instrument_connection(sender: Any, connection: BaseDatabaseWrapper, **kwargs: Any) -> None:
+    """Install the query timer on a new database connection (`connection_created` receiver)."""
+    if _time_query not in connection.execute_wrappers:
+        # Outermost, so that the wrappers pushed and popped by `execute_wrapper()` are left in place.
+        connection.execute_wrappers.insert(0, _time_query)
+
+
+class DjangoTemplates(django_backend.DjangoTemplates):
+    """The Django template backend, timing the rendering of each template it returns."""
+
+    def from_string(self, template_code: str) -> 'Template':
+        return Template(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name: str) -> 'Template':
+        template = cast(django_backend.Template, super().get_template(template_name))
+        return Template(template.template, self)
+
+
+class TimedTemplateMixin(_TemplateBase):
+    """Adds the rendering time of the template to the current request's measures."""
+
+    def render(
+        self, context: Optional[Union[Context, dict[str, Any]]] = None, request: Optional[HttpRequest] = None,
+    ) -> SafeString:
+        stats = _current.get()
+        # A template rendered by another one, such as a post card, is timed with it.
+        if stats is None or _rendering_template.get():
+            return super().render(context, request)
+        token = _rendering_template.set(True)
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            stats.template_time += time.perf_counter() - started
+            _rendering_template.reset(token)
+
+
+class Template(TimedTemplateMixin, django_backend.Template):
+    """Django template whose rendering time is added to the current request's measures."""
+
+
+class MetricsMiddleware:
+    """Middleware that records the latency, queries and template time of each request in `registry`.
+
+    It should come first in `MIDDLEWARE`, so that the latency includes the other middleware.
+    Requests are labelled with the URL name of their view, or `<unresolved>` when no URL matched.
+    """
+    sync_capable: bool = True
+    async_capable: bool = True
+
+    def __init__(self, get_response: Callable) -> None:
+        self.get_response = get_response
+        connection_created.connect(instrument_connection, dispatch_uid='website.metrics')
+        for connection in connections.all(initialized_only=True):
+            instrument_connection(None, connection)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats = RequestStats()
+        token = _current.set(stats)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.record(request, response, stats)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        stats = RequestStats()
+        token = _current.set(stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.record(request, response, stats)
+        return response
+
+    def process_view(self, request: HttpRequest, view_func: Callable, view_args: Any, view_kwargs: Any) -> None:
+        stats = _current.get()
+        if stats is not None:
+            stats.view_started = time.perf_counter()
+
+    @staticmethod
+    def record(request: HttpRequest, response: HttpResponse, stats: RequestStats) -> None:
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match is not None else UNRESOLVED
+        method = request.method if request.method in HTTP_METHODS else OTHER_METHOD
+        registry.record(view, method, response.status_code, stats, time.perf_counter())
@@ -0,0 +1,301 @@
+"""
+Cache backend shared by the worker processes of a host, on a memory-mapped file.
+
+`MmapCache` keeps its entries in a file (`LOCATION`) that every process using the cache maps
+in memory, so that a page cached by one worker is a hit for the others. The file holds:
+
+- a header: the layout of the file and the write position of the log;
+- an index of `MAX_ENTRIES` slots, in buckets of `WAYS` slots: the hash of a key, the
+  position of its record in the log, the length of the record and its expiry time;
+- a circular log of `SIZE` bytes, where each write appends a record (key and pickled value).
+
+New records overwrite the oldest ones, whose slots then read as missing. A hit on a record
+in the older half of the log appends it again, so that the entries in use survive the
+wrap-around and eviction approximates LRU. When a bucket is full, the slot of the least
+recently appended record is reused. Expired entries are misses.
+
+Every operation holds an exclusive `flock` on the file, and a thread lock within the
+process, which makes read-modify-write operations such as `incr` atomic across workers.
+The file is created on first use. An existing file keeps its layout, so it must be deleted
+for a new `SIZE` or `MAX_ENTRIES` to apply.
+"""
+
+import fcntl
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator, Optional
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+MAGIC: bytes = b'WMC1'
+# Number of slots a key can occupy, all checked by every lookup.
+WAYS: int = 8
+DEFAULT_SIZE: int = 64 * 1024 * 1024
+
+_HEADER = struct.Struct('<4s4xQQQ')  # magic, number of slots, log size, log head
+_HEAD_OFFSET: int = 24
+_HEAD = struct.Struct('<Q')
+_SLOT = struct.Struct('<QQI4xd')  # key hash (0: empty), log position, record length, expiry (0: never)
+_RECORD = struct.Struct('<II')  # key length, value length
+
+_EMPTY_SLOT: tuple[int, int, int, float] = (0, 0, 0, 0.0)
+
+_files: dict[tuple[str, int], '_SharedFile'] = {}
+_files_lock = threading.Lock()
+
+
+class _SharedFile:
+    """The mapping of a cache file in the current process, and the operations on it.
+
+    The methods other than `locked` must be called with the lock held.
+    """
+
+    def __init__(self, path: str, slots: int, log_size: int) -> None:
+        self.thread_lock = threading.Lock()
+        self.fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(self.fd, fcntl.LOCK_EX)
+        try:
+            header = os.pread(self.fd, _HEADER.size, 0)
+            if len(header) == _HEADER.size and header.startswith(MAGIC):
+                _, slots, log_size, _ = _HEADER.unpack(header)
+            else:
+                os.ftruncate(self.fd, 0)
+                os.ftruncate(self.fd, _HEADER.size + slots * _SLOT.size + log_size)
+                os.pwrite(self.fd, _HEADER.pack(MAGIC, slots, log_size, 0), 0)
+        finally:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+        self.slots: int = slots
+        self.log_size: int = log_size
+        self.log_offset: int = _HEADER.size + slots * _SLOT.size
+        self.map = mmap.mmap(self.fd, self.log_offset + log_size)
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        with self.thread_lock:
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self.fd, fcntl.LOCK_UN)
+
+    def find(self, key: bytes, key_hash: int, now: float, promote: bool = True) -> Optional[tuple[int, bytes, float]]:
+        """Return the slot, the value and the expiry of `key`, or None if it is missing or expired.
+
+        With `promote`, a record found in the older half of the log is appended again.
+        """
+        head = self._head()
+        for index in self._bucket(key_hash):
+            slot_hash, position, length, expires = self._slot(index)
+            if slot_hash != key_hash or position < head - self.log_size:
+                continue
+            record = self._read(position, length)
+            key_length = _RECORD.unpack_from(record)[0]
+            if record[_RECORD.size:_RECORD.size + key_length] != key:
+                continue
+            if expires and expires <= now:
+                self._write_slot(index, *_EMPTY_SLOT)
+                return None
+            if promote and position < head - self.log_size // 2:
+                self._write_slot(index, key_hash, self._append(record), length, expires)
+            return index, record[_RECORD.size + key_length:], expires
+        return None
+
+    def store(self, key: bytes, key_hash: int, value: bytes, expires: float, now: float) -> None:
+        """Append the record of `key` to the log and point its slot to it."""
+        record = _RECORD.pack(len(key), len(value)) + key + value
+        found = self.find(key, key_hash, now, promote=False)
+        if len(record) > self.log_size // 2:
+            # Larger entries are not stored, and the previous value must not be served.
+            if found is not None:
+                self._write_slot(found[0], *_EMPTY_SLOT)
+            return
+        if found is not None:
+            index = found[0]
+        else:
+            index = self._victim(key_hash, now)
+        self._write_slot(index, key_hash, self._append(record), len(record), expires)
+
+    def set_expiry(self, index: int, expires: float) -> None:
+        slot_hash, position, length, _ = self._slot(index)
+        self._write_slot(index, slot_hash, position, length, expires)
+
+    def remove(self, index: int) -> None:
+        self._write_slot(index, *_EMPTY_SLOT)
+
+    def clear(self) -> None:
+        self.map[_HEADER.size:self.log_offset] = bytes(self.log_offset - _HEADER.size)
+
+    def _victim(self, key_hash: int, now: float) -> int:
+        """Return the slot of the bucket of `key_hash` to reuse: a free one, or the least recently appended."""
+        head = self._head()
+        oldest: Optional[tuple[int, int]] = None
+        for index in self._bucket(key_hash):
+            slot_hash, position, _, expires = self._slot(index)
+            if not slot_hash or position < head - self.log_size or (expires and expires <= now):
+                return index
+            if oldest is None or position < oldest[1]:
+                oldest = (index, position)
+        assert oldest is not None  # A bucket has WAYS slots.
+        return oldest[0]
+
+    def _bucket(self, key_hash: int) -> range:
+        start = key_hash % (self.slots // WAYS) * WAYS
+        return range(start, start + WAYS)
+
+    def _slot(self, index: int) -> tuple[int, int, int, float]:
+        return _SLOT.unpack_from(self.map, _HEADER.size + index * _SLOT.size)
+
+    def _write_slot(self, index: int, key_hash: int, position: int, length: int, expires: float) -> None:
+        _SLOT.pack_into(self.map, _HEADER.size + index * _SLOT.size, key_hash, position, length, expires)
+
+    def _head(self) -> int:
+        return _HEAD.unpack_from(self.map, _HEAD_OFFSET)[0]
+
+    def _read(self, position: int, length: int) -> bytes:
+        start = self.log_offset + position % self.log_size
+        return self.map[start:start + length]
+
+    def _append(self, record: bytes) -> int:
+        """Write `record` at the head of the log and return its position; records never wrap."""
+        position = self._head()
+        physical = position % self.log_size
+        if physical + len(record) > self.log_size:
+            position += self.log_size - physical
+            physical = 0
+        start = self.log_offset + physical
+        self.map[start:start + len(record)] = record
+        _HEAD.pack_into(self.map, _HEAD_OFFSET, position + len(record))
+        return position
+
+
+def _get_file(path: str, slots: int, log_size: int) -> _SharedFile:
+    """Return the mapping of `path` in the current process, opened anew after a fork so that locks are not shared."""
+    key = (path, os.getpid())
+    shared = _files.get(key)
+    if shared is None:
+        with _files_lock:
+            if key not in _files:
+                _files[key] = _SharedFile(path, slots, log_size)
+            shared = _files[key]
+    return shared
+
+
+class MmapCache(BaseCache):
+    """Cache backend storing its entries in a memory-mapped file shared by the processes of the host.
+
+    `LOCATION` is the path of the file, preferably on a tmpfs (/dev/shm) so that the kernel
+    does not write the cache back to disk. The `MAX_ENTRIES` option is the number of index
+    slots, rounded up to a multiple of `WAYS`; `SIZE` is the size of the log of records, in
+    bytes, and an entry larger than half of it is not stored.
+
+    Attributes:
+        path (str): The path of the cache file.
+        size (int): The size of the log, in bytes.
+        slots (int): The number of index slots.
+    """
+    pickle_protocol: int = pickle.HIGHEST_PROTOCOL
+
+    def __init__(self, location: str, params: dict[str, Any]) -> None:
+        super().__init__(params)
+        self.path: str = str(location)
+        self.size: int = params.get('OPTIONS', {}).get('SIZE', DEFAULT_SIZE)
+        self.slots: int = -(-self._max_entries // WAYS) * WAYS
+
+    @property
+    def _file(self) -> _SharedFile:
+        return _get_file(self.path, self.slots, self.size)
+
+    def _key(self, key: Any, version: Optional[int]) -> tuple[bytes, int]:
+        encoded = self.make_and_validate_key(key, version=version).encode()
+        return encoded, int.from_bytes(hashlib.blake2b(encoded, digest_size=8).digest(), 'little') or 1
+
+    def _expiry(self, timeout: Any) -> float:
+        expires = self.get_backend_timeout(timeout)
+        return 0.0 if expires is None else expires
+
+    def add(self, key: Any, value: Any, timeout: Any = DEFAULT_TIMEOUT, version: Optional[int] = None) -> bool:
+        encoded, key_hash = self._key(key, version)
+        data = pickle.dumps(value, self.pickle_protocol)
+        shared = self._file
+        with shared.locked():
+            now = time.time()
+            if shared.find(encoded, key_hash, now) is not None:
+                return False
+            shared.store(encoded, key_hash, data, self._expiry(timeout), now)
+        return True
+
+    def get(self, key: Any, default: Any = None, version: Optional[int] = None) -> Any:
+        encoded, key_hash = self._key(key, version)
+        shared = self._file
+        with shared.locked():
+            found = shared.find(encoded, key_hash, time.time())
+        return default if found is None else pickle.loads(found[1])
+
+    def get_many(self, keys: Iterable[Any], version: Optional[int] = None) -> dict[Any, Any]:
+        hashed = [(key, *self._key(key, version)) for key in keys]
+        shared = self._file
+        found: dict[Any, bytes] = {}
+        with shared.locked():
+            now = time.time()
+            for key, encoded, key_hash in hashed:
+                entry = shared.find(encoded, key_hash, now)
+                if entry is not None:
+                    found[key] = entry[1]
+        return {key: pickle.loads(data) for key, data in found.items()}
+
+    def set(self, key: Any, value: Any, timeout: Any = DEFAULT_TIMEOUT, version: Optional[int] = None) -> None:
+        encoded, key_hash = self._key(key, version)
+        data = pickle.dumps(value, self.pickle_protocol)
+        shared = self._file
+        with shared.locked():
+            shared.store(encoded, key_hash, data, self._expiry(timeout), time.time())
+
+    def touch(self, key: Any, timeout: Any = DEFAULT_TIMEOUT, version: Optional[int] = None) -> bool:
+        encoded, key_hash = self._key(key, version)
+        shared = self._file
+        with shared.locked():
+            found = shared.find(encoded, key_hash, time.time())
+            if found is None:
+                return False
+            shared.set_expiry(found[0], self._expiry(timeout))
+        return True
+
+    def delete(self, key: Any, version: Optional[int] = None) -> bool:
+        encoded, key_hash = self._key(key, version)
+        shared = self._file
+        with shared.locked():
+            found = shared.find(encoded, key_hash, time.time())
+            if found is None:
+                return False
+            shared.remove(found[0])
+        return True
+
+    def has_key(self, key: Any, version: Optional[int] = None) -> bool:
+        encoded, key_hash = self._key(key, version)
+        shared = self._file
+        with shared.locked():
+            return shared.find(encoded, key_hash, time.time()) is not None
+
+    def incr(self, key: Any, delta: int = 1, version: Optional[int] = None) -> int:
+        """Add `delta` to the value of `key` atomically, across processes, keeping its expiry."""
+        encoded, key_hash = self._key(key, version)
+        shared = self._file
+        with shared.locked():
+            now = time.time()
+            found = shared.find(encoded, key_hash, now)
+            if found is None:
+                raise ValueError(f"Key '{key}' not found.")
+            value = pickle.loads(found[1]) + delta
+            shared.store(encoded, key_hash, pickle.dumps(value, self.pickle_protocol), found[2], now)
+        return value
+
+    def clear(self) -> None:
+        shared = self._file
+        with shared.locked():
+            shared.clear()
@@ -0,0 +1,233 @@
+"""
+On-demand request profiling.
+
+`ProfilingMiddleware` profiles a random `PROFILING_SAMPLE_RATE` fraction of the requests,
+and the requests of staff users that send the `X-Profile` header or the `profile` query
+parameter. Each profile is written to `PROFILING_DIRECTORY` as two files: `<id>.prof`,
+the cProfile statistics (readable by `pstats` and the usual viewers), and `<id>.json`, the
+request and the SQL it executed. Only the `PROFILING_MAX_PROFILES` most recent profiles
+are kept. The `profiles` command lists them and shows their hottest functions.
+"""
+
+import cProfile
+import json
+import random
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Optional, Union, cast
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.db import connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+from django.http import HttpRequest, HttpResponse
+
+from accounts.models import CustomUser
+
+PROFILE_HEADER: str = 'X-Profile'
+PROFILE_QUERY_PARAMETER: str = 'profile'
+PROFILE_ID_HEADER: str = 'X-Profile-Id'
+
+# The SQL of a profiled request is recorded up to this number of queries.
+MAX_RECORDED_QUERIES: int = 1000
+
+_sequence_lock = threading.Lock()
+_sequence: int = 0
+
+
+@dataclass
+class ProfileRecord:
+    """The description of a profiled request, saved next to its statistics.
+
+    Attributes:
+        id (str): The identifier of the profile, increasing with time.
+        created (str): The date of the request, in ISO 8601 format.
+        method (str): The HTTP method.
+        path (str): The requested path.
+        view (str): The URL name of the view, or `<unresolved>`.
+        status (int): The status code of the response.
+        duration (float): The duration of the request, in seconds.
+        trigger (str): 'sample' or 'staff'.
+        queries (list[tuple[str, float]]): The SQL executed and its duration in seconds, at
+            most `MAX_RECORDED_QUERIES`.
+        query_count (int): The number of queries, including those not recorded.
+    """
+    id: str
+    created: str
+    method: str
+    path: str
+    view: str = '<unresolved>'
+    status: int = 0
+    duration: float = 0.0
+    trigger: str = 'sample'
+    queries: list[tuple[str, float]] = field(default_factory=list)
+    query_count: int = 0
+
+
+_current: ContextVar[Optional[ProfileRecord]] = ContextVar('website_profile', default=None)
+
+
+def get_profile_directory() -> Path:
+    """Return the directory of the saved profiles (`PROFILING_DIRECTORY`)."""
+    return Path(getattr(settings, 'PROFILING_DIRECTORY', settings.BASE_DIR / 'profiles'))
+
+
+def _new_id() -> str:
+    global _sequence
+    with _sequence_lock:
+        _sequence += 1
+        sequence = _sequence
+    return f'{time.time_ns()}-{sequence % 1000:03d}'
+
+
+def _record_query(execute: Callable, sql: str, params: Any, many: bool, context: dict[str, Any]) -> Any:
+    record = _current.get()
+    if record is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        record.query_count += 1
+        if len(record.queries) < MAX_RECORDED_QUERIES:
+            record.queries.append((sql, time.perf_counter() - started))
+
+
+def instrument_connection(sender: Any, connection: BaseDatabaseWrapper, **kwargs: Any) -> None:
+    """Install the SQL recorder on a new database connection (`connection_created` receiver)."""
+    if _record_query not in connection.execute_wrappers:
+        # Outermost, so that the wrappers pushed and popped by `execute_wrapper()` are left in place.
+        connection.execute_wrappers.insert(0, _record_query)
+
+
+def save_profile(record: ProfileRecord, profiler: cProfile.Profile) -> None:
+    """Write a profile to the ring buffer, then remove the oldest profiles beyond `PROFILING_MAX_PROFILES`."""
+    directory = get_profile_directory()
+    directory.mkdir(parents=True, exist_ok=True)
+    profiler.dump_stats(directory / f'{record.id}.prof')
+    (directory / f'{record.id}.json').write_text(json.dumps(asdict(record)))
+
+    kept: int = getattr(settings, 'PROFILING_MAX_PROFILES', 100)
+    for stale in sorted(directory.glob('*.json'), reverse=True)[kept:]:
+        # Another process may be removing the same files.
+        stale.with_suffix('.prof').unlink(missing_ok=True)
+        stale.unlink(missing_ok=True)
+
+
+def list_profiles() -> list[ProfileRecord]:
+    """Return the saved profiles, most recent first."""
+    records = []
+    for path in sorted(get_profile_directory().glob('*.json'), reverse=True):
+        try:
+            records.append(load_profile(path.stem))
+        except (OSError, ValueError):
+            continue
+    return records
+
+
+def load_profile(profile_id: str) -> ProfileRecord:
+    """Return the description of the profile `profile_id`.
+
+    Raises:
+        OSError: If the profile does not exist.
+    """
+    data = json.loads((get_profile_directory() / f'{profile_id}.json').read_text())
+    data['queries'] = [tuple(query) for query in data['queries']]
+    return ProfileRecord(**data)
+
+
+class ProfilingMiddleware:
+    """Middleware that profiles sampled requests and the requests flagged by staff users.
+
+    It must come after `AuthenticationMiddleware`. The profiled response carries the
+    identifier of its profile in the `X-Profile-Id` header.
+
+    Under ASGI, cProfile only sees the event loop thread: the profile includes the other
+    requests served meanwhile, and not the sync code run in worker threads. The SQL of the
+    request is recorded in both cases. As the event loop thread can only be profiled once
+    at a time, requests that arrive during a profile are not profiled.
+    """
+    sync_capable: bool = True
+    async_capable: bool = True
+
+    def __init__(self, get_response: Callable) -> None:
+        self.get_response = get_response
+        self.profiling_loop = False
+        connection_created.connect(instrument_connection, dispatch_uid='website.profiling')
+        for connection in connections.all(initialized_only=True):
+            instrument_connection(None, connection)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        trigger = 'staff' if self.is_requested(request) and request.user.is_staff else self.get_sample_trigger()
+        if trigger is None:
+            return self.get_response(request)
+
+        record, profiler = self._start(request, trigger)
+        token = _current.set(record)
+        started = time.perf_counter()
+        try:
+            with profiler:
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, record, profiler, started)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        # The user is only loaded for the requests that ask for a profile, like in `__call__`.
+        staff = self.is_requested(request) and cast(Union[CustomUser, AnonymousUser], await request.auser()).is_staff
+        trigger = 'staff' if staff else self.get_sample_trigger()
+        if trigger is None or self.profiling_loop:
+            return await self.get_response(request)
+
+        record, profiler = self._start(request, trigger)
+        token = _current.set(record)
+        started = time.perf_counter()
+        self.profiling_loop = True
+        try:
+            with profiler:
+                response = await self.get_response(request)
+        finally:
+            self.profiling_loop = False
+            _current.reset(token)
+        return self._finish(request, response, record, profiler, started)
+
+    @staticmethod
+    def is_requested(request: HttpRequest) -> bool:
+        """Return whether the request asks to be profiled, which is only honoured for staff users."""
+        return PROFILE_HEADER in request.headers or PROFILE_QUERY_PARAMETER in request.GET
+
+    @staticmethod
+    def get_sample_trigger() -> Optional[str]:
+        """Return 'sample' for a `PROFILING_SAMPLE_RATE` fraction of the calls, and None otherwise."""
+        return 'sample' if random.random() < getattr(settings, 'PROFILING_SAMPLE_RATE', 0.0) else None
+
+    @staticmethod
+    def _start(request: HttpRequest, trigger: str) -> tuple[ProfileRecord, cProfile.Profile]:
+        record = ProfileRecord(
+            id=_new_id(), created=datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            method=request.method or '', path=request.get_full_path(), trigger=trigger,
+        )
+        return record, cProfile.Profile()
+
+    @staticmethod
+    def _finish(
+        request: HttpRequest, response: HttpResponse, record: ProfileRecord, profiler: cProfile.Profile, started: float,
+    ) -> HttpResponse:
+        record.duration = time.perf_counter() - started
+        record.status = response.status_code
+        match = getattr(request, 'resolver_match', None)
+        if match is not None:
+            record.view = match.view_name
+        save_profile(record, profiler)
+        response[PROFILE_ID_HEADER] = record.id
+        return response
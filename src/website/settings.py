@@ -11,10 +11,12 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List
 
 import environ
 
+from website.sqlite import production_options
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent  # src
 
@@ -31,10 +33,18 @@ environ.Env.read_env(env_path)
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = env('DJANGO_SECRET_KEY')
 
+# `SITE_PROFILE=production` turns debugging off, selects the production database profile and
+# warms the server processes up at startup (see `website.warmup`).
+SITE_PROFILE = env.str('SITE_PROFILE', default='development')
+
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = env.bool('DEBUG', default=SITE_PROFILE != 'production')
+
+ALLOWED_HOSTS: List[str] = env.list('ALLOWED_HOSTS', default=[])
 
-ALLOWED_HOSTS: List[str] = []
+# Build the URL resolver and compile the templates when the process starts rather than on
+# its first requests.
+WARMUP_ON_STARTUP = env.bool('WARMUP_ON_STARTUP', default=SITE_PROFILE == 'production')
 
 
 # Application definition
@@ -51,20 +61,27 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so that the measured latency includes the other middleware.
+    'website.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'blog.routing.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    # After `AuthenticationMiddleware`, which identifies the staff users allowed to request a profile.
+    'website.profiling.ProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
 ROOT_URLCONF = 'website.urls'
 
-TEMPLATES = [
+TEMPLATES: List[Dict[str, Any]] = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # The Django backend, with the rendering time recorded by `website.metrics`.
+        'BACKEND': 'website.metrics.DjangoTemplates',
+        'NAME': 'django',
         'DIRS': [
             BASE_DIR / "website/templates",
         ],
@@ -80,8 +97,30 @@ TEMPLATES = [
     },
 ]
 
+# Apps whose templates are rendered by Jinja2, from their `jinja2` directory (JINJA2_APPS=blog,website).
+JINJA2_APPS: list[str] = env.list('JINJA2_APPS', default=[])
+# Directory of the compiled Jinja2 templates, filled by the `compile_templates` command.
+JINJA2_BYTECODE_CACHE: Path = env.path('JINJA2_BYTECODE_CACHE', default=BASE_DIR / 'jinja2_cache')
+
+if JINJA2_APPS:
+    # Tried first, so that it renders the templates it finds and leaves the others to Django.
+    TEMPLATES.insert(0, {
+        'BACKEND': 'website.templating.Jinja2',
+        'NAME': 'jinja2',
+        'DIRS': [BASE_DIR / app / 'jinja2' for app in JINJA2_APPS],
+        'APP_DIRS': False,
+        'OPTIONS': {
+            'environment': 'website.templating.environment',
+            'context_processors': TEMPLATES[0]['OPTIONS']['context_processors'],
+        },
+    })
+
 WSGI_APPLICATION = 'website.wsgi.application'
 
+# Serve the read views (index, blog listing, post and author list) with their async variants,
+# which avoid thread hops when the site runs under ASGI (`website.asgi`).
+ASYNC_VIEWS = env.bool('ASYNC_VIEWS', default=False)
+
 
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
@@ -93,6 +132,64 @@ DATABASES = {
     }
 }
 
+# `DATABASE_PROFILE=production` enables WAL, tuned pragmas and persistent connections
+# (see `website.sqlite`).
+DATABASE_PROFILE = env.str('DATABASE_PROFILE', default='production' if SITE_PROFILE == 'production' else 'development')
+if DATABASE_PROFILE == 'production':
+    DATABASES['default'].update(production_options())
+
+# Read replica for the listing and detail pages. Locally, a copy of db.sqlite3 can stand in
+# for it: DATABASE_REPLICA_PATH=/path/to/replica.sqlite3.
+if env.str('DATABASE_REPLICA_PATH', default=''):
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': env.path('DATABASE_REPLICA_PATH'),
+        'TEST': {'MIRROR': 'default'},
+    }
+    if DATABASE_PROFILE == 'production':
+        DATABASES['replica'].update(production_options())
+
+DATABASE_ROUTERS = ['blog.routing.PrimaryReplicaRouter']
+REPLICA_DATABASE_ALIAS = 'replica'
+# After writing, a user reads from the primary for this many seconds.
+REPLICA_PIN_SECONDS = 5
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+# `CACHE_BACKEND=mmap` shares the cache between the worker processes of the host through a
+# memory-mapped file (see `website.mmap_cache`, POSIX only), so that pages cached by one
+# worker are hits for the others. On a tmpfs (CACHE_PATH=/dev/shm/website-cache.mmap), the
+# cache is never written back to disk. Otherwise each process has its own local memory cache.
+CACHE_BACKEND = env.str('CACHE_BACKEND', default='locmem')
+if CACHE_BACKEND == 'mmap':
+    CACHES = {
+        'default': {
+            'BACKEND': 'website.mmap_cache.MmapCache',
+            'LOCATION': env.path('CACHE_PATH', default=BASE_DIR / 'cache.mmap'),
+            'OPTIONS': {
+                'MAX_ENTRIES': 16384,
+                'SIZE': 64 * 1024 * 1024,
+            },
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Lifetime of the blog pages cached by `blog.cache.PageCacheMixin`, in seconds.
+BLOG_PAGE_CACHE_TIMEOUT = 60 * 15
+# How long an expired or outdated page is kept, to be served to the requests that arrive
+# while another one renders it again, in seconds.
+BLOG_PAGE_CACHE_GRACE = 60
+# Lifetime of the post cards of the listing cached by `blog.cache.render_post_cards`, in
+# seconds; their keys change with the posts, so this only bounds the memory they take.
+BLOG_FRAGMENT_CACHE_TIMEOUT = 60 * 60 * 24
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -143,3 +240,17 @@ AUTH_USER_MODEL = 'accounts.CustomUser'
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT: Path = BASE_DIR / 'media'
+
+# Request profiles (`website.profiling`): the fraction of requests profiled at random, in
+# addition to those requested by staff users, and the size of the on-disk ring buffer.
+PROFILING_SAMPLE_RATE = env.float('PROFILING_SAMPLE_RATE', default=0.0)
+PROFILING_DIRECTORY: Path = env.path('PROFILING_DIRECTORY', default=BASE_DIR / 'profiles')
+PROFILING_MAX_PROFILES = 100
+
+# Bearer token of the scrapers of `/metrics` (`Authorization: Bearer <token>`); staff users
+# are served without it. Empty, only staff users are.
+METRICS_TOKEN = env.str('METRICS_TOKEN', default='')
+
+# Resized thumbnail variants are generated by a background thread pool of this size.
+BLOG_THUMBNAILS_ASYNC = True
+BLOG_THUMBNAIL_WORKERS = 2
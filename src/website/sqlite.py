@@ -0,0 +1,47 @@
+"""
+SQLite connection profiles for the `DATABASES` setting.
+
+The production profile switches the database to write-ahead logging, so that readers are
+no longer blocked by a writer, and keeps connections open between requests.
+"""
+
+from typing import Any, Union
+
+# Applied by Django on every new connection, through the `init_command` option.
+PRODUCTION_PRAGMAS: dict[str, Union[str, int]] = {
+    # Readers see the last committed state while a writer appends to the WAL file.
+    'journal_mode': 'WAL',
+    # In WAL mode, NORMAL only syncs at checkpoints: a power loss can drop the last
+    # transactions but cannot corrupt the database.
+    'synchronous': 'NORMAL',
+    # Read pages through a 256 MiB memory map instead of read() system calls.
+    'mmap_size': 256 * 1024 * 1024,
+    # Page cache of 64 MiB per connection (a negative value is a size in KiB).
+    'cache_size': -64 * 1024,
+    # Wait up to 5 s for a lock instead of failing with "database is locked".
+    'busy_timeout': 5000,
+}
+
+# Persistent connections are reused for 10 minutes, and checked before reuse.
+PRODUCTION_CONN_MAX_AGE: int = 600
+
+
+def init_command(pragmas: dict[str, Union[str, int]]) -> str:
+    """Return the `init_command` option that applies `pragmas` to a new connection."""
+    return ';'.join(f'PRAGMA {name} = {value}' for name, value in pragmas.items())
+
+
+def production_options() -> dict[str, Any]:
+    """Return the `DATABASES` entries of the production profile, to merge into a SQLite database.
+
+    Transactions start with `BEGIN IMMEDIATE`: a writer takes the write lock when its
+    transaction starts, so `busy_timeout` applies instead of failing on a lock upgrade.
+
+    Returns:
+        dict[str, Any]: The `CONN_MAX_AGE`, `CONN_HEALTH_CHECKS` and `OPTIONS` entries.
+    """
+    return {
+        'CONN_MAX_AGE': PRODUCTION_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {'init_command': init_command(PRODUCTION_PRAGMAS), 'transaction_mode': 'IMMEDIATE'},
+    }
@@ -0,0 +1,84 @@
+"""
+Jinja2 environment of the templates in the `jinja2` directories of the apps.
+
+The apps listed in `JINJA2_APPS` have their templates rendered by the `Jinja2` backend of
+this module, which `TEMPLATES` tries before the Django one; jinja2 is not imported otherwise.
+Their templates are ports of the Django ones, which stay in use for the other apps. The
+environment provides the equivalents of the tags and filters they use:
+
+- `url('blog:detail', slug=...)` and `static('css/...')` for the `url` and `static` tags;
+- the `date`, `truncatewords` and `linebreaks` filters of Django, with the same arguments;
+- `thumbnail_srcset` and `post_cards` for the tags of the blog app.
+
+The compiled templates are kept in a bytecode cache on disk (`JINJA2_BYTECODE_CACHE`),
+shared by the server processes and filled at deploy time by the `compile_templates` command,
+so that no process compiles a template on its first request.
+"""
+
+from pathlib import Path
+from typing import Any, cast
+
+from django.conf import settings
+from django.template import defaultfilters
+from django.template.backends import jinja2 as jinja2_backend
+from django.templatetags.static import static
+from django.urls import reverse
+from django.utils.safestring import SafeString
+from jinja2 import Environment, FileSystemBytecodeCache
+
+from blog.cache import render_post_cards
+from blog.templatetags.blog_images import thumbnail_srcset
+from website.metrics import TimedTemplateMixin
+
+
+def get_bytecode_directory() -> Path:
+    """Return the directory of the compiled templates (`JINJA2_BYTECODE_CACHE`)."""
+    return Path(getattr(settings, 'JINJA2_BYTECODE_CACHE', settings.BASE_DIR / 'jinja2_cache'))
+
+
+def url(viewname: str, *args: Any, **kwargs: Any) -> str:
+    """Return the path of a view, like `{% url viewname arg ... key=value ... %}`."""
+    return reverse(viewname, args=args or None, kwargs=kwargs or None)
+
+
+def linebreaks(value: Any, autoescape: bool = True) -> SafeString:
+    """Convert the line breaks of `value` to `<p>` and `<br>` tags, escaping it first unless `autoescape` is false."""
+    return defaultfilters.linebreaks_filter(value, autoescape=autoescape)
+
+
+def environment(**options: Any) -> Environment:
+    """Return the Jinja2 environment of the site (the `environment` option of the backend).
+
+    Args:
+        **options: The options of the environment set by the backend (loader, autoescape...).
+
+    Returns:
+        Environment: The environment, with its bytecode cache and the site's globals and filters.
+    """
+    directory = get_bytecode_directory()
+    directory.mkdir(parents=True, exist_ok=True)
+    options.setdefault('bytecode_cache', FileSystemBytecodeCache(str(directory)))
+    env = Environment(**options)
+    env.globals.update({'url': url, 'static': static, 'post_cards': render_post_cards})
+    env.filters.update({
+        'date': defaultfilters.date,
+        'truncatewords': defaultfilters.truncatewords,
+        'linebreaks': linebreaks,
+        'thumbnail_srcset': thumbnail_srcset,
+    })
+    return env
+
+
+class Jinja2(jinja2_backend.Jinja2):
+    """The Jinja2 template backend, timing the rendering of each template it returns."""
+
+    def from_string(self, template_code: str) -> 'Template':
+        return Template(self.env.from_string(template_code), self)
+
+    def get_template(self, template_name: str) -> 'Template':
+        template = cast(jinja2_backend.Template, super().get_template(template_name))
+        return Template(template.template, self)
+
+
+class Template(TimedTemplateMixin, jinja2_backend.Template):
+    """Jinja2 template whose rendering time is added to the current request's measures."""
@@ -0,0 +1,353 @@
+import multiprocessing
+import sqlite3
+import time
+from io import StringIO
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management import CommandError, call_command
+from django.db import connections
+from django.test import AsyncClient, Client
+from django.urls import reverse
+
+from accounts.models import CustomUser
+from blog.models import BlogPost
+from website.metrics import registry
+from website.mmap_cache import MmapCache
+from website.profiling import list_profiles, load_profile
+from website.sqlite import PRODUCTION_PRAGMAS, init_command, production_options
+
+
+@pytest.fixture
+def production_database(tmp_path: Any, django_db_blocker: Any) -> Iterator[str]:
+    """Register a file database configured with the production profile, as the `production_test` alias."""
+    connections.settings['production_test'] = {
+        **connections.settings['default'], 'NAME': str(tmp_path / 'db.sqlite3'), **production_options(),
+    }
+    with django_db_blocker.unblock():
+        yield 'production_test'
+        connections['production_test'].close()
+    del connections['production_test']
+    del connections.settings['production_test']
+
+
+def _connect(path: str, pragmas: dict[str, Any]) -> sqlite3.Connection:
+    """Open a connection in autocommit mode with `pragmas` applied, failing at once on a lock."""
+    conn = sqlite3.connect(path, isolation_level=None)
+    for statement in init_command({**pragmas, 'busy_timeout': 0}).split(';'):
+        conn.execute(statement)
+    return conn
+
+
+class TestSQLiteProductionProfile:
+    """Test suite for the production SQLite profile of `website.sqlite` and the `sqlite_health` command."""
+
+    def test_pragmas_applied(self, production_database: str) -> None:
+        """Test that the production pragmas are applied to every new connection."""
+        with connections[production_database].cursor() as cursor:
+            values: dict[str, Any] = {}
+            for pragma in PRODUCTION_PRAGMAS:
+                cursor.execute(f'PRAGMA {pragma}')
+                values[pragma] = cursor.fetchone()[0]
+        assert values == {
+            'journal_mode': 'wal', 'synchronous': 1, 'mmap_size': 256 * 1024 * 1024,
+            'cache_size': -64 * 1024, 'busy_timeout': 5000,
+        }
+        # Set by the SQLite backend from the `transaction_mode` option.
+        production_connection: Any = connections[production_database]
+        assert production_connection.transaction_mode == 'IMMEDIATE'
+
+    @staticmethod
+    def _health(database: str, *args: str) -> dict[str, str]:
+        stdout: StringIO = StringIO()
+        call_command('sqlite_health', '--database', database, *args, stdout=stdout)
+        return dict(item.split('=', 1) for line in stdout.getvalue().splitlines() for item in line.split() if '=' in item)
+
+    def test_health(self, production_database: str) -> None:
+        """Test that `sqlite_health` reports the WAL size and fails over the `--max-wal-mb` threshold."""
+        with connections[production_database].cursor() as cursor:
+            cursor.execute('CREATE TABLE post (id INTEGER PRIMARY KEY, body TEXT)')
+            cursor.executemany('INSERT INTO post (body) VALUES (%s)', [('x' * 1000,)] * 500)
+        report: dict[str, str] = self._health(production_database)
+        assert report['journal_mode'] == 'wal'
+        assert int(report['wal_size']) > 0
+
+        with pytest.raises(CommandError):
+            call_command('sqlite_health', '--database', production_database, '--max-wal-mb', '0', stdout=StringIO())
+
+    def test_health_is_read_only(self, production_database: str) -> None:
+        """Test that the probe reports the lag left by the writes without checkpointing, unless asked to."""
+        with connections[production_database].cursor() as cursor:
+            cursor.execute('CREATE TABLE post (id INTEGER PRIMARY KEY, body TEXT)')
+            cursor.executemany('INSERT INTO post (body) VALUES (%s)', [('x' * 1000,)] * 500)
+        path: Path = Path(connections[production_database].settings_dict['NAME'])
+        database: bytes = path.read_bytes()
+
+        report: dict[str, str] = self._health(production_database)
+        frames: int = int(report['wal_frames'])
+        assert frames > 0 and int(report['checkpoint_lag']) == frames
+        assert path.read_bytes() == database
+
+        report = self._health(production_database, '--checkpoint')
+        assert 'checkpointed' in report and path.read_bytes() != database
+        assert self._health(production_database)['checkpoint_lag'] == '0'
+
+    @pytest.mark.parametrize('pragmas, wal', [({'journal_mode': 'DELETE'}, False), (PRODUCTION_PRAGMAS, True)])
+    def test_readers_and_writer(self, tmp_path: Any, pragmas: dict[str, Any], wal: bool) -> None:
+        """Test that in WAL mode a read is not blocked by a write transaction, nor a commit by a read transaction."""
+        path: str = str(tmp_path / 'db.sqlite3')
+        writer, reader = _connect(path, pragmas), _connect(path, pragmas)
+        writer.execute('CREATE TABLE post (id INTEGER PRIMARY KEY, body TEXT)')
+        writer.execute("INSERT INTO post (body) VALUES ('premier')")
+        assert reader.execute('SELECT count(*) FROM post').fetchone() == (1,)
+
+        # The lock a commit takes in rollback-journal mode.
+        writer.execute('BEGIN EXCLUSIVE')
+        writer.execute("INSERT INTO post (body) VALUES ('second')")
+        if wal:
+            assert reader.execute('SELECT count(*) FROM post').fetchone() == (1,)
+        else:
+            with pytest.raises(sqlite3.OperationalError, match='locked'):
+                reader.execute('SELECT count(*) FROM post')
+        writer.execute('COMMIT')
+
+        reader.execute('BEGIN')
+        assert reader.execute('SELECT count(*) FROM post').fetchone() == (2,)
+        if wal:
+            writer.execute("INSERT INTO post (body) VALUES ('troisième')")
+            # The read transaction keeps its snapshot until it ends.
+            assert reader.execute('SELECT count(*) FROM post').fetchone() == (2,)
+            reader.execute('COMMIT')
+            assert reader.execute('SELECT count(*) FROM post').fetchone() == (3,)
+        else:
+            with pytest.raises(sqlite3.OperationalError, match='locked'):
+                writer.execute("INSERT INTO post (body) VALUES ('troisième')")
+            reader.execute('COMMIT')
+        writer.close()
+        reader.close()
+
+
+def _in_child_process(function: Callable[[], Any]) -> Any:
+    """Run `function` in a forked process and return its result."""
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+
+    def target() -> None:
+        sender.send(function())
+
+    process = multiprocessing.get_context('fork').Process(target=target)
+    process.start()
+    result = receiver.recv()
+    process.join()
+    return result
+
+
+class TestMmapCache:
+    """Test suite for the cache backend shared by processes, `website.mmap_cache.MmapCache`."""
+
+    @staticmethod
+    def _cache(tmp_path: Any, size: int = 4096, max_entries: int = 64) -> MmapCache:
+        return MmapCache(str(tmp_path / 'cache.mmap'), {'OPTIONS': {'SIZE': size, 'MAX_ENTRIES': max_entries}})
+
+    def test_default_cache(self) -> None:
+        """Test that the tests use the shared cache, and that they do not share the file of the site."""
+        assert isinstance(caches['default'], MmapCache)
+        assert caches['default'].path != str(settings.BASE_DIR / 'cache.mmap')
+
+    def test_operations(self, tmp_path: Any) -> None:
+        """Test the cache API: add, get_many, incr, touch, delete and clear."""
+        shared: MmapCache = self._cache(tmp_path)
+        shared.set('key', {'value': 1})
+        assert shared.get('key') == {'value': 1}
+        assert shared.add('key', 2) is False
+        assert shared.add('other', 2) is True
+        assert shared.get_many(['key', 'other', 'missing']) == {'key': {'value': 1}, 'other': 2}
+        assert shared.incr('other', 5) == 7
+        with pytest.raises(ValueError):
+            shared.incr('missing')
+        assert shared.touch('other', 10) and not shared.touch('missing')
+        assert shared.delete('key') and not shared.has_key('key')
+        shared.clear()
+        assert shared.get('other') is None
+
+    def test_eviction(self, tmp_path: Any) -> None:
+        """Test that expired and overwritten entries are misses, while the entries being read survive."""
+        shared: MmapCache = self._cache(tmp_path)
+        shared.set('short', 1, timeout=0.05)
+        shared.set('hot', 'h' * 50)
+        time.sleep(0.1)
+        assert shared.get('short') is None
+        for index in range(300):
+            shared.set(f'key-{index}', 'v' * 50)
+            assert shared.get('hot') == 'h' * 50
+        assert shared.get('key-0') is None
+        assert shared.get('key-299') == 'v' * 50
+        shared.set('large', 'x' * 4096)
+        assert shared.get('large') is None
+
+    def test_shared_between_processes(self, tmp_path: Any) -> None:
+        """Test that the processes read each other's entries, and that `incr` is atomic across them."""
+        shared: MmapCache = self._cache(tmp_path, size=1 << 20)
+        shared.set('counter', 0)
+
+        def increment() -> str:
+            for _ in range(500):
+                shared.incr('counter')
+            shared.set('child', 'écrit par le processus enfant')
+            return 'done'
+
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        process = multiprocessing.get_context('fork').Process(target=lambda: sender.send(increment()))
+        process.start()
+        for _ in range(500):
+            shared.incr('counter')
+        assert receiver.recv() == 'done'
+        process.join()
+        assert shared.get('counter') == 1000
+        assert shared.get('child') == 'écrit par le processus enfant'
+
+    @pytest.mark.django_db
+    def test_page_cache_across_processes(self, client: Client) -> None:
+        """Test that a page cached by one worker process is a hit for another."""
+        post: BlogPost = BlogPost.objects.create(title='Article', published=True)
+        url: str = reverse('blog:detail', kwargs={'slug': post.slug})
+        assert client.get(url).headers['X-Page-Cache'] == 'MISS'
+        assert _in_child_process(lambda: Client().get(url).headers['X-Page-Cache']) == 'HIT'
+
+
+@pytest.mark.django_db
+class TestMetrics:
+    """Test suite for `website.metrics` and the `/metrics` endpoint."""
+
+    @pytest.fixture(autouse=True)
+    def reset_registry(self, settings: Any) -> None:
+        registry.reset()
+        settings.METRICS_TOKEN = 'scraper-token'
+
+    @staticmethod
+    def _samples(client: Client) -> dict[str, float]:
+        response = client.get(reverse('metrics'), headers={'Authorization': 'Bearer scraper-token'})
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/plain; version=0.0.4')
+        return {
+            name: float(value)
+            for name, value in (line.rsplit(' ', 1) for line in response.content.decode().splitlines())
+            if not name.startswith('#')
+        }
+
+    def test_records_views(self, client: Client) -> None:
+        """Test that requests are recorded per URL name, with their queries and template time."""
+        BlogPost.objects.create(title='Article', published=True)
+        client.get(reverse('blog:home'))
+        client.get(reverse('blog:home'))
+        client.get('/introuvable/')
+        samples: dict[str, float] = self._samples(client)
+
+        home: str = 'view="blog:home",method="GET"'
+        assert samples[f'http_requests_total{{{home},status="200"}}'] == 2
+        assert samples[f'http_requests_total{{view="<unresolved>",method="GET",status="404"}}'] == 1
+        assert samples[f'http_request_duration_seconds_bucket{{{home},le="+Inf"}}'] == 2
+        assert samples[f'http_request_duration_seconds_count{{{home}}}'] == 2
+        # The second request is served from the page cache, without a query.
+        assert samples[f'db_queries_total{{{home}}}'] >= 2
+        assert samples[f'db_query_seconds_total{{{home}}}'] > 0
+        assert samples[f'template_render_seconds_total{{{home}}}'] > 0
+        assert samples[f'http_request_pre_view_seconds_total{{{home}}}'] > 0
+
+    def test_async_views(self, client: Client, async_views: None) -> None:
+        """Test that the queries of async views, run in worker threads, are attributed to the request."""
+        BlogPost.objects.create(title='Article', published=True)
+        async_to_sync(AsyncClient().get)(reverse('blog:detail', kwargs={'slug': 'article'}))
+        samples: dict[str, float] = self._samples(client)
+        assert samples['db_queries_total{view="blog:detail",method="GET"}'] >= 2
+        assert samples['template_render_seconds_total{view="blog:detail",method="GET"}'] > 0
+
+    def test_unknown_methods(self, client: Client) -> None:
+        """Test that the methods outside the standard HTTP ones share one `method` label value."""
+        for method in ('BREW', 'PROPFIND', 'X"Y'):
+            client.generic(method, reverse('blog:home'))
+        samples: dict[str, float] = self._samples(client)
+        assert samples['http_requests_total{view="blog:home",method="other",status="405"}'] == 3
+        assert not any('BREW' in name or 'X\\"Y' in name for name in samples)
+
+    def test_access(self, client: Client, settings: Any) -> None:
+        """Test that `/metrics` is only served to staff users and to requests with the token."""
+        url: str = reverse('metrics')
+        assert client.get(url).status_code == 403
+        assert client.get(url, headers={'Authorization': 'Bearer wrong-token'}).status_code == 403
+        assert client.get(url, headers={'Authorization': 'scraper-token'}).status_code == 403
+        assert client.get(url, headers={'Authorization': 'Bearer scraper-token'}).status_code == 200
+        settings.METRICS_TOKEN = ''
+        assert client.get(url, headers={'Authorization': 'Bearer '}).status_code == 403
+        client.force_login(CustomUser.objects.create_user(email='user@example.com', password='testpass123'))
+        assert client.get(url).status_code == 403
+        client.force_login(CustomUser.objects.create_superuser(email='admin@example.com', password='testpass123'))
+        assert client.get(url).status_code == 200
+
+
+@pytest.fixture
+def profile_directory(settings: Any, tmp_path: Any) -> Any:
+    settings.PROFILING_DIRECTORY = tmp_path / 'profiles'
+    return settings.PROFILING_DIRECTORY
+
+
+@pytest.mark.django_db
+class TestProfiling:
+    """Test suite for `website.profiling` and the `profiles` command."""
+
+    def test_staff_request(self, client: Client, profile_directory: Any) -> None:
+        """Test that a staff request with the header is profiled with its SQL, and the command shows it."""
+        BlogPost.objects.create(title='Article', published=True)
+        client.force_login(CustomUser.objects.create_superuser(email='admin@example.com', password='testpass123'))
+        response = client.get(reverse('blog:detail', kwargs={'slug': 'article'}), headers={'X-Profile': '1'})
+        profile_id: str = response['X-Profile-Id']
+        assert {path.name for path in profile_directory.iterdir()} == {f'{profile_id}.prof', f'{profile_id}.json'}
+
+        record = load_profile(profile_id)
+        assert (record.view, record.status, record.trigger) == ('blog:detail', 200, 'staff')
+        assert record.query_count == len(record.queries)
+        assert any('FROM "blog_blogpost"' in sql for sql, _ in record.queries)
+
+        stdout: StringIO = StringIO()
+        call_command('profiles', stdout=stdout)
+        assert profile_id in stdout.getvalue()
+        stdout = StringIO()
+        call_command('profiles', profile_id, '--limit', '5', stdout=stdout)
+        output: str = stdout.getvalue()
+        assert 'cumulative' in output and 'get_response' in output
+        assert 'FROM "blog_blogpost"' in output
+
+    def test_async_views(self, profile_directory: Any, async_views: None) -> None:
+        """Test that requests served by the ASGI handler are profiled with the SQL run in worker threads."""
+        BlogPost.objects.create(title='Article', published=True)
+        async_client = AsyncClient()
+        async_client.force_login(CustomUser.objects.create_superuser(email='admin@example.com', password='testpass123'))
+        response = async_to_sync(async_client.get)(
+            reverse('blog:detail', kwargs={'slug': 'article'}), headers={'X-Profile': '1'},
+        )
+        record = load_profile(response['X-Profile-Id'])
+        assert record.view == 'blog:detail'
+        assert any('FROM "blog_blogpost"' in sql for sql, _ in record.queries)
+
+    def test_not_requested_by_staff(self, client: Client, profile_directory: Any) -> None:
+        """Test that the profile flag is ignored for anonymous and non-staff users."""
+        assert 'X-Profile-Id' not in client.get(reverse('blog:home'), {'profile': '1'})
+        client.force_login(CustomUser.objects.create_user(email='user@example.com', password='testpass123'))
+        assert 'X-Profile-Id' not in client.get(reverse('blog:home'), headers={'X-Profile': '1'})
+        assert not profile_directory.exists()
+
+    def test_sampling_and_ring_buffer(self, client: Client, profile_directory: Any, settings: Any) -> None:
+        """Test that sampled requests are profiled and only the most recent profiles are kept."""
+        settings.PROFILING_SAMPLE_RATE = 1.0
+        settings.PROFILING_MAX_PROFILES = 2
+        ids = [client.get(reverse('blog:home'))['X-Profile-Id'] for _ in range(3)]
+        assert [record.id for record in list_profiles()] == ids[:0:-1]
+        assert load_profile(ids[-1]).trigger == 'sample'
+        assert len(list(profile_directory.iterdir())) == 4
+
+    def test_unknown_profile(self, profile_directory: Any) -> None:
+        with pytest.raises(CommandError):
+            call_command('profiles', 'inconnu', stdout=StringIO())
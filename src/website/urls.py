@@ -16,18 +16,19 @@ Including another URLconf
 """
 
 from django.contrib import admin
+from django.conf import settings
 from django.conf.urls.static import static
 from django.urls import path, include
 
-from . import settings
-from .views import index
+from .views import aindex, index, metrics
 
 
 urlpatterns = [
-    path('', index, name="index"),
+    path('', aindex if settings.ASYNC_VIEWS else index, name="index"),
     path('accounts/', include("accounts.urls")),
     path('blog/', include("blog.urls")),
     path('admin/', admin.site.urls),
+    path('metrics', metrics, name="metrics"),
 ]
 
 if settings.DEBUG:
@@ -1,5 +1,54 @@
+import secrets
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.http.response import HttpResponseForbidden
 from django.shortcuts import render
 
+from blog.cache import page_cache_stats
+
+from .metrics import registry
+
+METRICS_AUTHORIZATION_PREFIX: str = 'Bearer '
+
 
 def index(request):
-    return render(request, "website/index.html")
\ No newline at end of file
+    return render(request, "website/index.html")
+
+
+async def aindex(request):
+    """Async variant of `index`; the page needs no query, so it is rendered on the event loop."""
+    return render(request, "website/index.html")
+
+
+def has_metrics_token(request) -> bool:
+    """Return whether `request` carries the `METRICS_TOKEN` of the settings as a bearer token."""
+    token: str = getattr(settings, 'METRICS_TOKEN', '')
+    authorization: str = request.headers.get('Authorization', '')
+    if not token or not authorization.startswith(METRICS_AUTHORIZATION_PREFIX):
+        return False
+    return secrets.compare_digest(authorization[len(METRICS_AUTHORIZATION_PREFIX):], token)
+
+
+def metrics(request):
+    """Serve the request metrics in the Prometheus text format, to staff users and scrapers.
+
+    A scraper authenticates with the `Authorization: Bearer <METRICS_TOKEN>` header; without a
+    `METRICS_TOKEN` setting, only staff users are served. The blog page cache counters are
+    kept in the cache, so they cover every server process.
+    """
+    if not request.user.is_staff and not has_metrics_token(request):
+        return HttpResponseForbidden()
+    lines = [
+        '# HELP blog_page_cache_requests_total Blog page requests by cache outcome, over every server process.',
+        '# TYPE blog_page_cache_requests_total counter',
+    ]
+    # The misses are the sum of the other outcomes.
+    stats = page_cache_stats()
+    lines += [
+        f'blog_page_cache_requests_total{{outcome="{outcome}"}} {stats[name]}'
+        for outcome, name in (('hit', 'hits'), ('stale', 'stale'), ('coalesced', 'coalesced'), ('recomputed', 'recomputed'))
+    ]
+    return HttpResponse(
+        registry.render() + '\n'.join(lines) + '\n', content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
@@ -0,0 +1,126 @@
+"""
+Warm-up of a server process, run at startup by `BlogConfig.ready()` when `WARMUP_ON_STARTUP` is set.
+
+A new process otherwise builds its state while serving its first requests, which are then
+several times slower than the following ones. `warm_up()` does that work before the process
+accepts requests (before the workers are forked with `gunicorn --preload`, so that they
+share it):
+
+- the URL resolver of `ROOT_URLCONF` is built, which imports every view;
+- the templates of the site's apps, and those of the form widgets, are compiled into the
+  cached loader of their engine, and into the bytecode cache for the Jinja2 ones;
+- the modules that Django imports on first use are imported: session engine, message
+  storage, authentication backends, static files storage, and the Pillow image plugins;
+- every cache is opened, and the version counters of the page cache are initialized.
+
+The database is not accessed, as Django advises against it during app initialization.
+"""
+
+import logging
+import time
+from importlib import import_module
+from dataclasses import dataclass
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_backends
+from django.core.cache import caches
+from django.core.files.storage import storages
+from django.forms.renderers import EngineMixin, get_default_renderer
+from django.template import TemplateSyntaxError, engines
+from django.template.backends.base import BaseEngine
+from django.urls import URLResolver, get_resolver
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WarmUpReport:
+    """What `warm_up` prepared.
+
+    Attributes:
+        urls (int): The number of URL patterns of the resolver.
+        templates (int): The number of templates compiled.
+        duration (float): The duration of the warm-up, in seconds.
+    """
+    urls: int = 0
+    templates: int = 0
+    duration: float = 0.0
+
+
+def build_resolver(resolver: URLResolver) -> int:
+    """Build the reverse lookup tables of `resolver` and of its included resolvers.
+
+    Returns:
+        int: The number of URL patterns.
+    """
+    resolver.reverse_dict  # Built on first access.
+    count = 0
+    for pattern in resolver.url_patterns:
+        count += build_resolver(pattern) if isinstance(pattern, URLResolver) else 1
+    return count
+
+
+def compile_templates(backend: BaseEngine, directories: list[Path], subdirectory: str = '') -> int:
+    """Load the `.html` templates of `directories` through `backend`, which caches them compiled.
+
+    A template that fails to compile is logged and skipped: it fails on the requests that use it.
+
+    Args:
+        backend (BaseEngine): The template engine.
+        directories (list[Path]): Template directories of the engine.
+        subdirectory (str): Only load the templates under this subdirectory of each directory.
+
+    Returns:
+        int: The number of templates compiled.
+    """
+    count = 0
+    for directory in directories:
+        for path in sorted((directory / subdirectory).rglob('*.html')):
+            try:
+                backend.get_template(path.relative_to(directory).as_posix())
+            except TemplateSyntaxError:
+                logger.exception('Template %s does not compile', path)
+                continue
+            count += 1
+    return count
+
+
+def warm_up() -> WarmUpReport:
+    """Prepare the current process to serve its first request as fast as the following ones."""
+    started = time.perf_counter()
+    from PIL import Image
+
+    from blog.cache import AUTHORS_VERSION_KEY, LIST_VERSION_KEY, POSTS_VERSION_KEY, get_versions
+
+    report = WarmUpReport(urls=build_resolver(get_resolver()))
+
+    base_directory = Path(settings.BASE_DIR).resolve()
+    for backend in engines.all():
+        # The site's templates only: the admin ones are left to the first staff requests.
+        directories = [Path(directory).resolve() for directory in backend.template_dirs]
+        report.templates += compile_templates(
+            backend, [directory for directory in directories if directory.is_relative_to(base_directory)],
+        )
+    renderer = get_default_renderer()
+    # The renderers of `django.forms.renderers` have their own engine; `TemplatesSetting` uses `TEMPLATES`.
+    if isinstance(renderer, EngineMixin):
+        report.templates += compile_templates(
+            renderer.engine, [Path(directory) for directory in renderer.engine.template_dirs], 'django/forms',
+        )
+
+    import_module(settings.SESSION_ENGINE)
+    import_string(settings.MESSAGE_STORAGE)
+    get_backends()
+    storages['staticfiles']
+    Image.init()
+    for cache in caches.all():
+        cache.get('website:warm-up')
+    get_versions([LIST_VERSION_KEY, AUTHORS_VERSION_KEY, POSTS_VERSION_KEY])
+
+    report.duration = time.perf_counter() - started
+    logger.info(
+        'Warm-up done in %.0f ms: %d URL patterns, %d templates', report.duration * 1000, report.urls, report.templates,
+    )
+    return report